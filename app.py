@@ -1,16 +1,35 @@
 import streamlit as st
 
-from database import create_tables
-from seed_data import seed_recipes
+from database import SCHEMA_VERSION, ensure_schema, get_bootstrap_stamp, set_bootstrap_stamp
+from seed_data import SEED_VERSION, seed_recipes
 
-create_tables()
-seed_recipes()
+
+BOOTSTRAP_STAMP = f"{SCHEMA_VERSION}.{SEED_VERSION}"
+
+
+@st.cache_resource(show_spinner=False)
+def bootstrap_database() -> None:
+    """
+    Create the schema and seed starter recipes once per server process.
+
+    Cached as a resource, so widget reruns skip it entirely. On a warm
+    database whose stamp already matches, even the first run costs a
+    single lookup instead of the full create + seed pass.
+    """
+    if get_bootstrap_stamp() == BOOTSTRAP_STAMP:
+        return
+    ensure_schema()
+    seed_recipes()
+    set_bootstrap_stamp(BOOTSTRAP_STAMP)
+
+
+bootstrap_database()
 from global_styles import inject_global_styles
 inject_global_styles()
 import streamlit as st
 from datetime import date, timedelta
 
-from database import create_tables, get_all_recipes, get_meal_plan
+from database import count_recipes, get_meal_plan, get_recent_recipes
 
 
 # ---------------------------------------------------------------------------
@@ -232,13 +251,6 @@ hr { border-color: #F0D9CF !important; }
 """, unsafe_allow_html=True)
 
 
-# ---------------------------------------------------------------------------
-# Initialise database
-# ---------------------------------------------------------------------------
-
-create_tables()
-
-
 # ---------------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------------
@@ -277,15 +289,14 @@ def render_tag_chips(tags_str: str) -> str:
 # ---------------------------------------------------------------------------
 
 week_start      = get_current_week_start()
-all_recipes     = get_all_recipes()
 meal_plan       = get_meal_plan(week_start)
 
-total_recipes   = len(all_recipes)
+total_recipes   = count_recipes()
 meals_planned   = count_planned_meals(meal_plan)
 tonights_dinner = get_todays_dinner(meal_plan)
 
 # Last 3 recipes, newest first
-recent_recipes  = list(reversed(all_recipes[-3:])) if all_recipes else []
+recent_recipes  = get_recent_recipes(limit=3)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,85 @@
+"""
+Grocery totals: SQL aggregation vs the old Python merge for a full week.
+
+    python bench/bench_grocery.py [--recipes 20000] [--ingredients 12]
+
+Plans 21 slots (7 days x 3 meals) with distinct recipes from a large
+library, then times get_grocery_totals() against the old page path:
+get_meal_plan(), get_ingredients_for_recipes() for the planned ids, and
+a Python merge by canonical name + unit. Distinct recipes keep the two
+results comparable, since the old path counted a repeated recipe once.
+"""
+import argparse
+import random
+import time
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from common import best_of, populate_library, print_table, temp_database
+
+import database
+from ingredient_names import canonical_ingredient_name
+
+WEEK_START = "2024-03-04"
+MEAL_TYPES = ["Breakfast", "Lunch", "Dinner"]
+
+
+def python_merge(week_start: str) -> dict[tuple[str, str], float]:
+    """The pre-aggregation grocery page: fetch rows per planned recipe, merge in Python."""
+    planned_ids = list(dict.fromkeys(
+        slot["recipe_id"] for slot in database.get_meal_plan(week_start) if slot["recipe_id"]
+    ))
+    ingredients_by_recipe = database.get_ingredients_for_recipes(planned_ids)
+
+    merged: dict[tuple[str, str], float] = {}
+    for rid in planned_ids:
+        for ing in ingredients_by_recipe[rid]:
+            name = ing.get("canonical_name") or canonical_ingredient_name(ing.get("name") or "")
+            if not name:
+                continue
+            unit = (ing.get("unit") or "unit").strip().lower()
+            merged[(name, unit)] = merged.get((name, unit), 0.0) + float(ing.get("quantity") or 0.0)
+    return merged
+
+
+def sql_totals(week_start: str) -> dict[tuple[str, str], float]:
+    return {(row["name"], row["unit"]): row["quantity"] for row in database.get_grocery_totals(week_start)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipes",     type=int, default=20_000)
+    parser.add_argument("--ingredients", type=int, default=12)
+    parser.add_argument("--seed",        type=int, default=1)
+    args = parser.parse_args()
+
+    with temp_database():
+        database.create_tables()
+        started    = time.perf_counter()
+        recipe_ids = populate_library(args.recipes, args.ingredients, args.seed)
+        print(f"loaded {args.recipes:,} recipes in {time.perf_counter() - started:.1f}s")
+
+        planned = random.Random(args.seed).sample(recipe_ids, 7 * len(MEAL_TYPES))
+        slots   = [(day, meal_type) for day in database.PLAN_DAYS for meal_type in MEAL_TYPES]
+        database.save_week_plan(WEEK_START, dict(zip(slots, planned)))
+
+        expected = python_merge(WEEK_START)
+        actual   = sql_totals(WEEK_START)
+        assert expected.keys() == actual.keys()
+        assert all(abs(expected[key] - actual[key]) < 1e-6 for key in expected)
+
+        rows = [
+            ("get_meal_plan + get_ingredients_for_recipes + merge", len(expected),
+             f"{best_of(lambda: python_merge(WEEK_START), repeat=20):.2f}"),
+            ("get_grocery_totals", len(actual),
+             f"{best_of(lambda: sql_totals(WEEK_START), repeat=20):.2f}"),
+        ]
+
+    print_table(
+        f"21-slot week over {args.recipes:,} recipes, best of 20",
+        ("path", "rows", "ms"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
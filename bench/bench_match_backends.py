@@ -0,0 +1,69 @@
+"""
+Pantry matching: python vs numpy backend on a synthetic library.
+
+    python bench/bench_match_backends.py [--recipes 100000] [--ingredients 5000]
+
+Builds an IngredientIndex straight from generated rows (no database),
+then times match() on both backends for a few pantry sizes and checks
+that they return the same results.
+"""
+import argparse
+import random
+import time
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from common import best_of, print_table
+
+from ingredient_index import IngredientIndex, np
+
+
+def build_index(n_recipes: int, n_ingredients: int, seed: int) -> IngredientIndex:
+    rng         = random.Random(seed)
+    vocabulary  = [f"ingredient {i}" for i in range(n_ingredients)]
+    recipes     = [{"id": rid, "title": f"Recipe {rid}", "cook_time": rng.randint(5, 90)}
+                   for rid in range(1, n_recipes + 1)]
+    ingredients = (
+        (r["id"], [{"canonical_name": name} for name in rng.sample(vocabulary, rng.randint(4, 14))])
+        for r in recipes
+    )
+    return IngredientIndex(recipes, ingredients)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipes",     type=int, default=100_000)
+    parser.add_argument("--ingredients", type=int, default=5_000)
+    parser.add_argument("--limit",       type=int, default=20)
+    parser.add_argument("--seed",        type=int, default=1)
+    args = parser.parse_args()
+
+    if np is None:
+        raise SystemExit("numpy is not installed; only the python backend is available.")
+
+    started = time.perf_counter()
+    index   = build_index(args.recipes, args.ingredients, args.seed)
+    print(f"index: {len(index):,} recipes x {args.ingredients:,} ingredients "
+          f"built in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    index.score_arrays(set())
+    print(f"numpy matrix packed in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    rng  = random.Random(args.seed + 1)
+    rows = []
+    for size in (10, 50, 200, 1000):
+        pantry = set(rng.sample(index.vocabulary, size))
+        assert index.match(pantry, "python", args.limit) == index.match(pantry, "numpy", args.limit)
+        python_ms = best_of(lambda: index.match(pantry, "python", args.limit))
+        numpy_ms  = best_of(lambda: index.match(pantry, "numpy", args.limit))
+        rows.append((size, f"{python_ms:.1f}", f"{numpy_ms:.1f}", f"{python_ms / numpy_ms:.1f}x"))
+
+    print_table(
+        f"match(pantry, limit={args.limit}), best of 5",
+        ("pantry size", "python ms", "numpy ms", "speed-up"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Batch pantry matching: pantries/sec for match_many() by backend and batch size.
+
+    python bench/bench_match_many.py [--recipes 20000] [--ingredients 2000] [--pantries 2000]
+
+Streams the same random pantries through match_many() on the python
+backend and on the numpy backend at several batch sizes, and checks the
+streamed output against per-pantry match().
+"""
+import argparse
+import random
+import time
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from common import print_table
+from bench_match_backends import build_index
+
+from ingredient_index import np
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipes",     type=int, default=20_000)
+    parser.add_argument("--ingredients", type=int, default=2_000)
+    parser.add_argument("--pantries",    type=int, default=2_000)
+    parser.add_argument("--limit",       type=int, default=20)
+    parser.add_argument("--seed",        type=int, default=1)
+    args = parser.parse_args()
+
+    if np is None:
+        raise SystemExit("numpy is not installed; only the python backend is available.")
+
+    index    = build_index(args.recipes, args.ingredients, args.seed)
+    rng      = random.Random(args.seed + 1)
+    pantries = [set(rng.sample(index.vocabulary, rng.randint(5, 60))) for _ in range(args.pantries)]
+    index.score_arrays(set())  # pack the numpy matrix outside the timings
+
+    expected = [index.match(pantry, "python", args.limit) for pantry in pantries[:50]]
+
+    rows = []
+    for backend, batch_size in [("python", 1), ("numpy", 1), ("numpy", 16), ("numpy", 64), ("numpy", 256)]:
+        streamed = index.match_many(pantries[:50], backend, args.limit, batch_size)
+        assert list(streamed) == expected, f"{backend} batch_size={batch_size} disagrees with match()"
+
+        started = time.perf_counter()
+        for _ in index.match_many(pantries, backend, args.limit, batch_size):
+            pass
+        elapsed = time.perf_counter() - started
+        rows.append((backend, batch_size, f"{elapsed:.2f}", f"{args.pantries / elapsed:,.0f}"))
+
+    print_table(
+        f"match_many(): {args.pantries:,} pantries over {len(index):,} recipes, limit={args.limit}",
+        ("backend", "batch size", "seconds", "pantries/sec"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
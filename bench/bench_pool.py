@@ -0,0 +1,112 @@
+"""
+Connection pooling: connections opened and latency for a meal-planner save + rerun.
+
+    python bench/bench_pool.py [--recipes 2000] [--reruns 50]
+
+Replays what pages/meal_planner.py does when the user saves a week —
+list the recipe titles, load the plan, save 21 slots, reload the plan —
+with the pooled get_connection() and with the old behaviour of opening a
+fresh connection on every call. The old per-slot save_meal_plan() loop
+is included for comparison with the single save_week_plan() call.
+"""
+import argparse
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from common import populate_library, print_table, temp_database
+
+import database
+
+WEEK_START = "2024-03-04"
+MEAL_TYPES = ["Breakfast", "Lunch", "Dinner"]
+
+
+@contextmanager
+def per_call_connections(opened: list[int]):
+    """Swap in the pre-pool get_connection(): a new connection per call, never closed."""
+    pooled = database.get_connection
+
+    def connect() -> sqlite3.Connection:
+        conn = sqlite3.connect(database.DB_NAME)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        opened.append(1)
+        return conn
+
+    database.get_connection = connect
+    try:
+        yield
+    finally:
+        database.get_connection = pooled
+
+
+def rerun(recipe_ids: list[int], n: int, week_save: bool) -> None:
+    """One save-and-rerun of the meal planner page."""
+    database.list_recipes(projection="titles")
+    database.get_meal_plan(WEEK_START)
+
+    slots = {
+        (day, meal_type): recipe_ids[(n + i) % len(recipe_ids)]
+        for i, (day, meal_type) in enumerate(
+            (day, meal_type) for day in database.PLAN_DAYS for meal_type in MEAL_TYPES
+        )
+    }
+    if week_save:
+        database.save_week_plan(WEEK_START, slots)
+    else:
+        for (day, meal_type), recipe_id in slots.items():
+            database.save_meal_plan(WEEK_START, day, meal_type, recipe_id)
+
+    database.get_meal_plan(WEEK_START)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipes", type=int, default=2_000)
+    parser.add_argument("--reruns",  type=int, default=50)
+    args = parser.parse_args()
+
+    rows = []
+    with temp_database():
+        database.create_tables()
+        recipe_ids = populate_library(args.recipes)
+
+        for label, pooled, week_save in (
+            ("per-call connections, per-slot saves", False, False),
+            ("per-call connections, save_week_plan", False, True),
+            ("pooled, per-slot saves",               True,  False),
+            ("pooled, save_week_plan",               True,  True),
+        ):
+            database.close_all_connections()
+            opened: list[int] = []
+            started = time.perf_counter()
+            if pooled:
+                before = database.get_pool_stats()["opened"]
+                for n in range(args.reruns):
+                    rerun(recipe_ids, n, week_save)
+                connections = database.get_pool_stats()["opened"] - before
+            else:
+                with per_call_connections(opened):
+                    for n in range(args.reruns):
+                        rerun(recipe_ids, n, week_save)
+                connections = len(opened)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            rows.append((
+                label,
+                connections,
+                f"{connections / args.reruns:.2f}",
+                f"{elapsed_ms / args.reruns:.1f}",
+            ))
+
+    print_table(
+        f"Meal planner save + rerun over {args.recipes:,} recipes (mean of {args.reruns})",
+        ("connection mode / save path", "connections opened", "per rerun", "ms per rerun"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
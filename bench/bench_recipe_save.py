@@ -0,0 +1,104 @@
+"""
+Recipe save: commits and latency for a recipe with many ingredients.
+
+    python bench/bench_recipe_save.py [--ingredients 40] [--repeat 20]
+
+Compares the old page path — add_recipe()/update_recipe() followed by a
+bulk DELETE and one add_ingredient() per row, each in its own
+transaction — with save_recipe_with_ingredients(), for a new recipe and
+for an edit that changes a quarter of the rows.
+"""
+import argparse
+import time
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from common import print_table, temp_database
+
+import database
+
+RECIPE = {
+    "title":        "Benchmark Stew",
+    "description":  "",
+    "cuisine":      "French",
+    "cook_time":    90,
+    "servings":     6,
+    "tags":         "stew, slow",
+    "instructions": "Cook slowly.",
+}
+
+
+def make_ingredients(count: int, edit: bool = False) -> list[dict]:
+    rows = [{"name": f"ingredient {i}", "quantity": float(i + 1), "unit": "g"} for i in range(count)]
+    if edit:
+        for row in rows[::4]:
+            row["quantity"] *= 2
+    return rows
+
+
+def legacy_save(ingredients: list[dict], recipe_id=None) -> int:
+    fields = [RECIPE[k] for k in ("title", "description", "cuisine", "cook_time", "servings", "tags", "instructions")]
+    if recipe_id is None:
+        recipe_id = database.add_recipe(*fields)
+    else:
+        database.update_recipe(recipe_id, *fields)
+        with database.get_connection() as conn:
+            conn.execute("DELETE FROM ingredients WHERE recipe_id = ?", (recipe_id,))
+    for ing in ingredients:
+        database.add_ingredient(recipe_id, ing["name"], ing["quantity"], ing["unit"])
+    return recipe_id
+
+
+def atomic_save(ingredients: list[dict], recipe_id=None) -> int:
+    return database.save_recipe_with_ingredients(RECIPE, ingredients, recipe_id)
+
+
+def measure(save, count: int, repeat: int) -> tuple[int, float, int, float]:
+    """Return (commits, ms) for an insert and for an edit, averaged over `repeat` recipes."""
+    statements: list[str] = []
+    database.get_connection().set_trace_callback(statements.append)
+
+    def commits() -> int:
+        return sum(1 for sql in statements if sql.strip().upper() == "COMMIT")
+
+    insert_ms = edit_ms = 0.0
+    insert_commits = edit_commits = 0
+    for _ in range(repeat):
+        before  = commits()
+        started = time.perf_counter()
+        recipe_id = save(make_ingredients(count))
+        insert_ms      += (time.perf_counter() - started) * 1000
+        insert_commits += commits() - before
+
+        before  = commits()
+        started = time.perf_counter()
+        save(make_ingredients(count, edit=True), recipe_id)
+        edit_ms      += (time.perf_counter() - started) * 1000
+        edit_commits += commits() - before
+
+    database.get_connection().set_trace_callback(None)
+    return insert_commits // repeat, insert_ms / repeat, edit_commits // repeat, edit_ms / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ingredients", type=int, default=40)
+    parser.add_argument("--repeat",      type=int, default=20)
+    args = parser.parse_args()
+
+    rows = []
+    for label, save in (("add_recipe + add_ingredient", legacy_save),
+                        ("save_recipe_with_ingredients", atomic_save)):
+        with temp_database():
+            database.create_tables()
+            ins_commits, ins_ms, edit_commits, edit_ms = measure(save, args.ingredients, args.repeat)
+        rows.append((label, ins_commits, f"{ins_ms:.1f}", edit_commits, f"{edit_ms:.1f}"))
+
+    print_table(
+        f"Saving a {args.ingredients}-ingredient recipe (mean of {args.repeat})",
+        ("path", "insert commits", "insert ms", "edit commits", "edit ms"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
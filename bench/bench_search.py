@@ -0,0 +1,64 @@
+"""
+Recipe search: FTS5 search_recipes() vs the old Python title scan.
+
+    python bench/bench_search.py [--recipes 50000]
+
+The old Recipe Library loaded every recipe with list_recipes() on each
+keystroke rerun and kept the titles containing the query. The page now
+asks recipes_fts for one ranked page plus the total count. Note that FTS
+also matches descriptions, instructions and ingredient names, so its hit
+counts are higher.
+"""
+import argparse
+import time
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from common import best_of, populate_library, print_table, temp_database
+
+import database
+
+QUERIES  = ["chicken", "chick", "coconut rice", "ginger 12", "zzzz"]
+PAGE     = 20
+
+
+def title_scan(query: str) -> tuple[list[dict], int]:
+    q      = query.strip().lower()
+    result = [r for r in database.list_recipes(projection="summary") if q in r["title"].lower()]
+    return result[:PAGE], len(result)
+
+
+def fts_search(query: str) -> tuple[list[dict], int]:
+    return database.search_recipes(query, limit=PAGE), database.count_search_results(query)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipes", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with temp_database():
+        database.create_tables()
+        started = time.perf_counter()
+        populate_library(args.recipes)
+        print(f"loaded {args.recipes:,} recipes in {time.perf_counter() - started:.1f}s")
+
+        rows = []
+        for query in QUERIES:
+            scan_ms = best_of(lambda: title_scan(query))
+            fts_ms  = best_of(lambda: fts_search(query))
+            rows.append((
+                repr(query),
+                title_scan(query)[1], f"{scan_ms:.1f}",
+                fts_search(query)[1], f"{fts_ms:.1f}",
+                f"{scan_ms / fts_ms:.0f}x",
+            ))
+
+    print_table(
+        f"First page of {PAGE} + total count over {args.recipes:,} recipes, best of 5",
+        ("query", "scan hits", "scan ms", "fts hits", "fts ms", "speed-up"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
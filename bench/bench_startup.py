@@ -0,0 +1,94 @@
+"""
+Startup latency: bootstrap on cold and warm databases.
+
+    python bench/bench_startup.py [--repeat 10] [--library 5000]
+
+Times the bootstrap_database() steps from app.py — stamp lookup, then
+schema + seed only when the stamp is missing or stale — against the old
+top-of-script create_tables() + seed_recipes() on a fresh file (cold)
+and on an already-seeded one (warm) holding `--library` extra recipes.
+Each run starts from closed connections, as a new server process would.
+"""
+import argparse
+import io
+import time
+from contextlib import redirect_stdout
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from common import populate_library, print_table, temp_database
+
+import database
+import seed_data
+
+BOOTSTRAP_STAMP = f"{database.SCHEMA_VERSION}.{seed_data.SEED_VERSION}"
+
+
+def old_startup() -> None:
+    database.create_tables()
+    seed_data.seed_recipes()
+
+
+def bootstrap() -> None:
+    """Same steps as app.bootstrap_database(), without the Streamlit cache."""
+    if database.get_bootstrap_stamp() == BOOTSTRAP_STAMP:
+        return
+    database.ensure_schema()
+    seed_data.seed_recipes()
+    database.set_bootstrap_stamp(BOOTSTRAP_STAMP)
+
+
+def new_process() -> None:
+    """Forget per-process state so the next call behaves like a fresh server."""
+    database.close_all_connections()
+    database._schema_ready_for = None
+
+
+def time_ms(fn) -> float:
+    new_process()
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat",  type=int, default=10)
+    parser.add_argument("--library", type=int, default=5_000)
+    args = parser.parse_args()
+
+    paths = (("create_tables + seed_recipes", old_startup),
+             ("bootstrap_database",           bootstrap))
+    cold: dict[str, list[float]] = {label: [] for label, _ in paths}
+    warm: dict[str, list[float]] = {label: [] for label, _ in paths}
+
+    previous = seed_data.DB_NAME
+    try:
+        for label, startup in paths:
+            for _ in range(args.repeat):
+                with temp_database():
+                    seed_data.DB_NAME = database.DB_NAME
+                    cold[label].append(time_ms(startup))
+
+        with temp_database():
+            seed_data.DB_NAME = database.DB_NAME
+            time_ms(bootstrap)
+            populate_library(args.library)
+            for label, startup in paths:
+                warm[label] = [time_ms(startup) for _ in range(args.repeat)]
+    finally:
+        seed_data.DB_NAME = previous
+
+    rows = [(label, f"{min(cold[label]):.1f}", f"{min(warm[label]):.1f}") for label, _ in paths]
+
+    print_table(
+        f"Startup latency in ms (best of {args.repeat})",
+        ("startup path", "cold database", f"warm, {args.library:,} extra recipes"),
+        rows,
+    )
+    print("\nbootstrap_database() is also cached with st.cache_resource, so "
+          "widget reruns skip it entirely; the old path ran on every rerun.")
+
+
+if __name__ == "__main__":
+    main()
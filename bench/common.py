@@ -0,0 +1,99 @@
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+# Benchmarks run as plain scripts from the repo root: python bench/<name>.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Shared benchmark helpers
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def temp_database() -> Iterator[str]:
+    """Point database.DB_NAME at a fresh file for the duration of the block."""
+    previous = database.DB_NAME
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, "recipes.db")
+        database.close_all_connections()
+        try:
+            yield database.DB_NAME
+        finally:
+            database.stop_write_queue()
+            database.close_all_connections()
+            database.DB_NAME = previous
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Return the fastest of `repeat` runs of fn(), in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def print_table(title: str, header: tuple[str, ...], rows: list[tuple]) -> None:
+    """Print rows as an aligned plain-text table."""
+    cells  = [header] + [tuple(str(c) for c in row) for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(header))]
+    print(f"\n{title}")
+    for n, row in enumerate(cells):
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+        if n == 0:
+            print("  ".join("-" * width for width in widths))
+
+
+WORDS = [
+    "chicken", "beef", "tofu", "lentil", "tomato", "onion", "garlic", "ginger",
+    "coconut", "spinach", "mushroom", "pepper", "lemon", "basil", "rice", "noodle",
+    "potato", "carrot", "chickpea", "salmon", "cumin", "paprika", "honey", "lime",
+]
+CUISINES = ["Italian", "Indian", "Thai", "Mexican", "French", "Japanese", "Greek"]
+
+
+def populate_library(n_recipes: int, ingredients_per_recipe: int = 8, seed: int = 1) -> list[int]:
+    """
+    Bulk-load `n_recipes` synthetic recipes into the current database.
+
+    Titles and descriptions are built from WORDS so searches have realistic
+    hit rates. Ingredients are linked to the catalog like a normal save.
+    Each recipe's ingredients are inserted before the recipe itself
+    (foreign keys are deferred to the commit) so the FTS triggers index
+    every recipe once instead of once per ingredient. Returns the new
+    recipe ids.
+    """
+    rng  = random.Random(seed)
+    conn = database.get_connection()
+    with conn:
+        conn.execute("BEGIN")
+        conn.execute("PRAGMA defer_foreign_keys = ON")
+        first       = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM recipes").fetchone()[0]
+        recipe_ids  = list(range(first, first + n_recipes))
+        names       = [f"{word} {k}" for word in WORDS for k in range(20)]
+        catalog_ids = database.get_or_create_catalog_ids(conn, names)
+
+        for recipe_id in recipe_ids:
+            conn.executemany(
+                "INSERT INTO ingredients (recipe_id, name, quantity, unit, catalog_id) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (recipe_id, name, float(rng.randint(1, 500)), rng.choice(["g", "ml", "pcs"]), catalog_ids[name])
+                    for name in rng.sample(names, ingredients_per_recipe)
+                ],
+            )
+            conn.execute(
+                "INSERT INTO recipes (id, title, description, cuisine, cook_time, servings, tags, instructions) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (recipe_id, " ".join(rng.sample(WORDS, 2)).title() + f" {recipe_id}",
+                 " ".join(rng.sample(WORDS, 6)), rng.choice(CUISINES),
+                 rng.randint(10, 90), rng.randint(1, 6), "", "Cook until done."),
+            )
+    return recipe_ids
@@ -1,8 +1,252 @@
+import atexit
+import os
+import queue
+import re
 import sqlite3
-from typing import Optional
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, timedelta
+from typing import Any, Callable, Iterator, Optional
+
+from ingredient_names import canonical_ingredient_name
+from migrations import LATEST_VERSION, migrate
 
 DB_NAME = "recipes.db"
 
+# Latest migration number; part of the app bootstrap stamp.
+SCHEMA_VERSION = LATEST_VERSION
+
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER on older builds is 999, so
+# IN (...) lists are sent in chunks no larger than this.
+MAX_SQL_VARIABLES = 900
+
+# Upper bound on open connections shared across Streamlit session threads.
+POOL_SIZE = 8
+
+# Seconds a thread waits for a free connection before giving up.
+POOL_TIMEOUT = 10.0
+
+# A thread that exits while holding a connection never notifies waiters,
+# so a waiting thread wakes at least this often to reclaim dead owners.
+POOL_POLL_INTERVAL = 0.1
+
+# PRAGMAs applied to every new connection. WAL lets readers and a writer
+# proceed concurrently; busy_timeout makes writers wait instead of failing
+# with "database is locked". Each can be overridden with an env var named
+# RECIPES_SQLITE_<PRAGMA>, e.g. RECIPES_SQLITE_BUSY_TIMEOUT=10000.
+DEFAULT_PRAGMAS: dict[str, str] = {
+    "journal_mode": "WAL",
+    "synchronous":  "NORMAL",
+    "busy_timeout": "5000",        # milliseconds
+    "mmap_size":    "268435456",   # 256 MB
+    "cache_size":   "-20000",      # negative = KiB, so ~20 MB
+    "temp_store":   "MEMORY",
+}
+
+PRAGMA_ENV_PREFIX = "RECIPES_SQLITE_"
+
+
+def get_pragma_profile() -> dict[str, str]:
+    """
+    Return the PRAGMA settings for new connections, with env overrides applied.
+
+    Values must be plain words or integers (optionally negative) since
+    PRAGMA statements cannot take bound parameters. Blank overrides are
+    ignored.
+
+    Returns:
+        dict[str, str]: { pragma_name: value }
+
+    Raises:
+        ValueError: If an environment override contains anything else.
+    """
+    profile = dict(DEFAULT_PRAGMAS)
+    for name in profile:
+        override = os.environ.get(f"{PRAGMA_ENV_PREFIX}{name.upper()}", "").strip()
+        if not override:
+            continue
+        if not re.fullmatch(r"-?\d+|\w+", override):
+            raise ValueError(f"Invalid value for {PRAGMA_ENV_PREFIX}{name.upper()}: {override!r}")
+        profile[name] = override
+    return profile
+
+
+# ---------------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------------
+
+class _GroupCommitConnection(sqlite3.Connection):
+    """
+    Connection whose `with` block can be told to leave the transaction open.
+
+    The write queue sets `defer_commit` while it runs a batch so that each
+    queued function's own `with get_connection() as conn:` block does not
+    commit; the queue commits the whole batch once at the end instead.
+    """
+
+    defer_commit = False
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.defer_commit:
+            return False
+        return super().__exit__(exc_type, exc_value, traceback)
+
+
+class _ConnectionPool:
+    """
+    Bounded pool of SQLite connections with per-thread reuse.
+
+    Streamlit runs each session's script on its own thread, so the first
+    call to get_connection() on a thread checks a connection out of the
+    pool and every later call on that thread reuses it. Connections owned
+    by threads that have finished are reclaimed automatically while a
+    thread waits on a dry pool, or explicitly via release().
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.pragmas  = get_pragma_profile()
+        self._lock    = threading.Condition()
+        self._local   = threading.local()
+        self._idle:   list[sqlite3.Connection] = []
+        self._owners: dict[threading.Thread, sqlite3.Connection] = {}
+        self._db_name = DB_NAME
+        self.opened   = 0
+        self.reused   = 0
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._db_name,
+            check_same_thread = False,
+            factory           = _GroupCommitConnection,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        self.opened += 1
+        return conn
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._owners)
+
+    def _reclaim_dead_owners(self) -> None:
+        for thread, conn in list(self._owners.items()):
+            if not thread.is_alive():
+                del self._owners[thread]
+                self._checkin(conn)
+
+    def _checkin(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.append(conn)
+
+    def acquire(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._db_name == DB_NAME:
+            self.reused += 1
+            return conn
+
+        with self._lock:
+            # A changed DB_NAME (e.g. a test database) invalidates every handle.
+            if self._db_name != DB_NAME:
+                self._close_all_locked()
+                self._db_name = DB_NAME
+
+            deadline = time.monotonic() + POOL_TIMEOUT
+            while not self._idle and self._total() >= self.max_size:
+                self._reclaim_dead_owners()
+                if self._idle:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise sqlite3.OperationalError(
+                        f"connection pool exhausted ({self.max_size} connections in use)"
+                    )
+                self._lock.wait(timeout=min(remaining, POOL_POLL_INTERVAL))
+
+            conn = self._idle.pop() if self._idle else self._open()
+            self._owners[threading.current_thread()] = conn
+
+        self._local.conn = conn
+        return conn
+
+    def open_dedicated(self) -> sqlite3.Connection:
+        """
+        Open a connection outside the pool and bind it to the calling thread.
+
+        It does not count against max_size, so a long-lived thread such as
+        the writer can never be starved by session threads. The caller
+        owns it: re-bind with bind() after close_all() and close it itself.
+        """
+        with self._lock:
+            if self._db_name != DB_NAME:
+                self._close_all_locked()
+                self._db_name = DB_NAME
+            conn = self._open()
+        self._local.conn = conn
+        return conn
+
+    def bind(self, conn: Optional[sqlite3.Connection]) -> None:
+        """Make get_connection() on the calling thread return `conn`."""
+        self._local.conn = conn
+
+    @property
+    def db_name(self) -> str:
+        return self._db_name
+
+    def release(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            self._owners.pop(threading.current_thread(), None)
+            self._checkin(conn)
+            self._lock.notify()
+
+    def reset(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            self._owners.pop(threading.current_thread(), None)
+            conn.close()
+            self._lock.notify()
+
+    def _close_all_locked(self) -> None:
+        for conn in self._idle:
+            conn.close()
+        for conn in self._owners.values():
+            conn.close()
+        self._idle.clear()
+        self._owners.clear()
+        # Thread-locals on other threads still point at the closed handles;
+        # replacing the local object drops them all at once.
+        self._local = threading.local()
+        self.pragmas = get_pragma_profile()
+        self._lock.notify_all()
+
+    def close_all(self) -> None:
+        with self._lock:
+            self._close_all_locked()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "idle":     len(self._idle),
+                "in_use":   len(self._owners),
+                "opened":   self.opened,
+                "reused":   self.reused,
+            }
+
+
+_pool = _ConnectionPool(POOL_SIZE)
+atexit.register(_pool.close_all)
+
 
 # ---------------------------------------------------------------------------
 # Core
@@ -10,84 +254,412 @@ DB_NAME = "recipes.db"
 
 def get_connection() -> sqlite3.Connection:
     """
-    Create and return a connection to the SQLite database.
+    Return the calling thread's pooled connection to the SQLite database.
+
+    The first call on a thread checks a connection out of a bounded pool;
+    later calls on the same thread return the same handle, so a Streamlit
+    rerun opens at most one connection. Use it as a context manager
+    (`with get_connection() as conn:`) to commit or roll back — the
+    connection itself stays open for reuse.
 
-    Enables:
+    New connections enable:
         - Row factory so all results are returned as dictionaries.
         - Foreign key constraint enforcement.
+        - The performance PRAGMAs from get_pragma_profile() (WAL,
+          busy_timeout, mmap, page cache, ...).
 
     Returns:
         sqlite3.Connection: An open database connection.
     """
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
+    return _pool.acquire()
+
+
+def release_connection() -> None:
+    """
+    Return the calling thread's connection to the pool.
+
+    Any uncommitted transaction is rolled back. Safe to call when the
+    thread holds no connection.
+    """
+    _pool.release()
+
+
+def reset_connection() -> None:
+    """
+    Close and discard the calling thread's connection.
+
+    Use after an unexpected error leaves the handle in a bad state; the
+    next get_connection() call opens a fresh one.
+    """
+    _pool.reset()
+
+
+def close_all_connections() -> None:
+    """
+    Close every pooled connection, idle or checked out.
+
+    Intended for shutdown, tests, and switching DB_NAME. Threads that
+    still hold a handle will transparently get a new one on their next
+    get_connection() call. The PRAGMA profile is re-read from the
+    environment so new overrides take effect.
+    """
+    _pool.close_all()
+
+
+def get_pool_stats() -> dict:
+    """
+    Return connection pool counters for diagnostics and benchmarking.
+
+    Returns:
+        dict: max_size, idle, in_use, opened (connections ever opened)
+              and reused (get_connection() calls served by a cached handle).
+    """
+    return _pool.stats()
 
 
 def create_tables() -> None:
     """
-    Create all required tables if they do not already exist.
+    Create or upgrade all required tables by running pending migrations.
 
     Tables created:
         - recipes      (now includes `instructions` column)
         - ingredients  (CASCADE delete on recipe removal)
-        - meal_plan
+        - meal_plan    (one row per week_start/day/meal_type slot)
+        - app_meta     (key/value stamps, e.g. the bootstrap version)
+
+    Schema changes live in migrations.py as numbered steps tracked by
+    PRAGMA user_version. On an up-to-date database this is a single
+    pragma read. Safe to call multiple times.
+    """
+    migrate(get_connection())
+
+
+# DB_NAME whose schema ensure_schema() last brought up to date.
+_schema_ready_for: Optional[str] = None
+_schema_lock = threading.Lock()
 
-    Also runs a safe migration: if the database already exists without
-    the `instructions` column, ALTER TABLE adds it without touching any
-    existing data. Safe to call multiple times.
+
+def ensure_schema() -> None:
+    """
+    Run pending migrations once per process before a page reads the database.
+
+    app.py bootstraps the database on its first run, but Streamlit can
+    open any page directly (a bookmarked URL, or a browser tab left open
+    across a server restart), so every page calls this first. After the
+    first call it is a single string comparison; the lock stops sessions
+    that start together from migrating concurrently.
+    """
+    global _schema_ready_for
+    if _schema_ready_for == DB_NAME:
+        return
+    with _schema_lock:
+        if _schema_ready_for != DB_NAME:
+            create_tables()
+            _schema_ready_for = DB_NAME
+
+
+def get_bootstrap_stamp() -> Optional[str]:
+    """
+    Return the schema/seed version stamp recorded by the last bootstrap.
+
+    A single primary-key lookup, so it is cheap enough to run on every
+    server start. Returns None on a fresh database where app_meta does
+    not exist yet.
+    """
+    try:
+        with get_connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM app_meta WHERE key = 'bootstrap_version'"
+            ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row["value"] if row else None
+
+
+def set_bootstrap_stamp(stamp: str) -> None:
+    """
+    Record the schema/seed version stamp once bootstrap has completed.
+
+    Args:
+        stamp: Opaque version string, e.g. '2.1' for schema 2 / seed 1.
+    """
+    sql = """
+        INSERT INTO app_meta (key, value) VALUES ('bootstrap_version', ?)
+        ON CONFLICT (key) DO UPDATE SET value = excluded.value
     """
     with get_connection() as conn:
-        conn.executescript("""
-            CREATE TABLE IF NOT EXISTS recipes (
-                id           INTEGER PRIMARY KEY AUTOINCREMENT,
-                title        TEXT    NOT NULL,
-                description  TEXT,
-                cuisine      TEXT,
-                cook_time    INTEGER,
-                servings     INTEGER,
-                tags         TEXT,
-                instructions TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS ingredients (
-                id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                recipe_id   INTEGER NOT NULL,
-                name        TEXT    NOT NULL,
-                quantity    REAL,
-                unit        TEXT,
-                FOREIGN KEY (recipe_id)
-                    REFERENCES recipes (id)
-                    ON DELETE CASCADE
-            );
-
-            CREATE TABLE IF NOT EXISTS meal_plan (
-                id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                week_start  TEXT    NOT NULL,
-                day         TEXT    NOT NULL,
-                meal_type   TEXT    NOT NULL,
-                recipe_id   INTEGER,
-                FOREIGN KEY (recipe_id)
-                    REFERENCES recipes (id)
-            );
-        """)
-
-        # ── Migration: add `instructions` to existing databases ────────────
-        # PRAGMA table_info returns one row per column. We check whether
-        # `instructions` is already present before attempting ALTER TABLE,
-        # because SQLite does not support IF NOT EXISTS on ADD COLUMN.
-        existing_columns = {
-            row[1] for row in conn.execute("PRAGMA table_info(recipes)").fetchall()
-        }
-        if "instructions" not in existing_columns:
-            conn.execute("ALTER TABLE recipes ADD COLUMN instructions TEXT")
+        conn.execute(sql, (stamp,))
+
+
+def _get_revision(key: str) -> int:
+    """Read an integer change counter from app_meta (0 if missing)."""
+    with get_connection() as conn:
+        row = conn.execute("SELECT value FROM app_meta WHERE key = ?", (key,)).fetchone()
+    return int(row["value"]) if row else 0
+
+
+def get_plan_revision() -> int:
+    """
+    Return the meal plan / ingredient change counter.
+
+    Triggers bump it on every insert, update or delete of meal_plan or
+    ingredients rows, so it works as a cheap cache key for anything
+    derived from the plan (e.g. grocery totals).
+    """
+    return _get_revision("plan_revision")
+
+
+def get_library_revision() -> int:
+    """
+    Return the recipe library change counter.
+
+    Triggers bump it on every insert, update or delete of recipes or
+    ingredients rows, so it works as a cache key for anything derived
+    from the library (e.g. the What Can I Cook ingredient index).
+    """
+    return _get_revision("library_revision")
+
+
+# ---------------------------------------------------------------------------
+# Write queue
+# ---------------------------------------------------------------------------
+
+# Set RECIPES_WRITE_QUEUE=1 to route page writes through a single writer
+# thread instead of writing from each Streamlit session thread.
+WRITE_QUEUE_ENABLED = os.environ.get("RECIPES_WRITE_QUEUE", "") == "1"
+
+# Most queued writes committed together in one transaction.
+WRITE_BATCH_SIZE = 64
+
+
+class _WriteQueue:
+    """
+    Single writer thread that serialises writes and group-commits them.
+
+    Callers submit a write function and get a Future back. The writer
+    thread takes whatever is queued (up to WRITE_BATCH_SIZE), runs each
+    function inside its own SAVEPOINT so one failure does not spoil the
+    rest, then commits the batch once. Reads never pass through here.
+
+    The writer uses its own connection from _pool.open_dedicated(), so
+    sessions holding every pooled connection cannot starve it.
+    """
+
+    def __init__(self, batch_size: int) -> None:
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._conn:   Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.writes  = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="recipes-db-writer", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        self.start()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def _run(self) -> None:
+        try:
+            self._conn = _pool.open_dedicated()
+        except Exception:
+            self._conn = None  # retried by _connection() on the first batch
+
+        running = True
+        try:
+            while running:
+                job = self._queue.get()
+                if job is None:
+                    break
+                batch = [job]
+                while len(batch) < self.batch_size:
+                    try:
+                        job = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is None:
+                        running = False
+                        break
+                    batch.append(job)
+                self._commit_batch(batch)
+        finally:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            _pool.bind(None)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the writer's own connection, reopening it if DB_NAME changed."""
+        if self._conn is None or _pool.db_name != DB_NAME:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._conn = _pool.open_dedicated()
+        # close_all_connections() drops thread bindings, so bind every batch.
+        _pool.bind(self._conn)
+        return self._conn
+
+    def _commit_batch(self, batch: list[tuple]) -> None:
+        live = [job for job in batch if job[0].set_running_or_notify_cancel()]
+        if not live:
+            return
+
+        try:
+            conn = self._connection()
+        except Exception as exc:
+            for future, *_ in live:
+                future.set_exception(exc)
+            return
+
+        outcomes: list[tuple[Future, bool, Any]] = []
+
+        conn.defer_commit = True
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for future, fn, args, kwargs in live:
+                conn.execute("SAVEPOINT queued_write")
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as exc:
+                    conn.execute("ROLLBACK TO queued_write")
+                    conn.execute("RELEASE queued_write")
+                    outcomes.append((future, False, exc))
+                else:
+                    conn.execute("RELEASE queued_write")
+                    outcomes.append((future, True, result))
+            conn.commit()
+        except Exception as exc:
+            # BEGIN or COMMIT failed — nothing in this batch was persisted.
+            if conn.in_transaction:
+                conn.rollback()
+            outcomes = [(future, False, exc) for future, *_ in live]
+        finally:
+            conn.defer_commit = False
+
+        self.batches += 1
+        self.writes  += len(outcomes)
+        for future, ok, value in outcomes:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+_write_queue = _WriteQueue(WRITE_BATCH_SIZE)
+atexit.register(_write_queue.stop)
+
+
+def submit_write(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """
+    Run a write function through the write queue and return its Future.
+
+    When WRITE_QUEUE_ENABLED is off (the default) the function runs
+    immediately on the calling thread and an already-completed Future is
+    returned, so callers can always just do `submit_write(...).result()`.
+
+    Args:
+        fn:     A database write function, e.g. save_week_plan.
+        *args:  Positional arguments for fn.
+        **kwargs: Keyword arguments for fn.
+
+    Returns:
+        Future: Resolves to fn's return value, or raises its exception.
+    """
+    if WRITE_QUEUE_ENABLED:
+        return _write_queue.submit(fn, *args, **kwargs)
+
+    future: Future = Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def start_write_queue() -> None:
+    """Start the writer thread and route submit_write() calls through it."""
+    global WRITE_QUEUE_ENABLED
+    WRITE_QUEUE_ENABLED = True
+    _write_queue.start()
+
+
+def stop_write_queue() -> None:
+    """Drain pending writes, stop the writer thread and write inline again."""
+    global WRITE_QUEUE_ENABLED
+    WRITE_QUEUE_ENABLED = False
+    _write_queue.stop()
+
+
+def get_write_queue_stats() -> dict:
+    """
+    Return write queue counters.
+
+    Returns:
+        dict: enabled, pending (queued jobs), batches (commits made) and
+              writes (jobs completed, successfully or not).
+    """
+    return {
+        "enabled": WRITE_QUEUE_ENABLED,
+        "pending": _write_queue._queue.qsize(),
+        "batches": _write_queue.batches,
+        "writes":  _write_queue.writes,
+    }
 
 
 # ---------------------------------------------------------------------------
 # Recipe functions
 # ---------------------------------------------------------------------------
 
+def parse_tag_list(tags: Optional[str]) -> list[str]:
+    """
+    Split a comma-separated tags string into clean, unique lowercase tags.
+
+    Args:
+        tags: Raw tags string e.g. 'Vegan, quick ,healthy'.
+
+    Returns:
+        list[str]: e.g. ['vegan', 'quick', 'healthy'], in original order.
+    """
+    if not tags:
+        return []
+    return list(dict.fromkeys(t.strip().lower() for t in tags.split(",") if t.strip()))
+
+
+def replace_recipe_tags(conn: sqlite3.Connection, recipe_id: int, tags: Optional[str]) -> None:
+    """
+    Rewrite a recipe's rows in the recipe_tags junction table.
+
+    Runs on the caller's connection so it joins the caller's transaction.
+    Every write path that sets recipes.tags must call this.
+
+    Args:
+        conn:      Open connection, usually inside a `with` block.
+        recipe_id: The recipe whose tags changed.
+        tags:      The new comma-separated tags string.
+    """
+    conn.execute("DELETE FROM recipe_tags WHERE recipe_id = ?", (recipe_id,))
+    conn.executemany(
+        "INSERT INTO recipe_tags (tag, recipe_id) VALUES (?, ?)",
+        [(tag, recipe_id) for tag in parse_tag_list(tags)],
+    )
+
+
 def add_recipe(
     title: str,
     description: str,
@@ -118,6 +690,7 @@ def add_recipe(
     """
     with get_connection() as conn:
         cursor = conn.execute(sql, (title, description, cuisine, cook_time, servings, tags, instructions))
+        replace_recipe_tags(conn, cursor.lastrowid, tags)
         return cursor.lastrowid
 
 
@@ -157,6 +730,7 @@ def update_recipe(
     """
     with get_connection() as conn:
         conn.execute(sql, (title, description, cuisine, cook_time, servings, tags, instructions, recipe_id))
+        replace_recipe_tags(conn, recipe_id, tags)
 
 
 def delete_recipe(recipe_id: int) -> None:
@@ -193,6 +767,303 @@ def get_all_recipes() -> list[dict]:
         return [dict(row) for row in rows]
 
 
+# Column sets for list_recipes(). "summary" is everything a card shows
+# without the potentially large instructions text.
+RECIPE_PROJECTIONS: dict[str, tuple[str, ...]] = {
+    "titles":  ("id", "title"),
+    "summary": ("id", "title", "description", "cuisine", "cook_time", "servings", "tags"),
+    "full":    ("id", "title", "description", "cuisine", "cook_time", "servings", "tags", "instructions"),
+}
+
+
+def _recipe_filter_clauses(
+    cuisines: Optional[list[str]],
+    tags: Optional[list[str]],
+    alias: str = "recipes",
+) -> tuple[list[str], list]:
+    """
+    Build SQL conditions for cuisine and tag filters.
+
+    Cuisines match any of the given values via idx_recipes_cuisine; tags
+    match recipes carrying any of the given tags via the recipe_tags
+    primary key, so cost follows the number of matching rows.
+
+    Returns:
+        tuple[list[str], list]: (conditions to AND together, bound params)
+    """
+    clauses: list[str] = []
+    params:  list      = []
+
+    if cuisines:
+        clauses.append(f"{alias}.cuisine IN ({', '.join('?' * len(cuisines))})")
+        params.extend(cuisines)
+
+    if tags:
+        clauses.append(
+            f"{alias}.id IN (SELECT recipe_id FROM recipe_tags "
+            f"WHERE tag IN ({', '.join('?' * len(tags))}))"
+        )
+        params.extend(tag.strip().lower() for tag in tags)
+
+    return clauses, params
+
+
+def list_recipes(
+    projection: str = "summary",
+    after: Optional[tuple[str, int]] = None,
+    limit: Optional[int] = None,
+    cuisines: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+) -> list[dict]:
+    """
+    Retrieve recipes sorted by title with column projection and keyset paging.
+
+    Pages are addressed by the (title, id) of the last row already seen
+    rather than an OFFSET, so fetching page N costs the same as page 1.
+
+    Args:
+        projection: One of RECIPE_PROJECTIONS — 'titles', 'summary' or 'full'.
+        after:      (title, id) of the last recipe on the previous page,
+                    or None to start from the beginning.
+        limit:      Maximum number of recipes to return, or None for all.
+        cuisines:   Only recipes whose cuisine is one of these.
+        tags:       Only recipes with at least one of these tags.
+
+    Returns:
+        list[dict]: Recipes ordered by (title, id) with only the projected
+                    columns. Returns an empty list past the last page.
+
+    Raises:
+        ValueError: If projection is not a known column set.
+    """
+    if projection not in RECIPE_PROJECTIONS:
+        raise ValueError(f"Unknown recipe projection: {projection!r}")
+
+    clauses, params = _recipe_filter_clauses(cuisines, tags)
+    if after is not None:
+        clauses.append("(recipes.title, recipes.id) > (?, ?)")
+        params.extend(after)
+
+    columns = ", ".join(RECIPE_PROJECTIONS[projection])
+    where   = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    paging  = "LIMIT ?" if limit is not None else ""
+    if limit is not None:
+        params.append(limit)
+
+    sql = f"""
+        SELECT {columns}
+        FROM   recipes
+        {where}
+        ORDER  BY title ASC, id ASC
+        {paging}
+    """
+    with get_connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+
+def get_recent_recipes(limit: int = 3) -> list[dict]:
+    """
+    Retrieve the most recently added recipes, newest first.
+
+    Args:
+        limit: How many recipes to return.
+
+    Returns:
+        list[dict]: Up to `limit` recipes with the 'summary' columns.
+    """
+    columns = ", ".join(RECIPE_PROJECTIONS["summary"])
+    sql = f"""
+        SELECT {columns}
+        FROM   recipes
+        ORDER  BY id DESC
+        LIMIT  ?
+    """
+    with get_connection() as conn:
+        rows = conn.execute(sql, (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+
+def count_recipes(
+    cuisines: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+) -> int:
+    """
+    Return the number of recipes, optionally narrowed by filters.
+
+    Args:
+        cuisines: Only count recipes whose cuisine is one of these.
+        tags:     Only count recipes with at least one of these tags.
+
+    Returns:
+        int: Matching recipe count; the library size when unfiltered.
+    """
+    clauses, params = _recipe_filter_clauses(cuisines, tags)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    with get_connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM recipes {where}", params).fetchone()[0]
+
+
+def get_recipe_instructions(recipe_ids: list[int]) -> dict[int, str]:
+    """
+    Retrieve just the instructions text for a set of recipes.
+
+    Lets list views load 'summary' rows and fetch the large instructions
+    column only for the cards actually on screen.
+
+    Args:
+        recipe_ids: Ids of the recipes whose instructions to fetch.
+
+    Returns:
+        dict[int, str]: { recipe_id: instructions } ('' when none).
+    """
+    unique_ids = list(dict.fromkeys(recipe_ids))
+    instructions: dict[int, str] = {}
+
+    with get_connection() as conn:
+        for start in range(0, len(unique_ids), MAX_SQL_VARIABLES):
+            chunk        = unique_ids[start:start + MAX_SQL_VARIABLES]
+            placeholders = ", ".join("?" * len(chunk))
+            sql = f"SELECT id, instructions FROM recipes WHERE id IN ({placeholders})"
+            for row in conn.execute(sql, chunk):
+                instructions[row["id"]] = row["instructions"] or ""
+
+    return instructions
+
+
+# Relative bm25 weight of each recipes_fts column when ranking results:
+# title, description, instructions, ingredients.
+SEARCH_COLUMN_WEIGHTS = (10.0, 3.0, 1.0, 5.0)
+
+
+def build_fts_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term ("chick"* "cur"*), so partial
+    words match as the user types and FTS5 operators in the input are
+    treated as plain text. Terms are ANDed together.
+
+    Args:
+        text: Raw search box input.
+
+    Returns:
+        str: The MATCH expression, or '' if the text contains no words.
+    """
+    words = "".join(ch if ch.isalnum() else " " for ch in text.lower()).split()
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_recipes(
+    query: str,
+    limit: int = 50,
+    offset: int = 0,
+    cuisines: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+) -> list[dict]:
+    """
+    Full-text search over titles, descriptions, instructions and ingredients.
+
+    Uses the recipes_fts index with prefix matching, ranked by bm25 with
+    SEARCH_COLUMN_WEIGHTS so title hits outrank instruction hits. Ties
+    fall back to title, then id, so the order is total and OFFSET pages
+    never repeat or skip a recipe.
+
+    Args:
+        query:    Free-text search input e.g. 'chick curry'.
+        limit:    Maximum number of results.
+        offset:   Number of ranked results to skip.
+        cuisines: Only recipes whose cuisine is one of these.
+        tags:     Only recipes with at least one of these tags.
+
+    Returns:
+        list[dict]: Matching recipes with the 'summary' columns, best
+                    match first. Empty if the query has no words.
+    """
+    match = build_fts_query(query)
+    if not match:
+        return []
+
+    clauses, params = _recipe_filter_clauses(cuisines, tags, alias="r")
+    filters = "".join(f" AND {clause}" for clause in clauses)
+
+    columns = ", ".join(f"r.{col}" for col in RECIPE_PROJECTIONS["summary"])
+    weights = ", ".join(str(w) for w in SEARCH_COLUMN_WEIGHTS)
+    sql = f"""
+        SELECT {columns}
+        FROM   recipes_fts
+        JOIN   recipes r ON r.id = recipes_fts.rowid
+        WHERE  recipes_fts MATCH ?{filters}
+        ORDER  BY bm25(recipes_fts, {weights}), r.title, r.id
+        LIMIT  ? OFFSET ?
+    """
+    with get_connection() as conn:
+        rows = conn.execute(sql, (match, *params, limit, offset)).fetchall()
+        return [dict(row) for row in rows]
+
+
+def count_search_results(
+    query: str,
+    cuisines: Optional[list[str]] = None,
+    tags: Optional[list[str]] = None,
+) -> int:
+    """
+    Return how many recipes search_recipes() would match in total.
+
+    Takes the same query and filters as search_recipes() without the
+    ranking, so a paged result list can show its full size.
+
+    Returns:
+        int: Number of matching recipes; 0 if the query has no words.
+    """
+    match = build_fts_query(query)
+    if not match:
+        return 0
+
+    clauses, params = _recipe_filter_clauses(cuisines, tags, alias="r")
+    filters = "".join(f" AND {clause}" for clause in clauses)
+
+    sql = f"""
+        SELECT COUNT(*)
+        FROM   recipes_fts
+        JOIN   recipes r ON r.id = recipes_fts.rowid
+        WHERE  recipes_fts MATCH ?{filters}
+    """
+    with get_connection() as conn:
+        return conn.execute(sql, (match, *params)).fetchone()[0]
+
+
+def get_recipe_facets() -> dict[str, list[tuple[str, int]]]:
+    """
+    Return every cuisine and tag with the number of recipes that have it.
+
+    Both counts come from indexed GROUP BYs (idx_recipes_cuisine and the
+    recipe_tags primary key) rather than re-parsing every tags string.
+
+    Returns:
+        dict: { "cuisines": [(cuisine, count), ...],
+                "tags":     [(tag, count), ...] }, each sorted by name.
+    """
+    cuisine_sql = """
+        SELECT   cuisine, COUNT(*) AS n
+        FROM     recipes
+        WHERE    cuisine IS NOT NULL AND cuisine != ''
+        GROUP BY cuisine
+        ORDER BY cuisine
+    """
+    tag_sql = """
+        SELECT   tag, COUNT(*) AS n
+        FROM     recipe_tags
+        GROUP BY tag
+        ORDER BY tag
+    """
+    with get_connection() as conn:
+        return {
+            "cuisines": [(row["cuisine"], row["n"]) for row in conn.execute(cuisine_sql)],
+            "tags":     [(row["tag"], row["n"]) for row in conn.execute(tag_sql)],
+        }
+
+
 def get_recipe_by_id(recipe_id: int) -> Optional[dict]:
     """
     Retrieve a single recipe by its id.
@@ -218,6 +1089,50 @@ def get_recipe_by_id(recipe_id: int) -> Optional[dict]:
 # Ingredient functions
 # ---------------------------------------------------------------------------
 
+# Columns returned for every ingredient row. catalog_id / canonical_name
+# identify the normalized ingredient so callers can group on small ints.
+INGREDIENT_COLUMNS = (
+    "i.id, i.recipe_id, i.name, i.quantity, i.unit, "
+    "i.catalog_id, c.name AS canonical_name"
+)
+
+
+def get_or_create_catalog_ids(
+    conn: sqlite3.Connection,
+    names: list[str],
+) -> dict[str, Optional[int]]:
+    """
+    Resolve raw ingredient names to ingredient_catalog ids, adding new ones.
+
+    Each name is normalized once with canonical_ingredient_name() — case,
+    whitespace, simple plurals and INGREDIENT_ALIASES — so 'Tomatoes' and
+    'tomato' share an id. Runs on the caller's connection and transaction.
+
+    Args:
+        conn:  Open connection, usually inside a `with` block.
+        names: Raw ingredient names as entered.
+
+    Returns:
+        dict[str, Optional[int]]: { raw name: catalog id }, None for blanks.
+    """
+    canonical = {name: canonical_ingredient_name(name) for name in names}
+    wanted    = sorted({c for c in canonical.values() if c})
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO ingredient_catalog (name) VALUES (?)",
+        [(c,) for c in wanted],
+    )
+
+    ids: dict[str, int] = {}
+    for start in range(0, len(wanted), MAX_SQL_VARIABLES):
+        chunk        = wanted[start:start + MAX_SQL_VARIABLES]
+        placeholders = ", ".join("?" * len(chunk))
+        sql = f"SELECT id, name FROM ingredient_catalog WHERE name IN ({placeholders})"
+        ids.update((row["name"], row["id"]) for row in conn.execute(sql, chunk))
+
+    return {name: ids.get(c) for name, c in canonical.items()}
+
+
 def add_ingredient(
     recipe_id: int,
     name: str,
@@ -234,11 +1149,12 @@ def add_ingredient(
         unit:      Unit of measurement e.g. 'grams', 'cups', 'tbsp'.
     """
     sql = """
-        INSERT INTO ingredients (recipe_id, name, quantity, unit)
-        VALUES (?, ?, ?, ?)
+        INSERT INTO ingredients (recipe_id, name, quantity, unit, catalog_id)
+        VALUES (?, ?, ?, ?, ?)
     """
     with get_connection() as conn:
-        conn.execute(sql, (recipe_id, name, quantity, unit))
+        catalog_id = get_or_create_catalog_ids(conn, [name])[name]
+        conn.execute(sql, (recipe_id, name, quantity, unit, catalog_id))
 
 
 def get_ingredients_by_recipe_id(recipe_id: int) -> list[dict]:
@@ -252,15 +1168,190 @@ def get_ingredients_by_recipe_id(recipe_id: int) -> list[dict]:
         list[dict]: A list of ingredients as dictionaries.
                     Returns an empty list if the recipe has no ingredients.
     """
-    sql = """
-        SELECT id, recipe_id, name, quantity, unit
+    sql = f"""
+        SELECT {INGREDIENT_COLUMNS}
+        FROM   ingredients i
+        LEFT JOIN ingredient_catalog c ON c.id = i.catalog_id
+        WHERE  i.recipe_id = ?
+        ORDER  BY i.id ASC
+    """
+    with get_connection() as conn:
+        rows = conn.execute(sql, (recipe_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+
+def get_ingredients_for_recipes(recipe_ids: list[int]) -> dict[int, list[dict]]:
+    """
+    Retrieve ingredients for many recipes at once, grouped by recipe id.
+
+    Replaces calling get_ingredients_by_recipe_id() in a loop. Ids are sent
+    in chunks of MAX_SQL_VARIABLES so any number of recipes can be fetched
+    without hitting SQLite's bound-parameter limit.
+
+    Args:
+        recipe_ids: Ids of the recipes whose ingredients to fetch.
+                    Duplicates are ignored.
+
+    Returns:
+        dict[int, list[dict]]: { recipe_id: [ingredient, ...] } with each
+                               list in insertion order. Every requested id
+                               is present, mapped to [] if it has none.
+    """
+    unique_ids = list(dict.fromkeys(recipe_ids))
+    grouped: dict[int, list[dict]] = {rid: [] for rid in unique_ids}
+
+    with get_connection() as conn:
+        for start in range(0, len(unique_ids), MAX_SQL_VARIABLES):
+            chunk        = unique_ids[start:start + MAX_SQL_VARIABLES]
+            placeholders = ", ".join("?" * len(chunk))
+            sql = f"""
+                SELECT {INGREDIENT_COLUMNS}
+                FROM   ingredients i
+                LEFT JOIN ingredient_catalog c ON c.id = i.catalog_id
+                WHERE  i.recipe_id IN ({placeholders})
+                ORDER  BY i.recipe_id ASC, i.id ASC
+            """
+            for row in conn.execute(sql, chunk):
+                grouped[row["recipe_id"]].append(dict(row))
+
+    return grouped
+
+
+def iter_all_ingredients() -> Iterator[tuple[int, list[dict]]]:
+    """
+    Stream every recipe's ingredients from a single query.
+
+    Rows are read from the cursor as they are consumed rather than loaded
+    up front, and yielded one recipe at a time. Recipes without ingredients
+    are not yielded.
+
+    Yields:
+        tuple[int, list[dict]]: (recipe_id, ingredients in insertion order).
+    """
+    sql = f"""
+        SELECT {INGREDIENT_COLUMNS}
+        FROM   ingredients i
+        LEFT JOIN ingredient_catalog c ON c.id = i.catalog_id
+        ORDER  BY i.recipe_id ASC, i.id ASC
+    """
+    current_id: Optional[int] = None
+    batch: list[dict] = []
+
+    for row in get_connection().execute(sql):
+        if row["recipe_id"] != current_id:
+            if batch:
+                yield current_id, batch
+            current_id, batch = row["recipe_id"], []
+        batch.append(dict(row))
+
+    if batch:
+        yield current_id, batch
+
+
+# ---------------------------------------------------------------------------
+# Combined recipe + ingredient writes
+# ---------------------------------------------------------------------------
+
+def save_recipe_with_ingredients(
+    recipe: dict,
+    ingredients: list[dict],
+    recipe_id: Optional[int] = None,
+) -> int:
+    """
+    Insert or update a recipe together with its ingredient list atomically.
+
+    Everything runs in one transaction, so a failure part-way leaves the
+    previous recipe and ingredients untouched. In edit mode the stored
+    ingredient rows are diffed against `ingredients` position by position:
+    unchanged rows are left alone, changed rows are updated in place, and
+    the remainder are inserted or deleted — each group with one executemany.
+
+    Args:
+        recipe:      Dict with title, description, cuisine, cook_time,
+                     servings, tags and (optionally) instructions.
+        ingredients: Ordered list of dicts with name, quantity and unit.
+        recipe_id:   Id of the recipe to update, or None to insert a new one.
+
+    Returns:
+        int: The id of the saved recipe.
+
+    Raises:
+        ValueError: If recipe_id is given but no such recipe exists.
+    """
+    recipe_values = (
+        recipe["title"],
+        recipe.get("description", ""),
+        recipe.get("cuisine", ""),
+        recipe.get("cook_time"),
+        recipe.get("servings"),
+        recipe.get("tags", ""),
+        recipe.get("instructions", ""),
+    )
+    new_rows = [(ing["name"], ing["quantity"], ing["unit"]) for ing in ingredients]
+
+    insert_recipe_sql = """
+        INSERT INTO recipes (title, description, cuisine, cook_time, servings, tags, instructions)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    update_recipe_sql = """
+        UPDATE recipes
+        SET title        = ?,
+            description  = ?,
+            cuisine      = ?,
+            cook_time    = ?,
+            servings     = ?,
+            tags         = ?,
+            instructions = ?
+        WHERE id = ?
+    """
+    select_ings_sql = """
+        SELECT id, name, quantity, unit, catalog_id
         FROM   ingredients
         WHERE  recipe_id = ?
         ORDER  BY id ASC
     """
+    insert_ing_sql = """
+        INSERT INTO ingredients (recipe_id, name, quantity, unit, catalog_id)
+        VALUES (?, ?, ?, ?, ?)
+    """
+    update_ing_sql = """
+        UPDATE ingredients
+        SET    name = ?, quantity = ?, unit = ?, catalog_id = ?
+        WHERE  id = ?
+    """
+    delete_ing_sql = "DELETE FROM ingredients WHERE id = ?"
+
     with get_connection() as conn:
-        rows = conn.execute(sql, (recipe_id,)).fetchall()
-        return [dict(row) for row in rows]
+        if recipe_id is None:
+            recipe_id = conn.execute(insert_recipe_sql, recipe_values).lastrowid
+            existing  = []
+        else:
+            cursor = conn.execute(update_recipe_sql, (*recipe_values, recipe_id))
+            if cursor.rowcount == 0:
+                raise ValueError(f"Recipe {recipe_id} not found")
+            existing = conn.execute(select_ings_sql, (recipe_id,)).fetchall()
+
+        replace_recipe_tags(conn, recipe_id, recipe.get("tags", ""))
+
+        catalog_ids = get_or_create_catalog_ids(conn, [name for name, _, _ in new_rows])
+
+        updates = [
+            (*new, catalog_ids[new[0]], old["id"])
+            for old, new in zip(existing, new_rows)
+            if (old["name"], old["quantity"], old["unit"], old["catalog_id"])
+               != (*new, catalog_ids[new[0]])
+        ]
+        deletes = [(old["id"],) for old in existing[len(new_rows):]]
+        inserts = [(recipe_id, *new, catalog_ids[new[0]]) for new in new_rows[len(existing):]]
+
+        if updates:
+            conn.executemany(update_ing_sql, updates)
+        if deletes:
+            conn.executemany(delete_ing_sql, deletes)
+        if inserts:
+            conn.executemany(insert_ing_sql, inserts)
+
+    return recipe_id
 
 
 # ---------------------------------------------------------------------------
@@ -276,8 +1367,9 @@ def save_meal_plan(
     """
     Save or replace a meal plan slot for a given week, day, and meal type.
 
-    Uses INSERT OR REPLACE to upsert — if a slot already exists for the
-    same week_start, day, and meal_type combination, it is overwritten.
+    A single INSERT ... ON CONFLICT DO UPDATE against the unique
+    (week_start, day, meal_type) index — if the slot already exists its
+    recipe_id is overwritten in place.
 
     Args:
         week_start: ISO date string for the Monday of the week e.g. '2024-03-04'.
@@ -285,16 +1377,76 @@ def save_meal_plan(
         meal_type:  One of 'Breakfast', 'Lunch', or 'Dinner'.
         recipe_id:  The id of the recipe to assign, or None to leave it empty.
     """
-    clear_meal_slot(week_start, day, meal_type)
-
     sql = """
         INSERT INTO meal_plan (week_start, day, meal_type, recipe_id)
         VALUES (?, ?, ?, ?)
+        ON CONFLICT (week_start, day, meal_type)
+        DO UPDATE SET recipe_id = excluded.recipe_id
     """
     with get_connection() as conn:
         conn.execute(sql, (week_start, day, meal_type, recipe_id))
 
 
+def save_week_plan(
+    week_start: str,
+    slots: dict[tuple[str, str], Optional[int]],
+) -> int:
+    """
+    Save a whole week of meal slots in a single transaction.
+
+    The stored week is read once and diffed against `slots`; only slots
+    whose recipe actually changed are written, with one executemany for
+    upserts and one for deletions.
+
+    Args:
+        week_start: ISO date string for the Monday of the week e.g. '2024-03-04'.
+        slots:      { (day, meal_type): recipe_id } — a recipe_id of None
+                    clears that slot. Slots not present are left untouched.
+
+    Returns:
+        int: The number of slots that were written or cleared.
+    """
+    select_sql = """
+        SELECT day, meal_type, recipe_id
+        FROM   meal_plan
+        WHERE  week_start = ?
+    """
+    upsert_sql = """
+        INSERT INTO meal_plan (week_start, day, meal_type, recipe_id)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (week_start, day, meal_type)
+        DO UPDATE SET recipe_id = excluded.recipe_id
+    """
+    delete_sql = """
+        DELETE FROM meal_plan
+        WHERE  week_start = ?
+          AND  day        = ?
+          AND  meal_type  = ?
+    """
+    with get_connection() as conn:
+        stored = {
+            (row["day"], row["meal_type"]): row["recipe_id"]
+            for row in conn.execute(select_sql, (week_start,))
+        }
+
+        upserts: list[tuple] = []
+        deletes: list[tuple] = []
+        for (day, meal_type), recipe_id in slots.items():
+            key = (day, meal_type)
+            if recipe_id is None:
+                if key in stored:
+                    deletes.append((week_start, day, meal_type))
+            elif key not in stored or stored[key] != recipe_id:
+                upserts.append((week_start, day, meal_type, recipe_id))
+
+        if upserts:
+            conn.executemany(upsert_sql, upserts)
+        if deletes:
+            conn.executemany(delete_sql, deletes)
+
+    return len(upserts) + len(deletes)
+
+
 def get_meal_plan(week_start: str) -> list[dict]:
     """
     Retrieve the full meal plan for a given week.
@@ -344,4 +1496,163 @@ def clear_meal_slot(week_start: str, day: str, meal_type: str) -> None:
           AND  meal_type  = ?
     """
     with get_connection() as conn:
-        conn.execute(sql, (week_start, day, meal_type))
\ No newline at end of file
+        conn.execute(sql, (week_start, day, meal_type))
+
+# ---------------------------------------------------------------------------
+# Grocery list
+# ---------------------------------------------------------------------------
+
+# Day names as stored in meal_plan.day, in week order from Monday.
+PLAN_DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# SQL expression for the calendar date of a meal_plan row (alias mp).
+_SLOT_DATE_SQL = (
+    "date(mp.week_start, '+' || CASE mp.day "
+    + " ".join(f"WHEN '{day}' THEN {offset}" for offset, day in enumerate(PLAN_DAYS))
+    + " END || ' days')"
+)
+
+
+def get_grocery_totals_for_range(start_date: str, end_date: str) -> list[dict]:
+    """
+    Return the merged shopping list for every planned slot between two dates.
+
+    The range may start and end on any day and span several weeks. Slots
+    are found with one range scan on meal_plan.week_start (the leading
+    column of idx_meal_plan_slot), then narrowed to the exact dates.
+    Quantities are summed per canonical ingredient name and unit; a recipe
+    planned in several slots counts once per slot. Blank units are
+    reported as 'unit'; blank names are skipped.
+
+    Args:
+        start_date: ISO date of the first day to include e.g. '2024-03-07'.
+        end_date:   ISO date of the last day to include (inclusive).
+
+    Returns:
+        list[dict]: Rows of { name, unit, quantity } ordered by name, unit.
+                    Returns an empty list if nothing is planned.
+    """
+    sql = f"""
+        WITH slots AS (
+            SELECT mp.recipe_id,
+                   {_SLOT_DATE_SQL} AS slot_date
+            FROM   meal_plan mp
+            WHERE  mp.week_start BETWEEN date(:start, '-6 days') AND :end
+              AND  mp.recipe_id IS NOT NULL
+        )
+        SELECT
+            COALESCE(c.name, lower(trim(i.name)))            AS name,
+            COALESCE(NULLIF(lower(trim(i.unit)), ''), 'unit') AS unit,
+            TOTAL(i.quantity)                                AS quantity
+        FROM      slots              s
+        JOIN      ingredients        i  ON i.recipe_id = s.recipe_id
+        LEFT JOIN ingredient_catalog c  ON c.id        = i.catalog_id
+        WHERE     s.slot_date BETWEEN :start AND :end
+          AND     trim(i.name) <> ''
+        GROUP BY  1, 2
+        ORDER BY  1, 2
+    """
+    with get_connection() as conn:
+        rows = conn.execute(sql, {"start": start_date, "end": end_date}).fetchall()
+        return [dict(row) for row in rows]
+
+
+def get_grocery_totals(week_start: str) -> list[dict]:
+    """
+    Return the merged shopping list for one Monday-to-Sunday week.
+
+    Args:
+        week_start: ISO date string for the Monday of the week e.g. '2024-03-04'.
+
+    Returns:
+        list[dict]: Rows of { name, unit, quantity }; see
+                    get_grocery_totals_for_range().
+    """
+    week_end = (date.fromisoformat(week_start) + timedelta(days=6)).isoformat()
+    return get_grocery_totals_for_range(week_start, week_end)
+
+
+def get_grocery_checks(period: str) -> list[dict]:
+    """
+    Load every checklist row for a shopping period in one query.
+
+    Args:
+        period: ISO interval the list was built for e.g. '2024-03-04/2024-03-10'.
+
+    Returns:
+        list[dict]: Rows of { item, unit, checked, is_manual } in the order
+                    they were first saved, so manual items keep their order.
+    """
+    sql = """
+        SELECT item, unit, checked, is_manual
+        FROM   grocery_checks
+        WHERE  period = ?
+        ORDER  BY id ASC
+    """
+    with get_connection() as conn:
+        rows = conn.execute(sql, (period,)).fetchall()
+        return [
+            {**dict(row), "checked": bool(row["checked"]), "is_manual": bool(row["is_manual"])}
+            for row in rows
+        ]
+
+
+def save_grocery_checks(period: str, checks: dict[tuple[str, str], bool]) -> int:
+    """
+    Upsert a batch of checkbox states in one transaction.
+
+    Args:
+        period: ISO interval the list was built for.
+        checks: { (item, unit): checked } for every item toggled since the
+                last save. Manual items use unit ''.
+
+    Returns:
+        int: The number of rows written.
+    """
+    sql = """
+        INSERT INTO grocery_checks (period, item, unit, checked)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (period, item, unit)
+        DO UPDATE SET checked = excluded.checked
+    """
+    rows = [(period, item, unit, int(checked)) for (item, unit), checked in checks.items()]
+    if rows:
+        with get_connection() as conn:
+            conn.executemany(sql, rows)
+    return len(rows)
+
+
+def clear_grocery_checks(period: str) -> None:
+    """Untick every item, recipe and manual, for a shopping period."""
+    with get_connection() as conn:
+        conn.execute("UPDATE grocery_checks SET checked = 0 WHERE period = ?", (period,))
+
+
+def add_manual_grocery_item(period: str, item: str) -> None:
+    """
+    Add an extra item that isn't from a recipe. Adding it twice is a no-op.
+
+    Args:
+        period: ISO interval the list was built for.
+        item:   Free text e.g. 'Kitchen roll'.
+    """
+    sql = """
+        INSERT INTO grocery_checks (period, item, unit, is_manual)
+        VALUES (?, ?, '', 1)
+        ON CONFLICT (period, item, unit) DO NOTHING
+    """
+    with get_connection() as conn:
+        conn.execute(sql, (period, item))
+
+
+def remove_manual_grocery_item(period: str, item: str) -> None:
+    """Remove an extra item and its checkbox state."""
+    sql = """
+        DELETE FROM grocery_checks
+        WHERE  period    = ?
+          AND  item      = ?
+          AND  unit      = ''
+          AND  is_manual = 1
+    """
+    with get_connection() as conn:
+        conn.execute(sql, (period, item))
@@ -0,0 +1,119 @@
+import re
+from functools import lru_cache
+
+
+# ---------------------------------------------------------------------------
+# Grocery categories
+# ---------------------------------------------------------------------------
+#
+# Keywords are written in canonical (singular) form, since grocery rows
+# carry canonical names; the regex also accepts a plural suffix.
+# Each keyword belongs to exactly one category. All keywords are compiled
+# into a single regex, and the longest keyword found in a name decides its
+# category: "coriander powder" beats "coriander", "bell pepper" beats
+# "pepper". Results are memoized per canonical name.
+
+
+CATEGORY_KEYWORDS: dict[str, list[str]] = {
+    "🥦 Produce": [
+        "onion", "tomato", "garlic", "ginger", "potato", "carrot", "spinach",
+        "lettuce", "cucumber", "bell pepper", "chilli", "lemon", "lime", "apple",
+        "banana", "mango", "coriander", "parsley", "basil", "mint", "celery",
+        "broccoli", "cauliflower", "mushroom", "zucchini", "eggplant", "avocado",
+        "spring onion", "scallion", "cabbage", "beetroot", "radish", "pea",
+        "capsicum", "leek", "fennel", "artichoke", "asparagus", "lemongrass",
+        "pineapple", "green pepper", "red pepper",
+    ],
+    "🍗 Meat & Protein": [
+        "chicken", "beef", "lamb", "pork", "fish", "prawn", "shrimp", "salmon",
+        "tuna", "egg", "tofu", "paneer", "mutton", "turkey", "bacon", "sausage",
+        "mince", "steak", "breast", "thigh", "fillet", "chorizo", "anchovy",
+    ],
+    "🥛 Dairy": [
+        "milk", "cream", "butter", "cheese", "yogurt", "curd", "ghee",
+        "mozzarella", "parmesan", "ricotta", "condensed milk", "evaporated milk",
+        "sour cream", "crème fraîche",
+    ],
+    "🌾 Grains & Pantry": [
+        "rice", "flour", "pasta", "bread", "breadcrumb", "noodle", "oat", "lentil", "dal",
+        "chickpea", "kidney bean", "black bean", "sugar", "salt", "oil",
+        "vinegar", "soy sauce", "tomato puree", "tomato paste", "stock",
+        "broth", "cornstarch", "baking", "yeast", "honey", "jam", "spice",
+        "masala", "cumin", "turmeric", "paprika", "chilli powder",
+        "garam masala", "oregano", "thyme", "bay leaf", "cardamom",
+        "cinnamon", "clove", "mustard", "ketchup", "mayo", "sauce",
+        "coriander powder", "pepper",
+        # Processed forms of produce; longer than the produce keyword so they win.
+        "garlic powder", "garlic salt", "onion powder", "ginger powder",
+        "tomato sauce", "chilli flake", "chicken stock", "chicken broth",
+    ],
+}
+
+CATEGORY_ORDER = [
+    "🥦 Produce",
+    "🍗 Meat & Protein",
+    "🥛 Dairy",
+    "🌾 Grains & Pantry",
+    "🧂 Other",
+]
+
+DEFAULT_CATEGORY = "🧂 Other"
+
+# Distinct names memoized by categorize_ingredient().
+CATEGORY_CACHE_SIZE = 4096
+
+
+def _build_keyword_index(
+    keywords: dict[str, list[str]],
+) -> tuple[re.Pattern, dict[str, str]]:
+    """
+    Compile every keyword into one whole-word regex plus a keyword → category map.
+
+    Keywords are tried longest first, so at any position the longest keyword
+    matches. An optional plural suffix lets "noodle" match "noodles".
+
+    Raises:
+        ValueError: If a keyword is listed under two categories.
+    """
+    owner: dict[str, str] = {}
+    for category, words in keywords.items():
+        for word in words:
+            if word in owner and owner[word] != category:
+                raise ValueError(
+                    f"Keyword '{word}' is listed under both "
+                    f"'{owner[word]}' and '{category}'."
+                )
+            owner[word] = category
+
+    alternation = "|".join(
+        re.escape(word) for word in sorted(owner, key=len, reverse=True)
+    )
+    pattern = re.compile(rf"\b({alternation})(?:e?s)?\b")
+    return pattern, owner
+
+
+_KEYWORD_PATTERN, _KEYWORD_CATEGORY = _build_keyword_index(CATEGORY_KEYWORDS)
+
+
+@lru_cache(maxsize=CATEGORY_CACHE_SIZE)
+def categorize_ingredient(name: str) -> str:
+    """
+    Return the grocery category for an ingredient name.
+
+    One regex scan finds every keyword in the name and the longest wins:
+    "garlic clove" is Produce by "garlic", "garlic powder" is Pantry by
+    its own keyword. Keywords of equal length go to the rightmost, which
+    is usually the head noun ("lemon thyme" → "thyme").
+
+    Args:
+        name: Lowercase canonical ingredient name e.g. 'coriander powder'.
+
+    Returns:
+        str: A key of CATEGORY_KEYWORDS, or DEFAULT_CATEGORY.
+    """
+    best = max(
+        _KEYWORD_PATTERN.finditer(name),
+        key     = lambda m: (len(m.group(1)), m.start()),
+        default = None,
+    )
+    return _KEYWORD_CATEGORY[best.group(1)] if best else DEFAULT_CATEGORY
@@ -0,0 +1,573 @@
+import heapq
+import os
+from typing import Iterable, Iterator, Optional
+
+from database import iter_all_ingredients, list_recipes
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the pure-Python backend always works
+    np = None
+
+
+# ---------------------------------------------------------------------------
+# Ingredient index
+# ---------------------------------------------------------------------------
+#
+# An inverted index from canonical ingredient name to the ids of the
+# recipes that use it. Matching a pantry walks only the postings of the
+# pantry's ingredients, so the work grows with the number of hits rather
+# than the size of the library.
+#
+# Two interchangeable backends count matches and give identical results:
+#   "python" — walks the postings dicts.
+#   "numpy"  — keeps the postings as one CSR-style incidence matrix
+#              (ingredient → recipe rows) and scores a pantry with a single
+#              bincount, i.e. a sparse mat-vec, over every recipe at once.
+# Set RECIPES_MATCH_BACKEND=numpy to use it when numpy is installed.
+
+MATCH_BACKENDS = ("python", "numpy")
+
+DEFAULT_MATCH_BACKEND = os.environ.get("RECIPES_MATCH_BACKEND", "python")
+
+# Pantries scored together per numpy pass in IngredientIndex.match_many().
+MATCH_BATCH_SIZE = 64
+
+# Fuzzy lookups: minimum trigram similarity for a recipe ingredient to
+# count as a typo match for a pantry term, and how many candidates one
+# term may expand to.
+FUZZY_THRESHOLD      = 0.5
+FUZZY_MAX_CANDIDATES = 8
+
+# Names that contain a pantry word but are a different product, so the
+# word alone never reaches them ('milk' does not stand in for 'coconut
+# milk'). Typo matches against the full name still apply.
+FUZZY_EXCLUDED_NAMES: frozenset[str] = frozenset({
+    "coconut milk", "condensed milk", "evaporated milk", "almond milk",
+    "oat milk", "soy milk", "coconut cream", "sour cream", "ice cream",
+    "cream cheese", "peanut butter",
+    "rice vinegar", "rice flour", "rice noodle", "rice paper",
+    "garlic powder", "garlic salt", "onion powder", "ginger powder",
+    "chilli powder", "chilli flake", "chilli sauce",
+    "bell pepper", "green pepper", "red pepper",
+    "tomato ketchup", "tomato puree", "tomato paste", "tomato sauce",
+    "soy sauce", "fish sauce",
+    "chicken stock", "chicken broth", "beef stock", "vegetable stock",
+    "coconut oil", "sesame oil",
+})
+
+
+def word_trigrams(word: str) -> frozenset[str]:
+    """
+    Return the 3-character grams of one word.
+
+    The word is padded with two leading spaces and one trailing space, so
+    short words and word starts still produce grams:
+    'egg' → {'  e', ' eg', 'egg', 'gg '}.
+    """
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """Return the union of word_trigrams() over every word of a name."""
+    return frozenset().union(*(word_trigrams(w) for w in text.lower().split()))
+
+
+class IngredientIndex:
+    """
+    Inverted ingredient → recipe index for pantry matching.
+
+    Attributes:
+        postings:           { canonical ingredient: [recipe ids] }
+        ingredient_counts:  { recipe id: distinct ingredient count }
+        recipe_ingredients: { recipe id: frozenset of canonical ingredients }
+        recipes:            { recipe id: summary row from list_recipes() }
+        position:           { recipe id: rank in library order }, for
+                            deterministic result ordering
+    """
+
+    def __init__(
+        self,
+        recipes: Iterable[dict],
+        ingredients: Iterable[tuple[int, list[dict]]],
+    ) -> None:
+        """
+        Build the index.
+
+        Args:
+            recipes:     Recipe summary rows (id, title, cuisine, ...).
+            ingredients: (recipe_id, ingredient rows) pairs as yielded by
+                         iter_all_ingredients(). Recipes with no
+                         ingredients are left out of the index.
+        """
+        self.recipes: dict[int, dict] = {r["id"]: r for r in recipes}
+        self.position: dict[int, int] = {rid: i for i, rid in enumerate(self.recipes)}
+        self.postings: dict[str, list[int]] = {}
+        self.ingredient_counts: dict[int, int] = {}
+        self.recipe_ingredients: dict[int, frozenset[str]] = {}
+        self._matrix: Optional[dict] = None
+
+        for recipe_id, rows in ingredients:
+            if recipe_id not in self.recipes:
+                continue
+            names = frozenset(row["canonical_name"] for row in rows if row["canonical_name"])
+            if not names:
+                continue
+            self.recipe_ingredients[recipe_id] = names
+            self.ingredient_counts[recipe_id] = len(names)
+            for name in names:
+                self.postings.setdefault(name, []).append(recipe_id)
+
+        # Trigram and word → vocabulary ids, for fuzzy lookups over names
+        self.vocabulary: list[str] = sorted(self.postings)
+        self._name_grams: list[frozenset[str]] = []
+        self._word_counts: list[int] = []
+        self._gram_postings: dict[str, list[int]] = {}
+        self._word_postings: dict[str, set[int]] = {}
+        for vocab_id, name in enumerate(self.vocabulary):
+            grams = trigrams(name)
+            words = name.split()
+            self._name_grams.append(grams)
+            self._word_counts.append(len(words))
+            for gram in grams:
+                self._gram_postings.setdefault(gram, []).append(vocab_id)
+            if name not in FUZZY_EXCLUDED_NAMES:
+                for word in words:
+                    self._word_postings.setdefault(word, set()).add(vocab_id)
+
+    def __len__(self) -> int:
+        """Number of recipes in the index."""
+        return len(self.ingredient_counts)
+
+    def fuzzy_lookup(
+        self,
+        term: str,
+        threshold: float = FUZZY_THRESHOLD,
+        max_candidates: int = FUZZY_MAX_CANDIDATES,
+    ) -> list[tuple[str, float]]:
+        """
+        Find ingredient names similar to a term.
+
+        Two kinds of match, typo matches first:
+          - typo:   a name with as many words as the term whose trigram
+                    Jaccard reaches `threshold` ('tomatoe' → 'tomato').
+          - words:  a longer name containing every word of the term
+                    ('chicken' → 'chicken breast'), unless the name is in
+                    FUZZY_EXCLUDED_NAMES ('milk' ↛ 'coconut milk').
+
+        Only names sharing trigrams or words with the term are looked at,
+        so the cost follows those postings, not the vocabulary size. The
+        share of the term's grams found in a name bounds its Jaccard from
+        above, which prunes most typo candidates before any arithmetic.
+
+        Args:
+            term:           Canonical pantry term e.g. 'chicken'.
+            threshold:      Minimum similarity, 0–1.
+            max_candidates: Most names returned for the term.
+
+        Returns:
+            list[tuple[str, float]]: (name, trigram similarity), typo
+                                     matches first, then most similar.
+        """
+        words = term.lower().split()
+        if not words:
+            return []
+        grams = trigrams(term)
+
+        shared: dict[int, int] = {}
+        for gram in grams:
+            for vocab_id in self._gram_postings.get(gram, ()):
+                shared[vocab_id] = shared.get(vocab_id, 0) + 1
+
+        def similarity(vocab_id: int) -> float:
+            # shared[] is exactly |term ∩ name|, so the Jaccard needs no set ops
+            common = shared[vocab_id]
+            return common / (len(grams) + len(self._name_grams[vocab_id]) - common)
+
+        # (kind, similarity, name) with kind 0 for typo and 1 for word matches
+        scored: dict[int, tuple[int, float, str]] = {}
+        for vocab_id, common in shared.items():
+            if self._word_counts[vocab_id] != len(words) or common / len(grams) < threshold:
+                continue
+            score = similarity(vocab_id)
+            if score >= threshold:
+                scored[vocab_id] = (0, score, self.vocabulary[vocab_id])
+
+        containing = set.intersection(*(self._word_postings.get(w, set()) for w in words))
+        for vocab_id in containing:
+            if vocab_id not in scored and self._word_counts[vocab_id] > len(words):
+                scored[vocab_id] = (1, similarity(vocab_id), self.vocabulary[vocab_id])
+
+        # Typo matches first, then most similar; shorter names win ties
+        best = heapq.nsmallest(
+            max_candidates,
+            scored.values(),
+            key = lambda entry: (entry[0], -entry[1], len(entry[2]), entry[2]),
+        )
+        return [(name, score) for _, score, name in best]
+
+    def expand_pantry(
+        self,
+        pantry: set[str],
+        threshold: float = FUZZY_THRESHOLD,
+        max_candidates: int = FUZZY_MAX_CANDIDATES,
+    ) -> set[str]:
+        """
+        Add fuzzy matches from the recipe vocabulary to a pantry.
+
+        'chicken' picks up 'chicken breast' and 'chicken thigh'; a typo
+        like 'tomatoe' picks up 'tomato'. Products listed in
+        FUZZY_EXCLUDED_NAMES, like 'coconut milk' for 'milk', are not
+        added. The original terms are kept.
+
+        Returns:
+            set[str]: The pantry plus every fuzzy candidate of each term.
+        """
+        expanded = set(pantry)
+        for term in pantry:
+            expanded.update(name for name, _ in self.fuzzy_lookup(term, threshold, max_candidates))
+        return expanded
+
+    def _build_matrix(self) -> dict:
+        """
+        Pack the postings into numpy arrays, once per index.
+
+        Rows are recipes in library order; column j's recipe rows are
+        indices[indptr[j]:indptr[j + 1]].
+        """
+        recipe_ids = sorted(self.ingredient_counts, key=self.position.__getitem__)
+        row_of     = {rid: row for row, rid in enumerate(recipe_ids)}
+        names      = list(self.postings)
+
+        indptr  = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum([len(self.postings[n]) for n in names], out=indptr[1:])
+        indices = np.fromiter(
+            (row_of[rid] for n in names for rid in self.postings[n]),
+            dtype = np.int32,
+            count = int(indptr[-1]),
+        )
+        return {
+            "recipe_ids": np.array(recipe_ids, dtype=np.int64),
+            "totals":     np.array([self.ingredient_counts[r] for r in recipe_ids], dtype=np.int32),
+            "cook_times": np.array(
+                [
+                    ct if (ct := self.recipes[r].get("cook_time")) is not None else np.inf
+                    for r in recipe_ids
+                ],
+                dtype = np.float64,
+            ),
+            "column_of":  {name: col for col, name in enumerate(names)},
+            "indptr":     indptr,
+            "indices":    indices,
+        }
+
+    def score_arrays(self, pantry: set[str]) -> dict:
+        """
+        Score every recipe against a pantry in one vectorized pass.
+
+        Requires numpy.
+
+        Args:
+            pantry: Canonical ingredient names the user has.
+
+        Returns:
+            dict: numpy arrays aligned by row — recipe_ids, matched,
+                  totals, missing and match_pct.
+
+        Raises:
+            RuntimeError: If numpy is not installed.
+        """
+        if np is None:
+            raise RuntimeError("The numpy match backend requires numpy to be installed.")
+        if self._matrix is None:
+            self._matrix = self._build_matrix()
+        m = self._matrix
+
+        columns = [m["column_of"][name] for name in pantry if name in m["column_of"]]
+        rows    = (
+            np.concatenate([m["indices"][m["indptr"][c]:m["indptr"][c + 1]] for c in columns])
+            if columns else np.empty(0, dtype=np.int32)
+        )
+        matched = np.bincount(rows, minlength=len(m["recipe_ids"]))
+        return {
+            "recipe_ids": m["recipe_ids"],
+            "matched":    matched,
+            "totals":     m["totals"],
+            "missing":    m["totals"] - matched,
+            "match_pct":  np.round(matched / np.maximum(m["totals"], 1) * 100, 1),
+        }
+
+    def match_counts(self, pantry: set[str], backend: Optional[str] = None) -> dict[int, int]:
+        """
+        Count matched ingredients per recipe.
+
+        Args:
+            pantry:  Canonical ingredient names the user has.
+            backend: 'python' or 'numpy'; defaults to DEFAULT_MATCH_BACKEND.
+                     'numpy' falls back to 'python' if numpy is missing.
+
+        Returns:
+            dict[int, int]: { recipe id: matched count } for every recipe
+                            sharing at least one ingredient with the pantry.
+
+        Raises:
+            ValueError: If backend is not one of MATCH_BACKENDS.
+        """
+        backend = backend or DEFAULT_MATCH_BACKEND
+        if backend not in MATCH_BACKENDS:
+            raise ValueError(f"backend must be one of {MATCH_BACKENDS}, got '{backend}'.")
+
+        if backend == "numpy" and np is not None:
+            scores = self.score_arrays(pantry)
+            hits   = np.flatnonzero(scores["matched"])
+            return dict(zip(
+                scores["recipe_ids"][hits].tolist(),
+                scores["matched"][hits].tolist(),
+            ))
+
+        counts: dict[int, int] = {}
+        for name in pantry:
+            for recipe_id in self.postings.get(name, ()):
+                counts[recipe_id] = counts.get(recipe_id, 0) + 1
+        return counts
+
+    def build_result(self, recipe_id: int, matched: int, pantry: set[str]) -> dict:
+        """Shape one match result the way the What Can I Cook page renders it."""
+        recipe = self.recipes[recipe_id]
+        total  = self.ingredient_counts[recipe_id]
+        return {
+            "id":        recipe_id,
+            "title":     recipe["title"],
+            "cuisine":   recipe.get("cuisine", ""),
+            "cook_time": recipe.get("cook_time"),
+            "servings":  recipe.get("servings"),
+            "total":     total,
+            "matched":   matched,
+            "missing":   sorted(self.recipe_ingredients[recipe_id] - pantry),
+            "match_pct": round(matched / total * 100, 1),
+        }
+
+    def partial_sort_key(self, recipe_id: int, matched: int) -> tuple:
+        """
+        Rank key for a partial match, smallest first.
+
+        Highest match ratio, then fewest missing ingredients, then
+        shortest cook time (unknown last), then library order.
+        """
+        total     = self.ingredient_counts[recipe_id]
+        cook_time = self.recipes[recipe_id].get("cook_time")
+        return (
+            -(matched / total),
+            total - matched,
+            cook_time if cook_time is not None else float("inf"),
+            self.position[recipe_id],
+        )
+
+    def match(
+        self,
+        pantry: set[str],
+        backend: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[list[dict], list[dict], int]:
+        """
+        Split recipes sharing an ingredient with the pantry into full and partial matches.
+
+        Partials are ranked on plain (recipe id, count) pairs; with a
+        limit only the best `limit` are picked (heap selection), and
+        result dicts — including the sorted missing list — are built only
+        for the rows returned.
+
+        Args:
+            pantry:  Canonical ingredient names the user has.
+            backend: Counting backend, see match_counts().
+            limit:   Maximum partial matches to return. None returns all.
+
+        Returns:
+            (full_matches, partial_matches, partial_total) — full matches
+            in library order, partials best first (see partial_sort_key),
+            and how many partial matches there were before the limit.
+        """
+        if (backend or DEFAULT_MATCH_BACKEND) == "numpy" and np is not None:
+            return next(self._match_batch([pantry], limit))
+        return self._results_from_counts(self.match_counts(pantry, backend), pantry, limit)
+
+    def match_many(
+        self,
+        pantries: Iterable[set[str]],
+        backend: Optional[str] = None,
+        limit: Optional[int] = None,
+        batch_size: int = MATCH_BATCH_SIZE,
+    ) -> Iterator[tuple[list[dict], list[dict], int]]:
+        """
+        Match many pantries against this one index, streaming results.
+
+        The index is built once and shared. With the numpy backend each
+        chunk of `batch_size` pantries is scored in a single bincount — a
+        (pantries × ingredients) @ (ingredients × recipes) product — so
+        per-pantry overhead is amortised across the chunk.
+
+        Args:
+            pantries:   Iterable of canonical ingredient-name sets. It is
+                        consumed lazily, one chunk at a time.
+            backend:    Counting backend, see match_counts().
+            limit:      Maximum partial matches per pantry.
+            batch_size: Pantries scored together on the numpy backend.
+
+        Yields:
+            tuple: match() output for each pantry, in input order.
+        """
+        backend = backend or DEFAULT_MATCH_BACKEND
+        if backend != "numpy" or np is None:
+            for pantry in pantries:
+                yield self.match(pantry, backend, limit)
+            return
+
+        batch: list[set[str]] = []
+        for pantry in pantries:
+            batch.append(pantry)
+            if len(batch) == batch_size:
+                yield from self._match_batch(batch, limit)
+                batch = []
+        if batch:
+            yield from self._match_batch(batch, limit)
+
+    def _match_batch(
+        self,
+        pantries: list[set[str]],
+        limit: Optional[int],
+    ) -> Iterator[tuple[list[dict], list[dict], int]]:
+        """Score a chunk of pantries with one numpy bincount and yield each result."""
+        if self._matrix is None:
+            self._matrix = self._build_matrix()
+        m = self._matrix
+        n_recipes = len(m["recipe_ids"])
+
+        # Flatten every (pantry, recipe row) hit into one array of cell ids
+        cells = []
+        for p, pantry in enumerate(pantries):
+            for name in pantry:
+                col = m["column_of"].get(name)
+                if col is not None:
+                    cells.append(
+                        m["indices"][m["indptr"][col]:m["indptr"][col + 1]].astype(np.int64)
+                        + p * n_recipes
+                    )
+        flat    = np.concatenate(cells) if cells else np.empty(0, dtype=np.int64)
+        matched = np.bincount(flat, minlength=len(pantries) * n_recipes).reshape(len(pantries), n_recipes)
+
+        for p, pantry in enumerate(pantries):
+            row   = matched[p]
+            hits  = np.flatnonzero(row)
+            full  = hits[row[hits] == m["totals"][hits]]
+            part  = hits[row[hits] <  m["totals"][hits]]
+            got   = row[part]
+            total = m["totals"][part]
+
+            # Same order as partial_sort_key(); rows are already in library
+            # order, and lexsort treats its last key as the primary one.
+            order = np.lexsort((part, m["cook_times"][part], total - got, -(got / total)))
+            if limit is not None:
+                order = order[:limit]
+
+            yield self._build_results(
+                full_ids      = m["recipe_ids"][full].tolist(),
+                top           = list(zip(m["recipe_ids"][part[order]].tolist(), got[order].tolist())),
+                partial_total = len(part),
+                pantry        = pantry,
+            )
+
+    def _results_from_counts(
+        self,
+        counts: dict[int, int],
+        pantry: set[str],
+        limit: Optional[int],
+    ) -> tuple[list[dict], list[dict], int]:
+        """Turn { recipe id: matched count } into match() output."""
+        full_ids: list[int] = []
+        partials: list[tuple[int, int]] = []
+
+        for recipe_id, matched in counts.items():
+            if matched == self.ingredient_counts[recipe_id]:
+                full_ids.append(recipe_id)
+            else:
+                partials.append((recipe_id, matched))
+
+        rank = lambda pair: self.partial_sort_key(*pair)
+        if limit is None:
+            top = sorted(partials, key=rank)
+        else:
+            top = heapq.nsmallest(limit, partials, key=rank)
+
+        full_ids.sort(key=self.position.__getitem__)
+        return self._build_results(full_ids, top, len(partials), pantry)
+
+    def _build_results(
+        self,
+        full_ids: list[int],
+        top: list[tuple[int, int]],
+        partial_total: int,
+        pantry: set[str],
+    ) -> tuple[list[dict], list[dict], int]:
+        """Build result dicts for the already-ranked rows only."""
+        full_matches = [
+            self.build_result(rid, self.ingredient_counts[rid], pantry) for rid in full_ids
+        ]
+        partial_matches = [self.build_result(rid, matched, pantry) for rid, matched in top]
+        return full_matches, partial_matches, partial_total
+
+
+class IncrementalMatcher:
+    """
+    Per-session matcher that keeps matched counts between pantry edits.
+
+    Each update() diffs the new pantry against the previous one and
+    applies +1 / -1 to the counts of recipes in the postings of only the
+    added or removed ingredients, so typing one more ingredient costs
+    time proportional to that ingredient's recipe count.
+
+    Attributes:
+        index:  The IngredientIndex the counts refer to.
+        pantry: The pantry the counts currently reflect.
+        counts: { recipe id: matched count }, recipes with 0 removed.
+    """
+
+    def __init__(self, index: IngredientIndex) -> None:
+        self.index:  IngredientIndex = index
+        self.pantry: set[str] = set()
+        self.counts: dict[int, int] = {}
+
+    def update(self, pantry: set[str]) -> None:
+        """
+        Move the counts to a new pantry by applying only the differences.
+
+        Args:
+            pantry: Canonical ingredient names the user now has.
+        """
+        postings = self.index.postings
+        counts   = self.counts
+
+        for name in pantry - self.pantry:
+            for recipe_id in postings.get(name, ()):
+                counts[recipe_id] = counts.get(recipe_id, 0) + 1
+
+        for name in self.pantry - pantry:
+            for recipe_id in postings.get(name, ()):
+                if counts[recipe_id] == 1:
+                    del counts[recipe_id]
+                else:
+                    counts[recipe_id] -= 1
+
+        self.pantry = set(pantry)
+
+    def results(self, limit: Optional[int] = None) -> tuple[list[dict], list[dict], int]:
+        """Return match() output for the current pantry from the held counts."""
+        return self.index._results_from_counts(self.counts, self.pantry, limit)
+
+
+def build_ingredient_index() -> IngredientIndex:
+    """Build an IngredientIndex over the whole recipe library in two queries."""
+    return IngredientIndex(
+        recipes     = list_recipes(projection="summary"),
+        ingredients = iter_all_ingredients(),
+    )
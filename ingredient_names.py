@@ -0,0 +1,109 @@
+# ---------------------------------------------------------------------------
+# Ingredient name normalization
+# ---------------------------------------------------------------------------
+#
+# Every ingredient is stored against one canonical catalog name so that
+# "Tomatoes", " tomato " and "tomato" all count as the same thing. The
+# rules run once when an ingredient is written, never on read.
+
+
+# Maps a (lowercased, singular) name to the canonical name it should be
+# stored under. Extend this to merge regional or brand variants.
+INGREDIENT_ALIASES: dict[str, str] = {
+    "scallion":          "spring onion",
+    "green onion":       "spring onion",
+    "capsicum":          "bell pepper",
+    "aubergine":         "eggplant",
+    "courgette":         "zucchini",
+    "garbanzo bean":     "chickpea",
+    "cilantro":          "coriander",
+    "coriander leaf":    "coriander",
+    "curd":              "yogurt",
+    "yoghurt":           "yogurt",
+    "prawn":             "shrimp",
+    "chili":             "chilli",
+    "chile":             "chilli",
+    "corn starch":       "cornstarch",
+    "cornflour":         "cornstarch",
+    "plain flour":       "flour",
+    "all-purpose flour": "flour",
+}
+
+# Plurals the suffix rules below would get wrong.
+IRREGULAR_PLURALS: dict[str, str] = {
+    "leaves":   "leaf",
+    "halves":   "half",
+    "loaves":   "loaf",
+    "chilies":  "chilli",
+    "chillies": "chilli",
+    # Singular already ends in -che, so the "-ches" rule would cut too much.
+    "quiches":  "quiche",
+    "brioches": "brioche",
+    "ganaches": "ganache",
+    # Singular already ends in -ie, so the "-ies" rule would give "-y".
+    "cookies":  "cookie",
+    "brownies": "brownie",
+    "pies":     "pie",
+}
+
+# Endings whose plural adds "-es" rather than "-s" (peach → peaches).
+# Single "z" is left out: glaze → glazes is far more common than topaz.
+ES_PLURAL_ENDINGS: tuple[str, ...] = ("ches", "shes", "xes", "sses", "zzes", "tzes")
+
+# Words that end in "s" but are not plural.
+SINGULAR_S_WORDS: set[str] = {
+    "asparagus", "couscous", "hummus", "molasses", "swiss", "citrus",
+    "hibiscus", "octopus", "brussels",
+}
+
+
+def singularize(word: str) -> str:
+    """
+    Reduce a single lowercase English word to its singular form.
+
+    Handles the common cooking cases: irregulars ("leaves" → "leaf"),
+    "-ies" → "-y", "-oes" → "-o", "-es" after ch/sh/x/ss ("peaches" →
+    "peach"), and a trailing "s". Words that merely end in "s" (e.g.
+    "hummus") are left alone.
+    """
+    if word in IRREGULAR_PLURALS:
+        return IRREGULAR_PLURALS[word]
+    if word in SINGULAR_S_WORDS or len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("oes"):
+        return word[:-2]
+    if word.endswith(ES_PLURAL_ENDINGS):
+        return word[:-2]
+    if word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def canonical_ingredient_name(name: str) -> str:
+    """
+    Return the canonical catalog name for a free-text ingredient name.
+
+    Steps: lowercase, collapse whitespace, singularize the last word,
+    then apply INGREDIENT_ALIASES (checked before and after singularizing).
+
+    Args:
+        name: Raw ingredient name e.g. '  Cherry  Tomatoes'.
+
+    Returns:
+        str: e.g. 'cherry tomato'. Empty string for blank input.
+    """
+    words = name.lower().split()
+    if not words:
+        return ""
+
+    collapsed = " ".join(words)
+    if collapsed in INGREDIENT_ALIASES:
+        return INGREDIENT_ALIASES[collapsed]
+
+    words[-1] = singularize(words[-1])
+    singular  = " ".join(words)
+    return INGREDIENT_ALIASES.get(singular, singular)
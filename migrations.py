@@ -0,0 +1,405 @@
+import sqlite3
+from typing import Callable
+
+from ingredient_names import canonical_ingredient_name
+
+
+# ---------------------------------------------------------------------------
+# Schema migrations
+# ---------------------------------------------------------------------------
+#
+# Each migration is a numbered step that moves the database from version
+# N - 1 to version N. The current version lives in SQLite's built-in
+# `PRAGMA user_version` header field, so checking whether anything needs
+# to run costs a single pragma read.
+#
+# To change the schema, append a new step to MIGRATIONS — never edit or
+# reorder a step that has already shipped.
+
+
+def _execute_all(conn: sqlite3.Connection, statements: list[str]) -> None:
+    """Run each SQL statement in order on the open transaction."""
+    for sql in statements:
+        conn.execute(sql)
+
+
+def _001_base_schema(conn: sqlite3.Connection) -> None:
+    """Create the recipes, ingredients, and meal_plan tables."""
+    _execute_all(conn, [
+        """
+        CREATE TABLE IF NOT EXISTS recipes (
+            id           INTEGER PRIMARY KEY AUTOINCREMENT,
+            title        TEXT    NOT NULL,
+            description  TEXT,
+            cuisine      TEXT,
+            cook_time    INTEGER,
+            servings     INTEGER,
+            tags         TEXT,
+            instructions TEXT
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS ingredients (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            recipe_id   INTEGER NOT NULL,
+            name        TEXT    NOT NULL,
+            quantity    REAL,
+            unit        TEXT,
+            FOREIGN KEY (recipe_id)
+                REFERENCES recipes (id)
+                ON DELETE CASCADE
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS meal_plan (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            week_start  TEXT    NOT NULL,
+            day         TEXT    NOT NULL,
+            meal_type   TEXT    NOT NULL,
+            recipe_id   INTEGER,
+            FOREIGN KEY (recipe_id)
+                REFERENCES recipes (id)
+        )
+        """,
+    ])
+
+    # Databases created before `instructions` existed lack the column.
+    # SQLite has no ADD COLUMN IF NOT EXISTS, so probe table_info once here.
+    existing_columns = {
+        row[1] for row in conn.execute("PRAGMA table_info(recipes)").fetchall()
+    }
+    if "instructions" not in existing_columns:
+        conn.execute("ALTER TABLE recipes ADD COLUMN instructions TEXT")
+
+
+def _002_indexes_and_unique_slots(conn: sqlite3.Connection) -> None:
+    """Index hot lookups and enforce one meal_plan row per slot."""
+    _execute_all(conn, [
+        # Keep the newest row for any duplicated slot so the UNIQUE index builds.
+        """
+        DELETE FROM meal_plan
+        WHERE  id NOT IN (
+            SELECT MAX(id)
+            FROM   meal_plan
+            GROUP  BY week_start, day, meal_type
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_ingredients_recipe_id ON ingredients (recipe_id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_meal_plan_slot ON meal_plan (week_start, day, meal_type)",
+        "CREATE INDEX IF NOT EXISTS idx_recipes_title_nocase ON recipes (title COLLATE NOCASE)",
+    ])
+
+
+def _003_app_meta(conn: sqlite3.Connection) -> None:
+    """Add a key/value table for bootstrap and other version stamps."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS app_meta (
+            key    TEXT PRIMARY KEY,
+            value  TEXT NOT NULL
+        )
+    """)
+
+
+def _004_title_order_index(conn: sqlite3.Connection) -> None:
+    """Index (title, id) so sorted, keyset-paginated listings skip the sort."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_recipes_title_id ON recipes (title, id)")
+
+
+def _005_full_text_search(conn: sqlite3.Connection) -> None:
+    """
+    Add an FTS5 index over recipe text and ingredient names.
+
+    The index row for a recipe shares its rowid with recipes.id. Triggers
+    keep it in sync with recipes and ingredients; the ingredients column
+    holds the recipe's ingredient names joined by spaces.
+    """
+    ingredient_names = (
+        "(SELECT group_concat(name, ' ') FROM ingredients WHERE recipe_id = {ref})"
+    )
+    _execute_all(conn, [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(
+            title,
+            description,
+            instructions,
+            ingredients,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix   = '2 3'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS recipes_fts_after_insert
+        AFTER INSERT ON recipes BEGIN
+            INSERT INTO recipes_fts (rowid, title, description, instructions, ingredients)
+            VALUES (new.id, new.title, new.description, new.instructions,
+                    {ingredient_names.format(ref="new.id")});
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS recipes_fts_after_update
+        AFTER UPDATE OF title, description, instructions ON recipes BEGIN
+            UPDATE recipes_fts
+            SET    title        = new.title,
+                   description  = new.description,
+                   instructions = new.instructions
+            WHERE  rowid = new.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS recipes_fts_after_delete
+        AFTER DELETE ON recipes BEGIN
+            DELETE FROM recipes_fts WHERE rowid = old.id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS ingredients_fts_after_insert
+        AFTER INSERT ON ingredients BEGIN
+            UPDATE recipes_fts
+            SET    ingredients = {ingredient_names.format(ref="new.recipe_id")}
+            WHERE  rowid = new.recipe_id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS ingredients_fts_after_update
+        AFTER UPDATE OF name, recipe_id ON ingredients BEGIN
+            UPDATE recipes_fts
+            SET    ingredients = {ingredient_names.format(ref="old.recipe_id")}
+            WHERE  rowid = old.recipe_id;
+            UPDATE recipes_fts
+            SET    ingredients = {ingredient_names.format(ref="new.recipe_id")}
+            WHERE  rowid = new.recipe_id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS ingredients_fts_after_delete
+        AFTER DELETE ON ingredients BEGIN
+            UPDATE recipes_fts
+            SET    ingredients = {ingredient_names.format(ref="old.recipe_id")}
+            WHERE  rowid = old.recipe_id;
+        END
+        """,
+        # Backfill existing recipes
+        "DELETE FROM recipes_fts",
+        f"""
+        INSERT INTO recipes_fts (rowid, title, description, instructions, ingredients)
+        SELECT id, title, description, instructions, {ingredient_names.format(ref="recipes.id")}
+        FROM   recipes
+        """,
+    ])
+
+
+def _006_recipe_tags(conn: sqlite3.Connection) -> None:
+    """Normalise comma-joined recipes.tags into an indexed junction table."""
+    _execute_all(conn, [
+        """
+        CREATE TABLE IF NOT EXISTS recipe_tags (
+            tag        TEXT    NOT NULL,
+            recipe_id  INTEGER NOT NULL,
+            PRIMARY KEY (tag, recipe_id),
+            FOREIGN KEY (recipe_id)
+                REFERENCES recipes (id)
+                ON DELETE CASCADE
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_recipe_tags_recipe_id ON recipe_tags (recipe_id)",
+        "CREATE INDEX IF NOT EXISTS idx_recipes_cuisine ON recipes (cuisine)",
+        "DELETE FROM recipe_tags",
+    ])
+
+    # Backfill with the same rule the app uses: split on commas, strip,
+    # lowercase, drop empties.
+    rows = conn.execute("SELECT id, tags FROM recipes WHERE tags IS NOT NULL").fetchall()
+    conn.executemany(
+        "INSERT OR IGNORE INTO recipe_tags (tag, recipe_id) VALUES (?, ?)",
+        [
+            (tag.strip().lower(), recipe_id)
+            for recipe_id, tags in rows
+            for tag in tags.split(",")
+            if tag.strip()
+        ],
+    )
+
+
+def _link_ingredient_catalog(conn: sqlite3.Connection) -> None:
+    """
+    Point every ingredient row at the catalog entry for its canonical name.
+
+    One scan of ingredients and one primary-key UPDATE per row that needs
+    a new link, so cost grows linearly with the table. A per-name UPDATE
+    would rescan ingredients for every distinct name.
+    """
+    rows = conn.execute("SELECT id, name, catalog_id FROM ingredients").fetchall()
+
+    canonical: dict[str, str] = {}
+    for _, name, _ in rows:
+        if name not in canonical:
+            canonical[name] = canonical_ingredient_name(name)
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO ingredient_catalog (name) VALUES (?)",
+        [(c,) for c in set(canonical.values()) if c],
+    )
+    catalog_ids = {name: catalog_id for catalog_id, name in conn.execute(
+        "SELECT id, name FROM ingredient_catalog"
+    )}
+
+    conn.executemany(
+        "UPDATE ingredients SET catalog_id = ? WHERE id = ?",
+        [
+            (catalog_ids[canonical[name]], row_id)
+            for row_id, name, catalog_id in rows
+            if canonical[name] and catalog_ids[canonical[name]] != catalog_id
+        ],
+    )
+
+
+def _007_ingredient_catalog(conn: sqlite3.Connection) -> None:
+    """Add a canonical ingredient catalog and link every ingredient row to it."""
+    _execute_all(conn, [
+        """
+        CREATE TABLE IF NOT EXISTS ingredient_catalog (
+            id    INTEGER PRIMARY KEY,
+            name  TEXT    NOT NULL UNIQUE
+        )
+        """,
+        "ALTER TABLE ingredients ADD COLUMN catalog_id INTEGER REFERENCES ingredient_catalog (id)",
+        "CREATE INDEX IF NOT EXISTS idx_ingredients_catalog_id ON ingredients (catalog_id)",
+    ])
+
+    _link_ingredient_catalog(conn)
+
+
+def _008_plan_revision(conn: sqlite3.Connection) -> None:
+    """
+    Keep a 'plan_revision' counter in app_meta that bumps on every change
+    to meal_plan or ingredients, so cached grocery totals know when to
+    refresh.
+    """
+    bump = """
+        INSERT INTO app_meta (key, value) VALUES ('plan_revision', '1')
+        ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1;
+    """
+    triggers = [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_revision_after_{event.lower()}
+        AFTER {event} ON {table} BEGIN
+            {bump}
+        END
+        """
+        for table in ("meal_plan", "ingredients")
+        for event in ("INSERT", "UPDATE", "DELETE")
+    ]
+    _execute_all(conn, [
+        "INSERT OR IGNORE INTO app_meta (key, value) VALUES ('plan_revision', '0')",
+        *triggers,
+    ])
+
+
+def _009_grocery_checks(conn: sqlite3.Connection) -> None:
+    """
+    Persist grocery checklist ticks and manual extra items per shopping period.
+
+    period is the ISO interval 'start/end' the list was built for. item is
+    the canonical ingredient name (or the manual item's text) and unit is
+    '' for manual items. The rowid keeps manual items in the order added.
+    """
+    _execute_all(conn, [
+        """
+        CREATE TABLE IF NOT EXISTS grocery_checks (
+            id         INTEGER PRIMARY KEY,
+            period     TEXT    NOT NULL,
+            item       TEXT    NOT NULL,
+            unit       TEXT    NOT NULL DEFAULT '',
+            checked    INTEGER NOT NULL DEFAULT 0,
+            is_manual  INTEGER NOT NULL DEFAULT 0,
+            UNIQUE (period, item, unit)
+        )
+        """,
+    ])
+
+
+def _010_library_revision(conn: sqlite3.Connection) -> None:
+    """
+    Keep a 'library_revision' counter in app_meta that bumps on every
+    change to recipes or ingredients, so cached recipe indexes know when
+    to rebuild.
+    """
+    bump = """
+        INSERT INTO app_meta (key, value) VALUES ('library_revision', '1')
+        ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1;
+    """
+    triggers = [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_library_revision_after_{event.lower()}
+        AFTER {event} ON {table} BEGIN
+            {bump}
+        END
+        """
+        for table in ("recipes", "ingredients")
+        for event in ("INSERT", "UPDATE", "DELETE")
+    ]
+    _execute_all(conn, [
+        "INSERT OR IGNORE INTO app_meta (key, value) VALUES ('library_revision', '0')",
+        *triggers,
+    ])
+
+
+MIGRATIONS: list[tuple[int, Callable[[sqlite3.Connection], None]]] = [
+    (1, _001_base_schema),
+    (2, _002_indexes_and_unique_slots),
+    (3, _003_app_meta),
+    (4, _004_title_order_index),
+    (5, _005_full_text_search),
+    (6, _006_recipe_tags),
+    (7, _007_ingredient_catalog),
+    (8, _008_plan_revision),
+    (9, _009_grocery_checks),
+    (10, _010_library_revision),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the migration version recorded in PRAGMA user_version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Bring the database up to LATEST_VERSION.
+
+    Pending steps run in order, each in its own transaction together with
+    the user_version bump, so a failed step rolls back cleanly and leaves
+    the database at the last good version. When nothing is pending this
+    is a single pragma read.
+
+    Args:
+        conn: Open SQLite connection with no transaction in progress.
+
+    Returns:
+        int: The schema version after migrating.
+    """
+    current = get_schema_version(conn)
+    if current >= LATEST_VERSION:
+        return current
+
+    for version, step in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.execute("BEGIN")
+        try:
+            step(conn)
+            # PRAGMA does not accept bound parameters; version is an int.
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        current = version
+
+    return current
@@ -1,17 +1,19 @@
 from global_styles import inject_global_styles
 inject_global_styles()
 
-import sqlite3
 import streamlit as st
 
 from database import (
-    add_recipe,
-    update_recipe,
-    add_ingredient,
+    ensure_schema,
     get_recipe_by_id,
     get_ingredients_by_recipe_id,
+    save_recipe_with_ingredients,
+    submit_write,
 )
 
+# Pages can be opened directly, before app.py has bootstrapped the database
+ensure_schema()
+
 
 # ---------------------------------------------------------------------------
 # Page config
@@ -696,53 +698,36 @@ if submitted:
     safe_instructions = instructions.strip()[:15_000]
 
     # ── Persist ───────────────────────────────────────────────────────────
+    # Recipe and ingredients are written in a single transaction, so a
+    # failure never leaves a recipe with a half-written ingredient list.
+    recipe_fields = {
+        "title":        title.strip(),
+        "description":  description.strip(),
+        "cuisine":      cuisine,
+        "cook_time":    int(cook_time),
+        "servings":     int(servings),
+        "tags":         tags.strip(),
+        "instructions": safe_instructions,
+    }
+    ingredient_rows = [
+        {
+            "name":     ing["name"].strip(),
+            "quantity": ing["quantity"],
+            "unit":     ing["unit"],
+        }
+        for ing in valid_ingredients
+    ]
+
     try:
         if is_edit_mode:
-            update_recipe(
-                recipe_id    = recipe_id,
-                title        = title.strip(),
-                description  = description.strip(),
-                cuisine      = cuisine,
-                cook_time    = int(cook_time),
-                servings     = int(servings),
-                tags         = tags.strip(),
-                instructions = safe_instructions,
-            )
-
-            # Overwrite ingredients: delete existing rows, re-insert fresh
-            conn = sqlite3.connect("recipes.db")
-            conn.execute("DELETE FROM ingredients WHERE recipe_id = ?", (recipe_id,))
-            conn.commit()
-            conn.close()
-
-            for ing in valid_ingredients:
-                add_ingredient(
-                    recipe_id = recipe_id,
-                    name      = ing["name"].strip(),
-                    quantity  = ing["quantity"],
-                    unit      = ing["unit"],
-                )
+            submit_write(
+                save_recipe_with_ingredients, recipe_fields, ingredient_rows, recipe_id=recipe_id,
+            ).result()
 
             st.success(f"✅ **{title.strip()}** updated successfully!")
 
         else:
-            new_id = add_recipe(
-                title        = title.strip(),
-                description  = description.strip(),
-                cuisine      = cuisine,
-                cook_time    = int(cook_time),
-                servings     = int(servings),
-                tags         = tags.strip(),
-                instructions = safe_instructions,
-            )
-
-            for ing in valid_ingredients:
-                add_ingredient(
-                    recipe_id = new_id,
-                    name      = ing["name"].strip(),
-                    quantity  = ing["quantity"],
-                    unit      = ing["unit"],
-                )
+            submit_write(save_recipe_with_ingredients, recipe_fields, ingredient_rows).result()
 
             st.success(f"✅ **{title.strip()}** added to your recipe collection!")
 
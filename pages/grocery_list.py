@@ -5,9 +5,20 @@ import streamlit as st
 from datetime import date, timedelta
 
 from database import (
-    get_meal_plan,
-    get_ingredients_by_recipe_id,
+    add_manual_grocery_item,
+    clear_grocery_checks,
+    ensure_schema,
+    get_grocery_checks,
+    get_grocery_totals_for_range,
+    get_plan_revision,
+    remove_manual_grocery_item,
+    save_grocery_checks,
 )
+from grocery_categories import CATEGORY_ORDER, categorize_ingredient
+from units import normalize_grocery_rows
+
+# Pages can be opened directly, before app.py has bootstrapped the database
+ensure_schema()
 
 
 # ---------------------------------------------------------------------------
@@ -129,44 +140,9 @@ div[data-testid="stVerticalBlockBorderWrapper"] {
 # Constants
 # ---------------------------------------------------------------------------
 
-CATEGORY_KEYWORDS: dict[str, list[str]] = {
-    "🥦 Produce": [
-        "onion", "tomato", "garlic", "ginger", "potato", "carrot", "spinach",
-        "lettuce", "cucumber", "pepper", "chilli", "lemon", "lime", "apple",
-        "banana", "mango", "coriander", "parsley", "basil", "mint", "celery",
-        "broccoli", "cauliflower", "mushroom", "zucchini", "eggplant", "avocado",
-        "spring onion", "scallion", "cabbage", "beetroot", "radish", "peas",
-        "capsicum", "leek", "fennel", "artichoke", "asparagus",
-    ],
-    "🍗 Meat & Protein": [
-        "chicken", "beef", "lamb", "pork", "fish", "prawn", "shrimp", "salmon",
-        "tuna", "egg", "tofu", "paneer", "mutton", "turkey", "bacon", "sausage",
-        "mince", "steak", "breast", "thigh", "fillet", "chorizo", "anchovy",
-    ],
-    "🥛 Dairy": [
-        "milk", "cream", "butter", "cheese", "yogurt", "curd", "ghee",
-        "mozzarella", "parmesan", "ricotta", "condensed milk", "evaporated milk",
-        "sour cream", "crème fraîche",
-    ],
-    "🌾 Grains & Pantry": [
-        "rice", "flour", "pasta", "bread", "noodle", "oat", "lentil", "dal",
-        "chickpea", "kidney bean", "black bean", "sugar", "salt", "oil",
-        "vinegar", "soy sauce", "tomato puree", "tomato paste", "stock",
-        "broth", "cornstarch", "baking", "yeast", "honey", "jam", "spice",
-        "masala", "cumin", "turmeric", "paprika", "chilli powder",
-        "garam masala", "oregano", "thyme", "bay leaf", "cardamom",
-        "cinnamon", "clove", "mustard", "ketchup", "mayo", "sauce",
-        "coriander powder", "pepper",
-    ],
-}
-
-CATEGORY_ORDER = [
-    "🥦 Produce",
-    "🍗 Meat & Protein",
-    "🥛 Dairy",
-    "🌾 Grains & Pantry",
-    "🧂 Other",
-]
+# Seconds between background syncs of the checklist: queued ticks are
+# saved and ticks from other devices are pulled in.
+CHECK_SAVE_INTERVAL = 3
 
 
 # ---------------------------------------------------------------------------
@@ -180,100 +156,51 @@ def get_current_week_start() -> str:
     return monday.isoformat()
 
 
-def format_week_label(week_start_str: str) -> str:
-    monday = date.fromisoformat(week_start_str)
-    sunday = monday + timedelta(days=6)
-    return f"{monday.strftime('%a %d %b')} → {sunday.strftime('%a %d %b %Y')}"
+def format_range_label(start: date, end: date) -> str:
+    return f"{start.strftime('%a %d %b')} → {end.strftime('%a %d %b %Y')}"
 
 
 # ---------------------------------------------------------------------------
 # Data helpers
 # ---------------------------------------------------------------------------
 
-def get_planned_recipe_ids(meal_plan: list[dict]) -> list[int]:
-    """Extract unique, non-null recipe IDs from the meal plan."""
-    seen: set[int] = set()
-    ids: list[int] = []
-    for slot in meal_plan:
-        rid = slot.get("recipe_id")
-        if rid is not None and rid not in seen:
-            seen.add(rid)
-            ids.append(rid)
-    return ids
-
-
-# ---------------------------------------------------------------------------
-# ⭐ Ingredient merging
-# ---------------------------------------------------------------------------
-
-def merge_ingredients(all_ingredients: list[dict]) -> dict[str, dict[str, float]]:
+@st.cache_data(max_entries=32, show_spinner=False)
+def load_grocery_totals(start_date: str, end_date: str, plan_revision: int) -> list[dict]:
     """
-    Merge a flat list of ingredient dicts by name + unit.
-
-    Strategy:
-      - Normalize names to lowercase for grouping.
-      - Same name + same unit  → sum quantities together.
-      - Same name + diff unit  → keep as separate unit entries.
-      - Skip entries with blank names.
+    Cached get_grocery_totals_for_range(), totalled across units.
 
-    Returns:
-        { "chicken breast": { "grams": 350.0 }, "flour": { "cups": 1.0, "grams": 200.0 } }
+    plan_revision is part of the cache key only: it changes whenever the
+    meal plan or any ingredient changes, so each range is recomputed once
+    per edit and served from cache on every other rerun.
     """
-    merged: dict[str, dict[str, float]] = {}
-
-    for ing in all_ingredients:
-        name = (ing.get("name") or "").strip()
-        if not name:
-            continue
-
-        name_key = name.lower()
-        unit     = (ing.get("unit") or "unit").strip().lower()
-        quantity = float(ing.get("quantity") or 0.0)
-
-        # Ensure the name bucket exists
-        if name_key not in merged:
-            merged[name_key] = {}
-
-        # Add to existing unit total, or create a new unit entry
-        merged[name_key][unit] = merged[name_key].get(unit, 0.0) + quantity
-
-    return merged
+    return normalize_grocery_rows(get_grocery_totals_for_range(start_date, end_date))
 
 
 # ---------------------------------------------------------------------------
 # Ingredient categorization
 # ---------------------------------------------------------------------------
 
-def categorize_ingredient(name: str) -> str:
-    """Return the category for an ingredient name using keyword matching."""
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        for kw in keywords:
-            if kw in name:
-                return category
-    return "🧂 Other"
-
-
-def build_categorized_list(merged: dict[str, dict[str, float]]) -> dict[str, list[dict]]:
+def build_categorized_list(totals: list[dict]) -> dict[str, list[dict]]:
     """
-    Group merged ingredients into display categories.
+    Group pre-aggregated grocery rows into display categories.
 
-    Each item in a category list: { name, quantity, unit }
-    Items sorted alphabetically within each category.
+    Args:
+        totals: Rows from load_grocery_totals(), merged by name + unit
+                and ordered by name, so each category stays alphabetical.
+
+    Each item in a category list: { item, name, quantity, unit } where
+    item is the canonical name used to persist its checkbox.
     """
     categories: dict[str, list[dict]] = {cat: [] for cat in CATEGORY_ORDER}
 
-    for name_key, unit_map in merged.items():
-        cat = categorize_ingredient(name_key)
-        for unit, qty in unit_map.items():
-            categories[cat].append({
-                "name":     name_key.title(),
-                "quantity": qty,
-                "unit":     unit,
-            })
-
-    # Sort alphabetically within each category
-    for cat in categories:
-        categories[cat].sort(key=lambda x: x["name"])
+    for row in totals:
+        cat = categorize_ingredient(row["name"])
+        categories[cat].append({
+            "item":     row["name"],
+            "name":     row["name"].title(),
+            "quantity": row["quantity"],
+            "unit":     row["unit"],
+        })
 
     return categories
 
@@ -299,19 +226,69 @@ def count_checked(keys: list[str]) -> int:
 
 
 # ---------------------------------------------------------------------------
-# Session state init
+# Checklist persistence
 # ---------------------------------------------------------------------------
 
-if "manual_items" not in st.session_state:
-    st.session_state.manual_items: list[str] = [] # type: ignore
+def queue_check(item: str, unit: str, key: str) -> None:
+    """
+    Checkbox on_change callback: record the new state for the next save.
+
+    Toggles are coalesced in session state and written in one batched
+    upsert by the next checklist sync, instead of one write per tick.
+    The rerun a tick causes skips the sync, so it touches no database.
+    """
+    st.session_state.pending_checks[(item, unit)] = st.session_state[key]
+    st.session_state.check_toggled = True
+
+
+def clear_all_checks(period: str, keys: list[str]) -> None:
+    """'Clear all' on_click callback: untick everything, saved and on screen."""
+    clear_grocery_checks(period)
+    st.session_state.pending_checks = {}
+    st.session_state.check_toggled  = True
+    for key in keys:
+        st.session_state[key] = False
+
+
+def flush_pending_checks(period: str) -> None:
+    """Write all queued checkbox toggles for the period in one transaction."""
+    if st.session_state.pending_checks:
+        save_grocery_checks(period, st.session_state.pending_checks)
+        st.session_state.pending_checks = {}
+
+
+def sync_checks(period: str, categorized: dict[str, list[dict]]) -> None:
+    """
+    Save this device's queued ticks, then load everyone's into the checklist.
+
+    Queued ticks are written before the read, so they come back from the
+    database unchanged, while ticks saved from a second phone replace the
+    stale on-screen state. Extra items are reloaded the same way.
+    """
+    flush_pending_checks(period)
+    saved_checks = get_grocery_checks(period)
+
+    checked_state: dict[tuple[str, str], bool] = {
+        (row["item"], row["unit"]): row["checked"] for row in saved_checks
+    }
+
+    for cat in CATEGORY_ORDER:
+        for item in categorized[cat]:
+            chk_key = checkbox_key(item["name"], item["unit"])
+            st.session_state[chk_key] = checked_state.get((item["item"], item["unit"]), False)
+
+    st.session_state.manual_items = [row["item"] for row in saved_checks if row["is_manual"]]
+    for item in st.session_state.manual_items:
+        m_key = checkbox_key(item, "manual", prefix="manual_chk")
+        st.session_state[m_key] = checked_state.get((item, ""), False)
 
 
 # ---------------------------------------------------------------------------
-# Load data
+# Session state init
 # ---------------------------------------------------------------------------
 
-week_start = get_current_week_start()
-meal_plan  = get_meal_plan(week_start)
+if "pending_checks" not in st.session_state:
+    st.session_state.pending_checks: dict[tuple[str, str], bool] = {} # type: ignore
 
 
 # ---------------------------------------------------------------------------
@@ -321,26 +298,65 @@ meal_plan  = get_meal_plan(week_start)
 st.title("🛒 Grocery List")
 st.markdown(
     '<p style="color:#A0897E; margin-top:-0.4rem; margin-bottom:0.4rem; font-size:0.97rem;">'
-    "Your shopping list, auto-built from this week's meal plan. Tick as you go!"
+    "Your shopping list, auto-built from your meal plan. Tick as you go!"
     "</p>",
     unsafe_allow_html=True,
 )
-st.caption(f"📆 {format_week_label(week_start)}")
+
+
+# ---------------------------------------------------------------------------
+# Date range picker
+# ---------------------------------------------------------------------------
+
+week_start   = date.fromisoformat(get_current_week_start())
+picked_range = st.date_input(
+    "📆 Shopping for",
+    value  = (week_start, week_start + timedelta(days=6)),
+    format = "DD/MM/YYYY",
+    help   = "Pick any start and end day — ranges can span several weeks.",
+)
+
+# While the user is mid-selection the widget returns only the start date
+if len(picked_range) != 2:
+    st.info("Pick an end date to build the list.")
+    st.stop()
+
+range_start, range_end = picked_range
+period = f"{range_start.isoformat()}/{range_end.isoformat()}"
+st.caption(f"📆 {format_range_label(range_start, range_end)}")
 st.divider()
 
 
 # ---------------------------------------------------------------------------
-# Empty state — no meals planned
+# Load merged totals
 # ---------------------------------------------------------------------------
 
-planned_ids = get_planned_recipe_ids(meal_plan)
+# A tick changes neither the plan nor the range, so when one triggers a
+# full rerun the list from the previous run is reused without a query.
+last_list = st.session_state.get("grocery_list")
+
+if st.session_state.get("check_toggled") and last_list and last_list["period"] == period:
+    grocery_totals = last_list["totals"]
+else:
+    # Summed per name + unit in SQL, one row per shopping-list line
+    grocery_totals = load_grocery_totals(
+        range_start.isoformat(),
+        range_end.isoformat(),
+        get_plan_revision(),
+    )
+    st.session_state.grocery_list = {"period": period, "totals": grocery_totals}
+
 
-if not planned_ids:
+# ---------------------------------------------------------------------------
+# Empty state — no meals planned
+# ---------------------------------------------------------------------------
+
+if not grocery_totals:
     st.markdown("<br>", unsafe_allow_html=True)
     with st.container(border=True):
         st.markdown(
             '<p style="text-align:center; color:#A0897E; padding:1.2rem 0; font-size:1rem;">'
-            "📅 No meals planned for this week yet."
+            "📅 No meals planned for these dates yet."
             "</p>",
             unsafe_allow_html=True,
         )
@@ -351,144 +367,171 @@ if not planned_ids:
 
 
 # ---------------------------------------------------------------------------
-# Collect, merge, and categorize ingredients
+# Categorize
 # ---------------------------------------------------------------------------
 
-all_ingredients: list[dict] = []
-for rid in planned_ids:
-    all_ingredients.extend(get_ingredients_by_recipe_id(rid))
-
-merged      = merge_ingredients(all_ingredients)
-categorized = build_categorized_list(merged)
-
-# Build a flat list of all checkbox keys (for progress tracking)
-all_chk_keys: list[str] = []
-for cat in CATEGORY_ORDER:
-    for item in categorized[cat]:
-        all_chk_keys.append(checkbox_key(item["name"], item["unit"]))
-
-# Manual item keys
-manual_chk_keys = [checkbox_key(item, "manual", prefix="manual_chk") for item in st.session_state.manual_items]
-all_chk_keys_total = all_chk_keys + manual_chk_keys
-
-total_items   = len(all_chk_keys_total)
-checked_items = count_checked(all_chk_keys_total)
+categorized = build_categorized_list(grocery_totals)
 
 
 # ---------------------------------------------------------------------------
-# Progress bar
+# Checklist fragment
 # ---------------------------------------------------------------------------
+#
+# Progress, category checkboxes and extra items share one fragment: the
+# progress bar counts ticks from both lists, so they must redraw together.
+# A tick reruns only this fragment over the cached, categorized list —
+# no data loading, CSS or database access. Every CHECK_SAVE_INTERVAL
+# seconds the fragment reruns on its own and syncs with the database.
 
-progress_pct = checked_items / total_items if total_items else 0.0
-
-prog_col, clear_col = st.columns([6, 1])
-
-with prog_col:
-    st.progress(
-        value = progress_pct,
-        text  = f"**{checked_items} / {total_items}** items checked  ({int(progress_pct * 100)}% done)",
-    )
+def render_progress(period: str, all_chk_keys: list[str]) -> None:
+    total_items   = len(all_chk_keys)
+    checked_items = count_checked(all_chk_keys)
+    progress_pct  = checked_items / total_items if total_items else 0.0
 
-with clear_col:
-    if st.button("🔄 Clear all", use_container_width=True, help="Reset all checkboxes"):
-        for k in all_chk_keys_total:
-            st.session_state[k] = False
-        st.rerun()
+    prog_col, clear_col = st.columns([6, 1])
 
-st.markdown("<div style='margin-bottom:0.8rem;'></div>", unsafe_allow_html=True)
-
-
-# ---------------------------------------------------------------------------
-# Category sections
-# ---------------------------------------------------------------------------
+    with prog_col:
+        st.progress(
+            value = progress_pct,
+            text  = f"**{checked_items} / {total_items}** items checked  ({int(progress_pct * 100)}% done)",
+        )
 
-for cat in CATEGORY_ORDER:
-    items = categorized.get(cat, [])
-    if not items:
-        continue
+    with clear_col:
+        st.button(
+            "🔄 Clear all",
+            use_container_width = True,
+            help                = "Reset all checkboxes",
+            on_click            = clear_all_checks,
+            args                = (period, all_chk_keys),
+        )
 
-    # Category header with item count badge
-    st.markdown(
-        f'<div class="cat-header">{cat} <span class="cat-badge">{len(items)}</span></div>',
-        unsafe_allow_html=True,
-    )
+    st.markdown("<div style='margin-bottom:0.8rem;'></div>", unsafe_allow_html=True)
 
-    with st.container(border=True):
-        # Two items per visual row using columns
-        # Each item: [checkbox+name col] [qty col]
-        for item in items:
-            chk_key  = checkbox_key(item["name"], item["unit"])
-            qty_text = f"{format_qty(item['quantity'])} {item['unit']}"
-            is_done  = st.session_state.get(chk_key, False)
 
-            name_col, qty_col = st.columns([4, 1])
+def render_categories(categorized: dict[str, list[dict]]) -> None:
+    for cat in CATEGORY_ORDER:
+        items = categorized.get(cat, [])
+        if not items:
+            continue
 
-            with name_col:
-                # Strike-through name when checked
-                label = f"~~{item['name']}~~" if is_done else item["name"]
-                st.checkbox(label=label, key=chk_key)
+        # Category header with item count badge
+        st.markdown(
+            f'<div class="cat-header">{cat} <span class="cat-badge">{len(items)}</span></div>',
+            unsafe_allow_html=True,
+        )
 
-            with qty_col:
-                color = "#C8BDB8" if is_done else "#A0897E"
-                st.markdown(
-                    f'<div class="qty-label" style="color:{color};">{qty_text}</div>',
-                    unsafe_allow_html=True,
-                )
+        with st.container(border=True):
+            # Two items per visual row using columns
+            # Each item: [checkbox+name col] [qty col]
+            for item in items:
+                chk_key  = checkbox_key(item["name"], item["unit"])
+                qty_text = f"{format_qty(item['quantity'])} {item['unit']}"
+                is_done  = st.session_state.get(chk_key, False)
 
-    st.markdown("<div style='margin-bottom:0.6rem;'></div>", unsafe_allow_html=True)
+                name_col, qty_col = st.columns([4, 1])
 
+                with name_col:
+                    # Strike-through name when checked
+                    label = f"~~{item['name']}~~" if is_done else item["name"]
+                    st.checkbox(
+                        label     = label,
+                        key       = chk_key,
+                        on_change = queue_check,
+                        args      = (item["item"], item["unit"], chk_key),
+                    )
 
-# ---------------------------------------------------------------------------
-# Manual items section
-# ---------------------------------------------------------------------------
+                with qty_col:
+                    color = "#C8BDB8" if is_done else "#A0897E"
+                    st.markdown(
+                        f'<div class="qty-label" style="color:{color};">{qty_text}</div>',
+                        unsafe_allow_html=True,
+                    )
 
-st.divider()
+        st.markdown("<div style='margin-bottom:0.6rem;'></div>", unsafe_allow_html=True)
 
-st.markdown(
-    '<div class="manual-header">➕ Extra Items</div>'
-    '<p style="font-size:0.83rem; color:#A0897E; margin-top:0.1rem; margin-bottom:0.7rem;">'
-    "Anything else you need that isn't from your recipes."
-    "</p>",
-    unsafe_allow_html=True,
-)
 
-# Input row
-input_col, add_col = st.columns([5, 1])
+def render_manual_items(period: str) -> None:
+    st.divider()
 
-with input_col:
-    new_item = st.text_input(
-        label            = "Extra item",
-        placeholder      = "e.g. Washing-up liquid, kitchen roll…",
-        label_visibility = "collapsed",
+    st.markdown(
+        '<div class="manual-header">➕ Extra Items</div>'
+        '<p style="font-size:0.83rem; color:#A0897E; margin-top:0.1rem; margin-bottom:0.7rem;">'
+        "Anything else you need that isn't from your recipes."
+        "</p>",
+        unsafe_allow_html=True,
     )
 
-with add_col:
-    if st.button("Add ➕", use_container_width=True):
-        if new_item.strip():
-            st.session_state.manual_items.append(new_item.strip())
-            st.rerun()
+    # Input row
+    input_col, add_col = st.columns([5, 1])
 
-# Display manual items
-if st.session_state.manual_items:
-    with st.container(border=True):
-        for i, item in enumerate(st.session_state.manual_items):
-            m_key    = checkbox_key(item, "manual", prefix="manual_chk")
-            is_done  = st.session_state.get(m_key, False)
-            label    = f"~~{item}~~" if is_done else item
-
-            item_col, rm_col = st.columns([5, 1])
-
-            with item_col:
-                st.checkbox(label=label, key=m_key)
-
-            with rm_col:
-                if st.button("✕", key=f"rm_manual_{i}", help="Remove", use_container_width=True):
-                    st.session_state.manual_items.pop(i)
-                    # Clean up the checkbox key to avoid ghost state
-                    st.session_state.pop(m_key, None)
-                    st.rerun()
-else:
-    st.caption("No extra items yet.")
+    with input_col:
+        new_item = st.text_input(
+            label            = "Extra item",
+            placeholder      = "e.g. Washing-up liquid, kitchen roll…",
+            label_visibility = "collapsed",
+        )
+
+    with add_col:
+        if st.button("Add ➕", use_container_width=True):
+            item = new_item.strip()
+            if item and item not in st.session_state.manual_items:
+                add_manual_grocery_item(period, item)
+                st.session_state.manual_items.append(item)
+                st.rerun(scope="fragment")
+
+    # Display manual items
+    if st.session_state.manual_items:
+        with st.container(border=True):
+            for i, item in enumerate(st.session_state.manual_items):
+                m_key    = checkbox_key(item, "manual", prefix="manual_chk")
+                is_done  = st.session_state.get(m_key, False)
+                label    = f"~~{item}~~" if is_done else item
+
+                item_col, rm_col = st.columns([5, 1])
+
+                with item_col:
+                    st.checkbox(
+                        label     = label,
+                        key       = m_key,
+                        on_change = queue_check,
+                        args      = (item, "", m_key),
+                    )
+
+                with rm_col:
+                    if st.button("✕", key=f"rm_manual_{i}", help="Remove", use_container_width=True):
+                        remove_manual_grocery_item(period, item)
+                        st.session_state.manual_items.pop(i)
+                        # Clean up the checkbox key and any queued tick to avoid ghost state
+                        st.session_state.pop(m_key, None)
+                        st.session_state.pending_checks.pop((item, ""), None)
+                        st.rerun(scope="fragment")
+    else:
+        st.caption("No extra items yet.")
+
+
+@st.fragment(run_every=CHECK_SAVE_INTERVAL)
+def render_checklist(period: str, categorized: dict[str, list[dict]]) -> None:
+    """Progress bar, category checklist and extra items for one period."""
+    # Full runs and timed reruns sync; the rerun from a tick keeps the
+    # on-screen state as is and leaves the write to the next sync.
+    if not st.session_state.pop("check_toggled", False):
+        sync_checks(period, categorized)
+
+    all_chk_keys = [
+        checkbox_key(item["name"], item["unit"])
+        for cat in CATEGORY_ORDER
+        for item in categorized[cat]
+    ] + [
+        checkbox_key(item, "manual", prefix="manual_chk")
+        for item in st.session_state.manual_items
+    ]
+
+    render_progress(period, all_chk_keys)
+    render_categories(categorized)
+    render_manual_items(period)
+
+
+render_checklist(period, categorized)
 
 
 # ---------------------------------------------------------------------------
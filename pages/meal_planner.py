@@ -5,12 +5,16 @@ import streamlit as st
 from datetime import date, timedelta
 
 from database import (
-    get_all_recipes,
-    save_meal_plan,
+    ensure_schema,
     get_meal_plan,
-    clear_meal_slot,
+    list_recipes,
+    save_week_plan,
+    submit_write,
 )
 
+# Pages can be opened directly, before app.py has bootstrapped the database
+ensure_schema()
+
 
 # ---------------------------------------------------------------------------
 # Page config
@@ -198,6 +202,17 @@ def build_recipe_options(recipes: list[dict]) -> list[str]:
     return [NO_PLAN] + [r["title"] for r in recipes]
 
 
+def build_title_to_id(recipes: list[dict]) -> dict[str, int]:
+    """
+    Map each recipe title to its id for O(1) lookups on save.
+    If titles repeat, the first recipe in list order wins.
+    """
+    lookup: dict[str, int] = {}
+    for r in recipes:
+        lookup.setdefault(r["title"], r["id"])
+    return lookup
+
+
 def init_week_state() -> None:
     """Initialise selected_monday in session state once."""
     if "selected_monday" not in st.session_state:
@@ -232,7 +247,7 @@ init_week_state()
 # Load data
 # ---------------------------------------------------------------------------
 
-all_recipes    = get_all_recipes()
+all_recipes    = list_recipes(projection="titles")
 recipe_options = build_recipe_options(all_recipes)
 week_start     = st.session_state.selected_monday.isoformat()
 meal_plan      = get_meal_plan(week_start)
@@ -391,8 +406,8 @@ with save_col:
     save_clicked = st.button("💾 Save Plan", type="primary", use_container_width=True)
 
 if save_clicked:
-    saved_count   = 0
-    cleared_count = 0
+    title_to_id = build_title_to_id(all_recipes)
+    week_slots: dict[tuple[str, str], int | None] = {}
 
     for day in DAYS:
         for meal_type in MEAL_TYPES:
@@ -400,13 +415,12 @@ if save_clicked:
             selected_title = st.session_state.get(key, NO_PLAN)
 
             if selected_title == NO_PLAN:
-                clear_meal_slot(week_start, day, meal_type)
-                cleared_count += 1
-            else:
-                matching = [r for r in all_recipes if r["title"] == selected_title]
-                if matching:
-                    save_meal_plan(week_start, day, meal_type, matching[0]["id"])
-                    saved_count += 1
+                week_slots[(day, meal_type)] = None
+            elif selected_title in title_to_id:
+                week_slots[(day, meal_type)] = title_to_id[selected_title]
+
+    submit_write(save_week_plan, week_start, week_slots).result()
+    saved_count = sum(1 for rid in week_slots.values() if rid is not None)
 
     # Refresh summary counts after save
     meal_plan    = get_meal_plan(week_start)
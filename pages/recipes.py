@@ -3,11 +3,22 @@ inject_global_styles()
 import streamlit as st
 
 from database import (
-    get_all_recipes,
-    get_ingredients_by_recipe_id,
+    count_recipes,
+    count_search_results,
+    ensure_schema,
+    get_ingredients_for_recipes,
+    get_library_revision,
+    get_recipe_facets,
+    get_recipe_instructions,
+    list_recipes,
+    search_recipes,
     delete_recipe,
+    submit_write,
 )
 
+# Pages can be opened directly, before app.py has bootstrapped the database
+ensure_schema()
+
 
 # ---------------------------------------------------------------------------
 # Page config
@@ -208,6 +219,14 @@ hr { border-color: #F0D9CF !important; }
 """, unsafe_allow_html=True)
 
 
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Cards fetched per page; "Show more" loads the next batch.
+RECIPES_PER_PAGE = 20
+
+
 # ---------------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------------
@@ -241,45 +260,60 @@ def format_quantity(qty: float | None) -> str:
     return str(int(qty)) if float(qty) == int(qty) else str(round(qty, 2))
 
 
-def get_unique_cuisines(recipes: list[dict]) -> list[str]:
-    """Return sorted list of unique cuisines from all recipes."""
-    return sorted({r["cuisine"] for r in recipes if r.get("cuisine")})
-
+def format_facet_option(counts: dict[str, int]):
+    """Return a multiselect format_func that appends each option's count."""
+    return lambda option: f"{option} ({counts.get(option, 0)})"
 
-def get_unique_tags(recipes: list[dict]) -> list[str]:
-    """Return sorted list of unique tags across all recipes."""
-    tags: set[str] = set()
-    for r in recipes:
-        tags.update(parse_tags(r.get("tags", "")))
-    return sorted(tags)
 
-
-def apply_filters(
-    recipes:         list[dict],
+def fetch_recipe_page(
     search_query:    str,
     filter_cuisines: list[str],
     filter_tags:     list[str],
-) -> list[dict]:
+    loaded:          list[dict],
+) -> tuple[list[dict], bool]:
     """
-    Apply search text, cuisine, and tag filters to the recipe list.
-    All three filters are additive (AND logic).
+    Fetch the page of filtered recipes that follows the ones already loaded.
+    All three filters are additive (AND logic) and run in SQL, so cost
+    follows the page size rather than the library size.
+
+    Browsing pages by keyset on the last loaded (title, id). Search runs
+    against the full-text index (titles, descriptions, instructions and
+    ingredient names) and pages by offset to keep its relevance order.
+    One extra row is requested to tell whether another page exists.
+
+    Returns:
+        tuple[list[dict], bool]: (up to RECIPES_PER_PAGE summary rows,
+                                 whether more recipes remain)
     """
-    result = recipes
-
     if search_query.strip():
-        q = search_query.strip().lower()
-        result = [r for r in result if q in r["title"].lower()]
-
-    if filter_cuisines:
-        result = [r for r in result if r.get("cuisine") in filter_cuisines]
+        rows = search_recipes(
+            search_query,
+            limit    = RECIPES_PER_PAGE + 1,
+            offset   = len(loaded),
+            cuisines = filter_cuisines,
+            tags     = filter_tags,
+        )
+    else:
+        last = loaded[-1] if loaded else None
+        rows = list_recipes(
+            projection = "summary",
+            after      = (last["title"], last["id"]) if last else None,
+            limit      = RECIPES_PER_PAGE + 1,
+            cuisines   = filter_cuisines,
+            tags       = filter_tags,
+        )
+    return rows[:RECIPES_PER_PAGE], len(rows) > RECIPES_PER_PAGE
 
-    if filter_tags:
-        result = [
-            r for r in result
-            if any(tag in parse_tags(r.get("tags", "")) for tag in filter_tags)
-        ]
 
-    return result
+def count_matches(
+    search_query:    str,
+    filter_cuisines: list[str],
+    filter_tags:     list[str],
+) -> int:
+    """Return how many recipes match the search and filters in total."""
+    if search_query.strip():
+        return count_search_results(search_query, filter_cuisines, filter_tags)
+    return count_recipes(filter_cuisines, filter_tags)
 
 
 def render_instructions(instructions_raw: str | None) -> None:
@@ -324,7 +358,7 @@ def render_instructions(instructions_raw: str | None) -> None:
 # Load data
 # ---------------------------------------------------------------------------
 
-all_recipes = get_all_recipes()
+total_recipes = count_recipes()
 
 
 # ---------------------------------------------------------------------------
@@ -344,7 +378,7 @@ st.markdown(
 # Empty state
 # ---------------------------------------------------------------------------
 
-if not all_recipes:
+if not total_recipes:
     st.markdown("<br>", unsafe_allow_html=True)
     with st.container(border=True):
         st.markdown(
@@ -363,19 +397,25 @@ if not all_recipes:
 # Sidebar filters
 # ---------------------------------------------------------------------------
 
+facets         = get_recipe_facets()
+cuisine_counts = dict(facets["cuisines"])
+tag_counts     = dict(facets["tags"])
+
 with st.sidebar:
     st.markdown("### 🔍 Filter Recipes")
 
     filter_cuisines = st.multiselect(
-        label   = "Cuisine",
-        options = get_unique_cuisines(all_recipes),
-        help    = "Show only recipes from selected cuisines.",
+        label       = "Cuisine",
+        options     = list(cuisine_counts),
+        format_func = format_facet_option(cuisine_counts),
+        help        = "Show only recipes from selected cuisines.",
     )
 
     filter_tags = st.multiselect(
-        label   = "Tags",
-        options = get_unique_tags(all_recipes),
-        help    = "Show recipes that match any of these tags.",
+        label       = "Tags",
+        options     = list(tag_counts),
+        format_func = format_facet_option(tag_counts),
+        help        = "Show recipes that match any of these tags.",
     )
 
     st.divider()
@@ -388,7 +428,7 @@ with st.sidebar:
 
 search_query = st.text_input(
     label            = "",
-    placeholder      = "🔎  Search recipes by name…",
+    placeholder      = "🔎  Search recipes by name, ingredient, or method…",
     label_visibility = "collapsed",
 )
 
@@ -396,19 +436,40 @@ search_query = st.text_input(
 # Apply filters
 # ---------------------------------------------------------------------------
 
-filtered_recipes = apply_filters(all_recipes, search_query, filter_cuisines, filter_tags)
+# Loaded pages live in session state and are refetched from the first
+# page only when the filters change or the library is edited.
+view_key = (
+    search_query.strip(),
+    tuple(filter_cuisines),
+    tuple(filter_tags),
+    get_library_revision(),
+)
+library_view = st.session_state.get("library_view")
+
+if library_view is None or library_view["key"] != view_key:
+    # Summary rows only — instructions are fetched later for visible cards
+    first_page, has_more = fetch_recipe_page(search_query, filter_cuisines, filter_tags, [])
+    library_view = {
+        "key":      view_key,
+        "recipes":  first_page,
+        "has_more": has_more,
+        "total":    count_matches(search_query, filter_cuisines, filter_tags),
+    }
+    st.session_state.library_view = library_view
+
+visible_recipes = library_view["recipes"]
 
 # Result count summary
 active_filters = bool(search_query.strip() or filter_cuisines or filter_tags)
 count_label    = "filtered" if active_filters else "total"
 st.markdown(
-    f'<p class="result-count">Showing <strong>{len(filtered_recipes)}</strong> '
-    f'{count_label} recipes</p>',
+    f'<p class="result-count">Showing <strong>{len(visible_recipes)}</strong> of '
+    f'<strong>{library_view["total"]}</strong> {count_label} recipes</p>',
     unsafe_allow_html=True,
 )
 
 # No results from search/filter
-if not filtered_recipes:
+if not visible_recipes:
     st.warning("No recipes match your search or filters. Try adjusting them.", icon="🔍")
     st.stop()
 
@@ -417,13 +478,14 @@ if not filtered_recipes:
 # Recipe card renderer
 # ---------------------------------------------------------------------------
 
-def render_recipe_card(recipe: dict) -> None:
+def render_recipe_card(recipe: dict, ingredients: list[dict]) -> None:
     """
     Render a full recipe card with title, metadata, description,
     tags, expandable ingredient + instruction detail, and edit/delete actions.
 
     Args:
-        recipe: Dict of recipe fields from the database.
+        recipe:      Dict of recipe fields from the database.
+        ingredients: The recipe's ingredient rows, fetched in bulk by the caller.
     """
     with st.container(border=True):
 
@@ -466,8 +528,6 @@ def render_recipe_card(recipe: dict) -> None:
                 unsafe_allow_html=True,
             )
 
-            ingredients = get_ingredients_by_recipe_id(recipe["id"])
-
             if ingredients:
                 for ing in ingredients:
                     qty_str  = format_quantity(ing.get("quantity"))
@@ -526,7 +586,7 @@ def render_recipe_card(recipe: dict) -> None:
                 y_col, n_col = st.columns(2)
                 with y_col:
                     if st.button("✅", key=f"yes_{recipe_id}", use_container_width=True):
-                        delete_recipe(recipe_id)
+                        submit_write(delete_recipe, recipe_id).result()
                         st.session_state.pop(confirm_key, None)
                         st.toast(f"'{recipe['title']}' deleted.", icon="🗑️")
                         st.rerun()
@@ -544,10 +604,30 @@ def render_recipe_card(recipe: dict) -> None:
 # 2-column responsive card grid
 # ---------------------------------------------------------------------------
 
+visible_ids = [r["id"] for r in visible_recipes]
+
+# Fetch ingredients and instructions for the visible cards only, in bulk
+ingredients_by_recipe  = get_ingredients_for_recipes(visible_ids)
+instructions_by_recipe = get_recipe_instructions(visible_ids)
+
 left_col, right_col = st.columns(2, gap="medium")
 
 # Interleave recipes across two columns for balanced heights
-for i, recipe in enumerate(filtered_recipes):
+for i, recipe in enumerate(visible_recipes):
     target_col = left_col if i % 2 == 0 else right_col
     with target_col:
-        render_recipe_card(recipe)
+        render_recipe_card(
+            {**recipe, "instructions": instructions_by_recipe.get(recipe["id"], "")},
+            ingredients_by_recipe[recipe["id"]],
+        )
+
+if library_view["has_more"]:
+    _, more_col, _ = st.columns([2, 1, 2])
+    with more_col:
+        if st.button("⬇️ Show more", use_container_width=True):
+            next_page, has_more = fetch_recipe_page(
+                search_query, filter_cuisines, filter_tags, visible_recipes,
+            )
+            library_view["recipes"]  = visible_recipes + next_page
+            library_view["has_more"] = has_more
+            st.rerun()
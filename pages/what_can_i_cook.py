@@ -4,9 +4,20 @@ inject_global_styles()
 import streamlit as st
 
 from database import (
-    get_all_recipes,
-    get_ingredients_by_recipe_id,
+    count_recipes,
+    ensure_schema,
+    get_library_revision,
 )
+from ingredient_index import (
+    DEFAULT_MATCH_BACKEND,
+    IncrementalMatcher,
+    IngredientIndex,
+    build_ingredient_index,
+)
+from ingredient_names import canonical_ingredient_name
+
+# Pages can be opened directly, before app.py has bootstrapped the database
+ensure_schema()
 
 
 # ---------------------------------------------------------------------------
@@ -152,6 +163,14 @@ div[data-testid="stVerticalBlockBorderWrapper"]:hover {
 """, unsafe_allow_html=True)
 
 
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+# Partial matches shown under "Almost There", best first.
+PARTIAL_MATCH_LIMIT = 20
+
+
 # ---------------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------------
@@ -161,74 +180,27 @@ def parse_user_ingredients(raw: str) -> set[str]:
     Parse a free-text ingredient list into a normalized set.
 
     Accepts comma-separated or newline-separated input.
-    Normalizes: lowercase, stripped whitespace, no empties, deduplicated.
+    Normalizes with the same rules as the ingredient catalog (case,
+    whitespace, plurals, aliases), drops empties and deduplicates.
     """
     unified = raw.replace("\n", ",")
-    return {p.strip().lower() for p in unified.split(",") if p.strip()}
-
-
-def get_recipe_ingredient_names(recipe_id: int) -> set[str]:
-    """Fetch and normalize all ingredient names for a recipe."""
-    ings = get_ingredients_by_recipe_id(recipe_id)
     return {
-        ing["name"].strip().lower()
-        for ing in ings
-        if (ing.get("name") or "").strip()
+        canonical
+        for p in unified.split(",")
+        if (canonical := canonical_ingredient_name(p))
     }
 
 
-def match_recipes(
-    user_ingredients: set[str],
-    all_recipes: list[dict],
-) -> tuple[list[dict], list[dict]]:
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_ingredient_index(library_revision: int) -> IngredientIndex:
     """
-    Compare user's ingredients against every recipe.
+    Build the ingredient → recipe index once per library revision.
 
-    For each recipe:
-      - Compute intersection (matched) and difference (missing).
-      - Classify as full match (nothing missing) or partial match.
-      - Partial matches sorted descending by match percentage.
-
-    Returns:
-        (full_matches, partial_matches) — each a list of result dicts.
+    library_revision is part of the cache key only: it changes whenever a
+    recipe or ingredient changes, so the index is rebuilt once per edit
+    and shared read-only by every session in between.
     """
-    full_matches:    list[dict] = []
-    partial_matches: list[dict] = []
-
-    for recipe in all_recipes:
-        recipe_ings = get_recipe_ingredient_names(recipe["id"])
-
-        # Skip recipes with no ingredients — can't meaningfully score them
-        if not recipe_ings:
-            continue
-
-        matched   = user_ingredients & recipe_ings          # set intersection
-        missing   = recipe_ings - user_ingredients          # what user lacks
-        total     = len(recipe_ings)
-        match_pct = round(len(matched) / total * 100, 1)
-
-        result = {
-            "id":        recipe["id"],
-            "title":     recipe["title"],
-            "cuisine":   recipe.get("cuisine", ""),
-            "cook_time": recipe.get("cook_time"),
-            "servings":  recipe.get("servings"),
-            "total":     total,
-            "matched":   len(matched),
-            "missing":   sorted(missing),
-            "match_pct": match_pct,
-        }
-
-        if not missing:
-            full_matches.append(result)
-        elif matched:
-            # Only include partials where the user has at least one ingredient
-            partial_matches.append(result)
-
-    # Best partial matches first
-    partial_matches.sort(key=lambda r: r["match_pct"], reverse=True)
-
-    return full_matches, partial_matches
+    return build_ingredient_index()
 
 
 def render_missing_chips(missing: list[str]) -> str:
@@ -263,9 +235,7 @@ st.markdown(
 # Load all recipes — early empty state
 # ---------------------------------------------------------------------------
 
-all_recipes = get_all_recipes()
-
-if not all_recipes:
+if not count_recipes():
     st.markdown("<br>", unsafe_allow_html=True)
     with st.container(border=True):
         st.markdown(
@@ -313,6 +283,12 @@ with st.container(border=True):
         else:
             st.caption("Start typing to see your ingredient count.")
 
+        fuzzy_enabled = st.toggle(
+            "Fuzzy matching",
+            value = True,
+            help  = "Also match similar names — 'chicken' finds 'chicken breast', typos still match.",
+        )
+
     with col_btn:
         search_clicked = st.button(
             "🔍 Find Recipes",
@@ -340,9 +316,34 @@ if not user_ingredients:
 # Run matching algorithm
 # ---------------------------------------------------------------------------
 
-full_matches, partial_matches = match_recipes(user_ingredients, all_recipes)
+ingredient_index = load_ingredient_index(get_library_revision())
 
-total_matched = len(full_matches) + len(partial_matches)
+# Fuzzy matching widens the pantry with similar recipe ingredient names
+pantry = ingredient_index.expand_pantry(user_ingredients) if fuzzy_enabled else user_ingredients
+fuzzy_extras = sorted(pantry - user_ingredients)
+
+if DEFAULT_MATCH_BACKEND == "numpy":
+    # RECIPES_MATCH_BACKEND=numpy: rescore the whole pantry on every rerun
+    # with one vectorized pass instead of keeping incremental counts.
+    full_matches, partial_matches, partial_total = ingredient_index.match(
+        pantry, limit=PARTIAL_MATCH_LIMIT,
+    )
+else:
+    # Keep one matcher per session; each edit to the text area only applies
+    # the postings of the ingredients that were added or removed. Start over
+    # when the library (and so the index) has changed.
+    matcher = st.session_state.get("pantry_matcher")
+    if matcher is None or matcher.index is not ingredient_index:
+        matcher = IncrementalMatcher(ingredient_index)
+        st.session_state.pantry_matcher = matcher
+
+    matcher.update(pantry)
+    full_matches, partial_matches, partial_total = matcher.results(limit=PARTIAL_MATCH_LIMIT)
+
+total_matched = len(full_matches) + partial_total
+
+if fuzzy_extras:
+    st.caption(f"🔎 Also matching similar ingredients: {', '.join(fuzzy_extras)}")
 
 st.markdown("<div style='margin-top:1.2rem;'></div>", unsafe_allow_html=True)
 
@@ -364,7 +365,7 @@ with s1:
 with s2:
     with st.container(border=True):
         st.markdown(
-            f'<div class="summary-num" style="color:#D4A017;">{len(partial_matches)}</div>'
+            f'<div class="summary-num" style="color:#D4A017;">{partial_total}</div>'
             f'<div class="summary-label">recipes almost there</div>',
             unsafe_allow_html=True,
         )
@@ -372,7 +373,7 @@ with s2:
 with s3:
     with st.container(border=True):
         st.markdown(
-            f'<div class="summary-num">{len(all_recipes)}</div>'
+            f'<div class="summary-num">{len(ingredient_index)}</div>'
             f'<div class="summary-label">total recipes checked</div>',
             unsafe_allow_html=True,
         )
@@ -468,9 +469,14 @@ st.markdown(
 )
 
 if partial_matches:
+    shown_note = (
+        f" Showing the top {len(partial_matches)}."
+        if partial_total > len(partial_matches) else ""
+    )
     st.markdown(
         f'<p style="color:#A0897E; font-size:0.87rem; margin-bottom:0.8rem;">'
-        f"{len(partial_matches)} recipe(s) need just a few more ingredients — sorted by best match."
+        f"{partial_total} recipe(s) need just a few more ingredients — sorted by best match."
+        f"{shown_note}"
         f"</p>",
         unsafe_allow_html=True,
     )
@@ -545,9 +551,9 @@ if total_matched == 0:
     st.caption("💡 Tip: Add more recipes to your library to get better results.")
 else:
     st.caption(
-        f"Checked {len(all_recipes)} recipes · "
+        f"Checked {len(ingredient_index)} recipes · "
         f"{len(full_matches)} full match(es) · "
-        f"{len(partial_matches)} partial match(es)."
+        f"{partial_total} partial match(es)."
     )
 
 st.page_link("pages/add_recipe.py", label="➕ Add More Recipes")
@@ -1,7 +1,12 @@
 import sqlite3
 
+from database import get_or_create_catalog_ids, replace_recipe_tags
+
 DB_NAME = "recipes.db"
 
+# Bump whenever ALL_RECIPES changes so app bootstrap re-runs the seeder.
+SEED_VERSION = 1
+
 
 # ---------------------------------------------------------------------------
 # Database connection
@@ -51,17 +56,20 @@ def insert_recipe_with_ingredients(conn: sqlite3.Connection, recipe: dict) -> No
     ))
 
     recipe_id = cursor.lastrowid
+    replace_recipe_tags(conn, recipe_id, recipe["tags"])
 
     ingredient_sql = """
-        INSERT INTO ingredients (recipe_id, name, quantity, unit)
-        VALUES (?, ?, ?, ?)
+        INSERT INTO ingredients (recipe_id, name, quantity, unit, catalog_id)
+        VALUES (?, ?, ?, ?, ?)
     """
+    catalog_ids = get_or_create_catalog_ids(conn, [ing["name"] for ing in recipe["ingredients"]])
     for ing in recipe["ingredients"]:
         conn.execute(ingredient_sql, (
             recipe_id,
             ing["name"],
             ing["quantity"],
             ing["unit"],
+            catalog_ids[ing["name"]],
         ))
 
 
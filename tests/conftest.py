@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Point the app at a fresh, fully migrated database in tmp_path."""
+    monkeypatch.setattr(database, "DB_NAME", str(tmp_path / "recipes.db"))
+    database.close_all_connections()
+    database.create_tables()
+    yield database
+    database.close_all_connections()
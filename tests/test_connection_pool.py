@@ -0,0 +1,44 @@
+import threading
+import time
+
+import database
+
+
+def test_waiter_reclaims_connections_of_threads_that_exit(db, monkeypatch):
+    monkeypatch.setattr(database, "POOL_TIMEOUT", 2.0)
+    database.release_connection()
+
+    acquired = threading.Barrier(database.POOL_SIZE + 1)
+    finish   = threading.Event()
+
+    def hold() -> None:
+        database.get_connection()
+        acquired.wait()
+        finish.wait()
+
+    holders = [threading.Thread(target=hold) for _ in range(database.POOL_SIZE)]
+    for thread in holders:
+        thread.start()
+    acquired.wait()
+
+    # The waiter finds every slot owned by a live thread and starts waiting.
+    # The owners then exit without releasing, so nothing ever notifies it.
+    result: dict = {}
+
+    def wait_for_connection() -> None:
+        try:
+            result["row"] = database.get_connection().execute("SELECT 1").fetchone()[0]
+        except Exception as exc:  # pragma: no cover - reported below
+            result["error"] = exc
+
+    waiter = threading.Thread(target=wait_for_connection)
+    started = time.monotonic()
+    waiter.start()
+    time.sleep(0.2)
+    finish.set()
+    for thread in holders:
+        thread.join()
+    waiter.join()
+
+    assert result == {"row": 1}
+    assert time.monotonic() - started < database.POOL_TIMEOUT
@@ -0,0 +1,58 @@
+import pytest
+
+from grocery_categories import CATEGORY_KEYWORDS, _build_keyword_index, categorize_ingredient
+from ingredient_names import canonical_ingredient_name
+
+PRODUCE = "🥦 Produce"
+PROTEIN = "🍗 Meat & Protein"
+DAIRY   = "🥛 Dairy"
+PANTRY  = "🌾 Grains & Pantry"
+OTHER   = "🧂 Other"
+
+
+@pytest.mark.parametrize("name, category", [
+    ("pepper",           PANTRY),
+    ("black pepper",     PANTRY),
+    ("bell pepper",      PRODUCE),
+    ("green pepper",     PRODUCE),
+    ("red pepper",       PRODUCE),
+    ("coriander",        PRODUCE),
+    ("coriander powder", PANTRY),
+    ("garlic",           PRODUCE),
+    ("garlic clove",     PRODUCE),
+    ("garlic powder",    PANTRY),
+    ("onion powder",     PANTRY),
+    ("tomato",           PRODUCE),
+    ("tomato sauce",     PANTRY),
+    ("tomato puree",     PANTRY),
+    ("chilli",           PRODUCE),
+    ("chilli powder",    PANTRY),
+    ("chilli flake",     PANTRY),
+    ("chicken breast",   PROTEIN),
+    ("chicken stock",    PANTRY),
+    ("condensed milk",   DAIRY),
+    ("soy sauce",        PANTRY),
+    ("breadcrumbs",      PANTRY),
+    ("pineapple",        PRODUCE),
+    ("chickpea",         PANTRY),
+    ("peas",             PRODUCE),
+    ("lemon thyme",      PANTRY),
+    ("kitchen roll",     OTHER),
+])
+def test_categorize_ingredient(name, category):
+    assert categorize_ingredient(name) == category
+
+
+@pytest.mark.parametrize("category, keyword", [
+    (category, keyword)
+    for category, keywords in CATEGORY_KEYWORDS.items()
+    for keyword in keywords
+])
+def test_keywords_keep_their_category_once_canonicalized(category, keyword):
+    # Grocery rows carry canonical names, so that is what the matcher sees.
+    assert categorize_ingredient(canonical_ingredient_name(keyword)) == category
+
+
+def test_keyword_in_two_categories_is_rejected():
+    with pytest.raises(ValueError):
+        _build_keyword_index({**CATEGORY_KEYWORDS, "🧂 Other": ["pepper"]})
@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+import database
+
+AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+
+APP = str(Path(__file__).resolve().parent.parent / "app.py")
+
+
+@pytest.fixture
+def planned_week(db):
+    recipe_id = database.save_recipe_with_ingredients(
+        {"title": "Tomato Soup", "cook_time": 20, "servings": 2},
+        [
+            {"name": "tomato", "quantity": 4,   "unit": "pieces"},
+            {"name": "onion",  "quantity": 1,   "unit": "pieces"},
+            {"name": "cream",  "quantity": 100, "unit": "ml"},
+        ],
+    )
+    monday = date.today() - timedelta(days=date.today().weekday())
+    database.save_meal_plan(monday.isoformat(), "Monday", "Dinner", recipe_id)
+    return monday
+
+
+@pytest.fixture
+def connection_calls(monkeypatch):
+    calls = []
+    real  = database.get_connection
+
+    def counting_get_connection():
+        calls.append(1)
+        return real()
+
+    monkeypatch.setattr(database, "get_connection", counting_get_connection)
+    return calls
+
+
+def test_ticking_a_box_does_not_touch_the_database(planned_week, connection_calls):
+    at = AppTest.from_file(APP)
+    at.switch_page("pages/grocery_list.py").run()
+    assert not at.exception
+    assert len(at.checkbox) == 3
+
+    connection_calls.clear()
+    at.checkbox[0].check().run()
+
+    assert not at.exception
+    assert at.checkbox[0].value is True
+    assert connection_calls == []
+
+
+def test_sync_saves_ticks_and_pulls_in_other_devices(planned_week):
+    period = f"{planned_week.isoformat()}/{(planned_week + timedelta(days=6)).isoformat()}"
+    at = AppTest.from_file(APP)
+    at.switch_page("pages/grocery_list.py").run()
+
+    at.checkbox(key="chk_tomato_pieces").check().run()
+    assert database.get_grocery_checks(period) == []
+
+    # A second phone ticks the onion; the next timed rerun syncs both ways.
+    database.save_grocery_checks(period, {("onion", "pieces"): True})
+    at.run()
+
+    saved = {(row["item"], row["unit"]): row["checked"] for row in database.get_grocery_checks(period)}
+    assert saved == {("tomato", "pieces"): True, ("onion", "pieces"): True}
+    assert at.checkbox(key="chk_onion_pieces").value is True
+    assert at.checkbox(key="chk_tomato_pieces").value is True
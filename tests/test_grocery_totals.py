@@ -0,0 +1,83 @@
+import pytest
+
+import database
+
+WEEK_1 = "2024-03-04"   # Monday
+WEEK_2 = "2024-03-11"
+
+
+def recipe(title: str, ingredients: list[tuple[str, float, str]]) -> int:
+    return database.save_recipe_with_ingredients(
+        {"title": title, "cook_time": 10, "servings": 2},
+        [{"name": name, "quantity": qty, "unit": unit} for name, qty, unit in ingredients],
+    )
+
+
+def totals(rows: list[dict]) -> dict[tuple[str, str], float]:
+    return {(row["name"], row["unit"]): row["quantity"] for row in rows}
+
+
+@pytest.fixture
+def planned(db):
+    omelette = recipe("Omelette", [("egg", 2, "pcs"), ("milk", 50, "ml")])
+    pancakes = recipe("Pancakes", [("flour", 100, "g"), ("egg", 1, "pcs")])
+    slots = [
+        ("2024-02-26", "Sunday",    "Dinner",    pancakes),   # 2024-03-03, before the range
+        (WEEK_1,       "Monday",    "Breakfast", omelette),   # 2024-03-04, before the range
+        (WEEK_1,       "Thursday",  "Breakfast", omelette),   # 2024-03-07
+        (WEEK_1,       "Thursday",  "Dinner",    omelette),   # 2024-03-07, same recipe again
+        (WEEK_1,       "Sunday",    "Lunch",     pancakes),   # 2024-03-10
+        (WEEK_2,       "Monday",    "Breakfast", pancakes),   # 2024-03-11
+        (WEEK_2,       "Wednesday", "Dinner",    omelette),   # 2024-03-13
+        (WEEK_2,       "Thursday",  "Lunch",     pancakes),   # 2024-03-14, after the range
+    ]
+    for week_start, day, meal_type, recipe_id in slots:
+        database.save_meal_plan(week_start, day, meal_type, recipe_id)
+    return database
+
+
+def test_thursday_to_wednesday_spans_two_week_starts(planned):
+    rows = database.get_grocery_totals_for_range("2024-03-07", "2024-03-13")
+    # Omelette x3 (Thu twice, Wed), pancakes x2 (Sun, Mon)
+    assert totals(rows) == {
+        ("egg",   "pcs"): 3 * 2 + 2 * 1,
+        ("flour", "g"):   2 * 100,
+        ("milk",  "ml"):  3 * 50,
+    }
+    assert [(row["name"], row["unit"]) for row in rows] == sorted(totals(rows))
+
+
+def test_single_day_counts_a_recipe_once_per_slot(planned):
+    rows = database.get_grocery_totals_for_range("2024-03-07", "2024-03-07")
+    assert totals(rows) == {("egg", "pcs"): 4, ("milk", "ml"): 100}
+
+
+def test_single_day_on_a_week_start(planned):
+    rows = database.get_grocery_totals_for_range(WEEK_2, WEEK_2)
+    assert totals(rows) == {("egg", "pcs"): 1, ("flour", "g"): 100}
+
+
+def test_day_with_nothing_planned_is_empty(planned):
+    assert database.get_grocery_totals_for_range("2024-03-05", "2024-03-06") == []
+
+
+def test_week_totals_cover_monday_to_sunday(planned):
+    # Omelette x3 (Mon, Thu twice), pancakes x1 (Sun)
+    assert totals(database.get_grocery_totals(WEEK_1)) == {
+        ("egg",   "pcs"): 3 * 2 + 1,
+        ("flour", "g"):   100,
+        ("milk",  "ml"):  3 * 50,
+    }
+
+
+def test_week_totals_match_the_equivalent_range(planned):
+    assert database.get_grocery_totals(WEEK_2) == \
+           database.get_grocery_totals_for_range(WEEK_2, "2024-03-17")
+
+
+def test_names_are_merged_by_canonical_name_and_blank_units_become_unit(db):
+    first  = recipe("First",  [("Eggs", 2, ""), ("  ", 1, "g")])
+    second = recipe("Second", [("egg", 1, "")])
+    database.save_meal_plan(WEEK_1, "Tuesday", "Lunch",  first)
+    database.save_meal_plan(WEEK_1, "Tuesday", "Dinner", second)
+    assert totals(database.get_grocery_totals(WEEK_1)) == {("egg", "unit"): 3}
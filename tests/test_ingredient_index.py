@@ -0,0 +1,73 @@
+import pytest
+
+from ingredient_index import FUZZY_EXCLUDED_NAMES, IngredientIndex
+
+VOCABULARY = [
+    "milk", "coconut milk", "condensed milk",
+    "rice", "rice vinegar", "cooked rice",
+    "garlic", "garlic powder",
+    "tomato", "tomato ketchup", "tomato puree", "cherry tomato",
+    "chicken", "chicken breast", "chicken thigh", "chickpea",
+    "pepper", "bell pepper", "black pepper",
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    recipes     = [{"id": i, "title": name, "cook_time": 10} for i, name in enumerate(VOCABULARY)]
+    ingredients = [(i, [{"canonical_name": name}]) for i, name in enumerate(VOCABULARY)]
+    return IngredientIndex(recipes, ingredients)
+
+
+def lookup(index, term):
+    return [name for name, _ in index.fuzzy_lookup(term)]
+
+
+@pytest.mark.parametrize("term, expected", [
+    ("chicken", ["chicken", "chicken breast", "chicken thigh"]),
+    ("rice",    ["rice", "cooked rice"]),
+    ("pepper",  ["pepper", "black pepper"]),
+    ("tomato",  ["tomato", "cherry tomato"]),
+])
+def test_names_containing_every_term_word_match(index, term, expected):
+    names = lookup(index, term)
+    assert names[0] == term
+    assert sorted(names) == sorted(expected)
+
+
+@pytest.mark.parametrize("term, product", [
+    ("milk",    "coconut milk"),
+    ("milk",    "condensed milk"),
+    ("rice",    "rice vinegar"),
+    ("garlic",  "garlic powder"),
+    ("pepper",  "bell pepper"),
+    ("tomato",  "tomato ketchup"),
+    ("chicken", "chickpea"),
+])
+def test_excluded_products_and_lookalikes_do_not_match(index, term, product):
+    assert product not in lookup(index, term)
+
+
+def test_exclusions_are_an_explicit_list():
+    for product in ("coconut milk", "rice vinegar", "garlic powder", "bell pepper"):
+        assert product in FUZZY_EXCLUDED_NAMES
+
+
+@pytest.mark.parametrize("typo, expected", [
+    ("tomatoe", "tomato"),
+    ("chiken",  "chicken"),
+    ("garlik",  "garlic"),
+])
+def test_typos_match_the_intended_name_first(index, typo, expected):
+    assert lookup(index, typo)[0] == expected
+
+
+def test_typo_matches_rank_above_word_matches(index):
+    assert lookup(index, "chicken")[0] == "chicken"
+    assert lookup(index, "cherry tomatoe") == ["cherry tomato"]
+
+
+def test_expand_pantry_keeps_terms_and_adds_matches(index):
+    assert index.expand_pantry({"tomatoe", "milk", "chicken"}) == {
+        "tomatoe", "tomato", "milk", "chicken", "chicken breast", "chicken thigh",
+    }
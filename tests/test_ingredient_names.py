@@ -0,0 +1,40 @@
+import pytest
+
+from ingredient_names import canonical_ingredient_name, singularize
+
+
+@pytest.mark.parametrize("plural, singular", [
+    ("radishes",  "radish"),
+    ("peaches",   "peach"),
+    ("glasses",   "glass"),
+    ("boxes",     "box"),
+    ("squashes",  "squash"),
+    ("quiches",   "quiche"),
+    ("tomatoes",  "tomato"),
+    ("berries",   "berry"),
+    ("cookies",   "cookie"),
+    ("brownies",  "brownie"),
+    ("pies",      "pie"),
+    ("leaves",    "leaf"),
+    ("cheeses",   "cheese"),
+    ("glazes",    "glaze"),
+    ("limes",     "lime"),
+    ("hummus",    "hummus"),
+    ("molasses",  "molasses"),
+    ("asparagus", "asparagus"),
+    ("egg",       "egg"),
+])
+def test_singularize(plural, singular):
+    assert singularize(plural) == singular
+
+
+@pytest.mark.parametrize("raw, canonical", [
+    ("  Cherry  Tomatoes", "cherry tomato"),
+    ("Radishes",           "radish"),
+    ("Chocolate Cookies",  "chocolate cookie"),
+    ("Green Onions",       "spring onion"),
+    ("Cilantro",           "coriander"),
+    ("   ",                ""),
+])
+def test_canonical_ingredient_name(raw, canonical):
+    assert canonical_ingredient_name(raw) == canonical
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from ingredient_index import IngredientIndex
+
+np = pytest.importorskip("numpy")
+
+SEED = 20240
+
+
+def random_index(rng: random.Random, n_recipes: int = 400, n_ingredients: int = 80) -> tuple[IngredientIndex, list[str]]:
+    vocabulary  = [f"ingredient {i}" for i in range(n_ingredients)]
+    recipes     = [
+        {"id": rid, "title": f"Recipe {rid}", "cook_time": rng.choice([None, 10, 20, 30, 45])}
+        for rid in rng.sample(range(1, 10 * n_recipes), n_recipes)
+    ]
+    ingredients = [
+        (r["id"], [{"canonical_name": name} for name in rng.sample(vocabulary, rng.randint(1, 8))])
+        for r in recipes
+    ]
+    return IngredientIndex(recipes, ingredients), vocabulary
+
+
+def random_pantries(rng: random.Random, vocabulary: list[str], count: int) -> list[set[str]]:
+    pantries = [set(rng.sample(vocabulary, rng.randint(0, 25))) for _ in range(count)]
+    pantries.append({"not in any recipe"})
+    return pantries
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    rng = random.Random(SEED)
+    index, vocabulary = random_index(rng)
+    return index, random_pantries(rng, vocabulary, 60)
+
+
+@pytest.mark.parametrize("limit", [None, 0, 1, 5, 20])
+def test_numpy_and_python_backends_agree(seeded, limit):
+    index, pantries = seeded
+    for pantry in pantries:
+        assert index.match(pantry, backend="numpy", limit=limit) == \
+               index.match(pantry, backend="python", limit=limit)
+
+
+def test_score_arrays_agree_with_python_counts(seeded):
+    index, pantries = seeded
+    for pantry in pantries:
+        scores = index.score_arrays(pantry)
+        hits   = np.flatnonzero(scores["matched"])
+        assert dict(zip(scores["recipe_ids"][hits].tolist(), scores["matched"][hits].tolist())) == \
+               index.match_counts(pantry, backend="python")
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 60, 61, 64, 100])
+@pytest.mark.parametrize("limit", [None, 5])
+def test_match_many_equals_match_across_batch_boundaries(seeded, batch_size, limit):
+    index, pantries = seeded
+    expected = [index.match(pantry, backend="python", limit=limit) for pantry in pantries]
+    streamed = index.match_many(iter(pantries), backend="numpy", limit=limit, batch_size=batch_size)
+    assert list(streamed) == expected
+
+
+def test_match_many_consumes_pantries_one_batch_at_a_time(seeded):
+    index, pantries = seeded
+    pulled = []
+
+    def source():
+        for pantry in pantries:
+            pulled.append(pantry)
+            yield pantry
+
+    results = index.match_many(source(), backend="numpy", batch_size=7)
+    next(results)
+    assert len(pulled) == 7
@@ -0,0 +1,263 @@
+import sqlite3
+
+import pytest
+
+import database
+from migrations import LATEST_VERSION, MIGRATIONS, get_schema_version, migrate
+
+
+def migrate_to(conn: sqlite3.Connection, target: int) -> None:
+    """Apply the shipped steps up to and including `target`."""
+    for version, step in MIGRATIONS:
+        if version > target:
+            break
+        conn.execute("BEGIN")
+        step(conn)
+        conn.execute(f"PRAGMA user_version = {version}")
+        conn.commit()
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "recipes.db")
+    yield conn
+    conn.close()
+
+
+def test_catalog_backfill_links_every_ingredient(conn):
+    migrate_to(conn, 6)
+    conn.execute("INSERT INTO recipes (id, title) VALUES (1, 'Salad')")
+    conn.executemany(
+        "INSERT INTO ingredients (recipe_id, name, quantity, unit) VALUES (1, ?, 1, '')",
+        [("Tomatoes",), ("tomato",), (" Cherry  Tomatoes",), ("Scallions",), ("",)],
+    )
+    conn.commit()
+
+    migrate(conn)
+
+    linked = dict(conn.execute("""
+        SELECT i.name, c.name
+        FROM   ingredients i
+        LEFT JOIN ingredient_catalog c ON c.id = i.catalog_id
+    """))
+    assert linked == {
+        "Tomatoes":          "tomato",
+        "tomato":            "tomato",
+        " Cherry  Tomatoes": "cherry tomato",
+        "Scallions":         "spring onion",
+        "":                  None,
+    }
+    assert get_schema_version(conn) == LATEST_VERSION
+
+
+def test_catalog_backfill_merges_es_plurals(conn):
+    migrate_to(conn, 6)
+    conn.execute("INSERT INTO recipes (id, title) VALUES (1, 'Cobbler')")
+    conn.executemany(
+        "INSERT INTO ingredients (recipe_id, name, quantity, unit) VALUES (1, ?, 1, '')",
+        [("Peaches",), ("peach",), ("Radishes",), ("sugar",)],
+    )
+    conn.commit()
+
+    migrate(conn)
+
+    linked = dict(conn.execute("""
+        SELECT i.name, c.name
+        FROM   ingredients i
+        JOIN   ingredient_catalog c ON c.id = i.catalog_id
+    """))
+    assert linked == {"Peaches": "peach", "peach": "peach", "Radishes": "radish", "sugar": "sugar"}
+    assert [row[0] for row in conn.execute("SELECT name FROM ingredient_catalog ORDER BY name")] == [
+        "peach", "radish", "sugar",
+    ]
+
+
+def test_ensure_schema_migrates_a_fresh_database_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_NAME", str(tmp_path / "recipes.db"))
+    database.close_all_connections()
+    calls = []
+    real  = database.create_tables
+    monkeypatch.setattr(database, "create_tables", lambda: calls.append(1) or real())
+
+    database.ensure_schema()
+    database.ensure_schema()
+
+    assert calls == [1]
+    assert get_schema_version(database.get_connection()) == LATEST_VERSION
+    assert database.count_recipes() == 0
+    database.close_all_connections()
+
+
+# The schema create_tables() built before migrations existed: no
+# user_version, no indexes, and (on the oldest installs) no instructions.
+BASELINE_SCHEMA = """
+    CREATE TABLE recipes (
+        id           INTEGER PRIMARY KEY AUTOINCREMENT,
+        title        TEXT    NOT NULL,
+        description  TEXT,
+        cuisine      TEXT,
+        cook_time    INTEGER,
+        servings     INTEGER,
+        tags         TEXT
+    );
+
+    CREATE TABLE ingredients (
+        id          INTEGER PRIMARY KEY AUTOINCREMENT,
+        recipe_id   INTEGER NOT NULL,
+        name        TEXT    NOT NULL,
+        quantity    REAL,
+        unit        TEXT,
+        FOREIGN KEY (recipe_id)
+            REFERENCES recipes (id)
+            ON DELETE CASCADE
+    );
+
+    CREATE TABLE meal_plan (
+        id          INTEGER PRIMARY KEY AUTOINCREMENT,
+        week_start  TEXT    NOT NULL,
+        day         TEXT    NOT NULL,
+        meal_type   TEXT    NOT NULL,
+        recipe_id   INTEGER,
+        FOREIGN KEY (recipe_id)
+            REFERENCES recipes (id)
+    );
+"""
+
+
+@pytest.fixture
+def baseline(conn):
+    conn.executescript(BASELINE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO recipes (id, title, description, cuisine, cook_time, servings, tags) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (1, "Dal Tadka",  "Yellow lentils", "Indian",  30, 4, "vegan, comfort"),
+            (2, "Pesto Pasta", "Basil pesto",   "Italian", 20, 2, "quick"),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO ingredients (recipe_id, name, quantity, unit) VALUES (?, ?, ?, ?)",
+        [
+            (1, "Lentils",  200, "g"),
+            (1, "Tomatoes", 2,   "pieces"),
+            (2, "Basil",    1,   "cup"),
+        ],
+    )
+    # The old save path could leave several rows for one slot; the last wins.
+    conn.executemany(
+        "INSERT INTO meal_plan (id, week_start, day, meal_type, recipe_id) VALUES (?, ?, ?, ?, ?)",
+        [
+            (1, "2024-01-01", "Monday",  "Dinner", 1),
+            (2, "2024-01-01", "Monday",  "Dinner", 2),
+            (3, "2024-01-01", "Tuesday", "Lunch",  1),
+        ],
+    )
+    conn.commit()
+    return conn
+
+
+def test_upgrade_from_baseline_schema(baseline):
+    assert get_schema_version(baseline) == 0
+
+    assert migrate(baseline) == LATEST_VERSION
+    assert get_schema_version(baseline) == LATEST_VERSION
+
+    columns = {row[1] for row in baseline.execute("PRAGMA table_info(recipes)")}
+    assert "instructions" in columns
+
+    assert baseline.execute(
+        "SELECT id, title, cuisine, tags FROM recipes ORDER BY id"
+    ).fetchall() == [
+        (1, "Dal Tadka",   "Indian",  "vegan, comfort"),
+        (2, "Pesto Pasta", "Italian", "quick"),
+    ]
+    assert baseline.execute("""
+        SELECT i.name, i.quantity, i.unit, c.name
+        FROM   ingredients i
+        JOIN   ingredient_catalog c ON c.id = i.catalog_id
+        ORDER  BY i.id
+    """).fetchall() == [
+        ("Lentils",  200, "g",      "lentil"),
+        ("Tomatoes", 2,   "pieces", "tomato"),
+        ("Basil",    1,   "cup",    "basil"),
+    ]
+    assert baseline.execute(
+        "SELECT day, meal_type, recipe_id FROM meal_plan ORDER BY id"
+    ).fetchall() == [
+        ("Monday",  "Dinner", 2),
+        ("Tuesday", "Lunch",  1),
+    ]
+
+    # Derived data is backfilled from the surviving rows.
+    assert baseline.execute(
+        "SELECT rowid FROM recipes_fts WHERE recipes_fts MATCH 'lentils'"
+    ).fetchall() == [(1,)]
+    assert baseline.execute(
+        "SELECT tag, recipe_id FROM recipe_tags ORDER BY tag"
+    ).fetchall() == [("comfort", 1), ("quick", 2), ("vegan", 1)]
+
+
+def test_second_migrate_is_a_no_op(baseline):
+    migrate(baseline)
+    schema  = baseline.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall()
+    changes = baseline.total_changes
+
+    assert migrate(baseline) == LATEST_VERSION
+    assert baseline.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall() == schema
+    assert baseline.total_changes == changes
+
+
+# ---------------------------------------------------------------------------
+# Query plans on a migrated database
+# ---------------------------------------------------------------------------
+
+def query_plans(call) -> list[str]:
+    """Run call() and return the EXPLAIN QUERY PLAN text of each statement it ran."""
+    conn = database.get_connection()
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        conn.set_trace_callback(None)
+
+    plans = []
+    for sql in statements:
+        if sql.lstrip().upper().startswith(("SELECT", "DELETE", "UPDATE")):
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+            plans.append("\n".join(row[3] for row in rows))
+    return plans
+
+
+def test_ingredient_lookup_uses_recipe_id_index(db):
+    plans = query_plans(lambda: database.get_ingredients_by_recipe_id(1))
+    assert plans and all("idx_ingredients_recipe_id" in plan for plan in plans)
+    assert not any("TEMP B-TREE" in plan for plan in plans)
+
+
+@pytest.mark.parametrize("call", [
+    lambda: database.get_meal_plan("2024-01-01"),
+    lambda: database.clear_meal_slot("2024-01-01", "Monday", "Dinner"),
+])
+def test_meal_plan_lookups_use_slot_index(db, call):
+    plans = query_plans(call)
+    assert plans and all("idx_meal_plan_slot" in plan for plan in plans)
+
+
+@pytest.mark.parametrize("call", [
+    lambda: database.list_recipes(limit=20),
+    lambda: database.list_recipes(after=("M", 1), limit=20),
+    database.get_all_recipes,
+])
+def test_title_listings_walk_the_title_index(db, call):
+    plans = query_plans(call)
+    assert plans and all("idx_recipes_title_id" in plan for plan in plans)
+    assert not any("TEMP B-TREE" in plan for plan in plans)
+
+
+def test_case_insensitive_title_lookup_uses_nocase_index(db):
+    conn = database.get_connection()
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM recipes WHERE title = ? COLLATE NOCASE", ("dal",),
+    ).fetchall()
+    assert "idx_recipes_title_nocase" in " ".join(row[3] for row in plan)
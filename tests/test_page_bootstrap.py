@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+
+import database
+
+AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+
+ROOT  = Path(__file__).resolve().parent.parent
+APP   = str(ROOT / "app.py")
+PAGES = sorted(f"pages/{page.name}" for page in (ROOT / "pages").glob("*.py"))
+
+
+@pytest.fixture
+def fresh_database(tmp_path, monkeypatch):
+    """Point the app at an empty file that nothing has migrated yet."""
+    monkeypatch.setattr(database, "DB_NAME", str(tmp_path / "recipes.db"))
+    database.close_all_connections()
+    yield
+    database.close_all_connections()
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_page_opened_directly_creates_the_schema(fresh_database, page):
+    # switch_page() runs only the page script, as when its URL is opened
+    # without visiting the home page first.
+    at = AppTest.from_file(APP)
+    at.switch_page(page).run()
+    assert not at.exception
+    assert database.count_recipes() == 0
@@ -0,0 +1,45 @@
+import database
+
+
+def add_soups(count: int, cuisine: str = "Thai", tags: str = "soup") -> None:
+    for n in range(count):
+        database.add_recipe(f"Soup {n:04d}", "A warming soup", cuisine, 20, 2, tags)
+
+
+def test_keyset_pages_cover_filtered_recipes_once(db):
+    add_soups(45)
+    add_soups(5, cuisine="Italian", tags="pasta")
+
+    seen, after = [], None
+    while True:
+        page = database.list_recipes(after=after, limit=21, cuisines=["Thai"])
+        seen.extend(page[:20])
+        if len(page) <= 20:
+            break
+        after = (page[19]["title"], page[19]["id"])
+
+    assert len(seen) == 45
+    assert len({r["id"] for r in seen}) == 45
+    assert database.count_recipes(cuisines=["Thai"]) == 45
+    assert database.count_recipes(tags=["pasta"]) == 5
+    assert database.count_recipes() == 50
+
+
+def test_search_is_not_capped_and_counts_every_match(db):
+    add_soups(520)
+
+    assert database.count_search_results("soup") == 520
+    tail = database.search_recipes("soup", limit=50, offset=500)
+    assert len(tail) == 20
+    assert database.count_search_results("soup", cuisines=["Italian"]) == 0
+    assert database.count_search_results("!!!") == 0
+
+
+def test_search_pages_are_stable_when_rank_and_title_tie(db):
+    ids = [database.add_recipe("Soup", "A warming soup", "Thai", 20, 2, "soup") for _ in range(60)]
+
+    seen = []
+    for offset in range(0, 60, 7):
+        seen.extend(r["id"] for r in database.search_recipes("soup", limit=7, offset=offset))
+
+    assert seen == sorted(ids)
@@ -0,0 +1,122 @@
+import pytest
+
+import database
+
+RECIPE = {
+    "title":        "Tomato Soup",
+    "description":  "Weeknight soup",
+    "cuisine":      "Italian",
+    "cook_time":    30,
+    "servings":     4,
+    "tags":         "soup, quick",
+    "instructions": "Simmer.",
+}
+
+INGREDIENTS = [
+    {"name": "tomato",    "quantity": 6.0,   "unit": "pcs"},
+    {"name": "onion",     "quantity": 1.0,   "unit": "pcs"},
+    {"name": "olive oil", "quantity": 2.0,   "unit": "tbsp"},
+    {"name": "stock",     "quantity": 500.0, "unit": "ml"},
+]
+
+
+def stored_rows(recipe_id: int) -> list[tuple]:
+    rows = database.get_connection().execute(
+        "SELECT id, name, quantity, unit FROM ingredients WHERE recipe_id = ? ORDER BY id",
+        (recipe_id,),
+    ).fetchall()
+    return [tuple(row) for row in rows]
+
+
+def snapshot() -> dict:
+    conn = database.get_connection()
+    return {
+        table: [tuple(row) for row in conn.execute(f"SELECT * FROM {table} ORDER BY 1")]
+        for table in ("recipes", "ingredients", "ingredient_catalog", "recipe_tags")
+    }
+
+
+@pytest.fixture
+def saved(db):
+    recipe_id = database.save_recipe_with_ingredients(RECIPE, INGREDIENTS)
+    return recipe_id, stored_rows(recipe_id)
+
+
+def test_insert_stores_recipe_and_ingredients_in_order(saved):
+    recipe_id, rows = saved
+    assert database.get_recipe_by_id(recipe_id)["title"] == "Tomato Soup"
+    assert [(name, qty, unit) for _, name, qty, unit in rows] == \
+           [(i["name"], i["quantity"], i["unit"]) for i in INGREDIENTS]
+
+
+def test_unchanged_edit_keeps_every_row(saved):
+    recipe_id, rows = saved
+    assert database.save_recipe_with_ingredients(RECIPE, INGREDIENTS, recipe_id) == recipe_id
+    assert stored_rows(recipe_id) == rows
+
+
+def test_edit_with_changed_rows_updates_them_in_place(saved):
+    recipe_id, rows = saved
+    edited = [dict(i) for i in INGREDIENTS]
+    edited[1] = {"name": "red onion", "quantity": 2.0, "unit": "pcs"}
+    edited[3]["quantity"] = 750.0
+
+    database.save_recipe_with_ingredients(RECIPE, edited, recipe_id)
+
+    assert stored_rows(recipe_id) == [
+        rows[0],
+        (rows[1][0], "red onion", 2.0, "pcs"),
+        rows[2],
+        (rows[3][0], "stock", 750.0, "ml"),
+    ]
+
+
+def test_edit_with_fewer_rows_deletes_the_tail(saved):
+    recipe_id, rows = saved
+    database.save_recipe_with_ingredients(RECIPE, INGREDIENTS[:2], recipe_id)
+    assert stored_rows(recipe_id) == rows[:2]
+
+
+def test_edit_with_more_rows_appends_new_ones(saved):
+    recipe_id, rows = saved
+    extra = {"name": "basil", "quantity": 1.0, "unit": "bunch"}
+    database.save_recipe_with_ingredients(RECIPE, INGREDIENTS + [extra], recipe_id)
+
+    after = stored_rows(recipe_id)
+    assert after[:4] == rows
+    assert after[4][1:] == ("basil", 1.0, "bunch")
+
+
+def test_edit_with_no_rows_clears_ingredients(saved):
+    recipe_id, _ = saved
+    database.save_recipe_with_ingredients(RECIPE, [], recipe_id)
+    assert stored_rows(recipe_id) == []
+
+
+def test_failure_part_way_leaves_the_old_recipe_intact(saved):
+    recipe_id, _ = saved
+    before = snapshot()
+
+    # Row 0 changes (an UPDATE runs first), then the appended row cannot be
+    # bound, so the INSERT executemany fails after the other writes.
+    edited    = [dict(i) for i in INGREDIENTS]
+    edited[0] = {"name": "cherry tomato", "quantity": 12.0, "unit": "pcs"}
+    edited.append({"name": "basil", "quantity": object(), "unit": "bunch"})
+
+    with pytest.raises(database.sqlite3.Error):
+        database.save_recipe_with_ingredients(
+            {**RECIPE, "title": "Renamed", "tags": "changed"}, edited, recipe_id,
+        )
+
+    assert snapshot() == before
+
+
+def test_missing_recipe_id_raises_and_writes_nothing(saved):
+    before = snapshot()
+    with pytest.raises(ValueError, match="Recipe 9999 not found"):
+        database.save_recipe_with_ingredients(
+            {**RECIPE, "tags": "brand new"},
+            [{"name": "never stored", "quantity": 1.0, "unit": "pcs"}],
+            recipe_id=9999,
+        )
+    assert snapshot() == before
@@ -0,0 +1,127 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import database
+
+READERS         = 5
+WRITERS         = 3
+STRESS_DURATION = 1.5  # seconds
+
+
+# ---------------------------------------------------------------------------
+# PRAGMA profile
+# ---------------------------------------------------------------------------
+
+def test_defaults_without_overrides(monkeypatch):
+    for name in database.DEFAULT_PRAGMAS:
+        monkeypatch.delenv(f"{database.PRAGMA_ENV_PREFIX}{name.upper()}", raising=False)
+    assert database.get_pragma_profile() == database.DEFAULT_PRAGMAS
+
+
+@pytest.mark.parametrize("env, pragma, value", [
+    ("RECIPES_SQLITE_BUSY_TIMEOUT", "busy_timeout", "10000"),
+    ("RECIPES_SQLITE_CACHE_SIZE",   "cache_size",   "-4000"),
+    ("RECIPES_SQLITE_SYNCHRONOUS",  "synchronous",  "FULL"),
+    ("RECIPES_SQLITE_TEMP_STORE",   "temp_store",   " FILE "),
+])
+def test_env_overrides_replace_one_pragma(monkeypatch, env, pragma, value):
+    monkeypatch.setenv(env, value)
+    profile = database.get_pragma_profile()
+    assert profile[pragma] == value.strip()
+    assert {k: v for k, v in profile.items() if k != pragma} == \
+           {k: v for k, v in database.DEFAULT_PRAGMAS.items() if k != pragma}
+
+
+def test_blank_overrides_and_unknown_names_are_ignored(monkeypatch):
+    monkeypatch.setenv("RECIPES_SQLITE_BUSY_TIMEOUT", "   ")
+    monkeypatch.setenv("RECIPES_SQLITE_PAGE_SIZE", "1024")
+    assert database.get_pragma_profile() == database.DEFAULT_PRAGMAS
+
+
+@pytest.mark.parametrize("value", [
+    "5000; DROP TABLE recipes",
+    "5000 -- comment",
+    "--5",
+    "-",
+    "1.5",
+    "'WAL'",
+])
+def test_invalid_overrides_raise(monkeypatch, value):
+    monkeypatch.setenv("RECIPES_SQLITE_BUSY_TIMEOUT", value)
+    with pytest.raises(ValueError, match="RECIPES_SQLITE_BUSY_TIMEOUT"):
+        database.get_pragma_profile()
+
+
+def test_new_connections_apply_the_profile(db, monkeypatch):
+    monkeypatch.setenv("RECIPES_SQLITE_BUSY_TIMEOUT", "1234")
+    pool = database._ConnectionPool(1)
+    conn = pool._open()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1      # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -20000
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2       # MEMORY
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Concurrency stress
+# ---------------------------------------------------------------------------
+
+def test_readers_and_writers_run_concurrently_without_lock_errors(db, capsys):
+    database.release_connection()
+    start    = threading.Barrier(READERS + WRITERS, timeout=30)
+    counts   = {"reads": 0, "writes": 0}
+    locked:  list[sqlite3.OperationalError] = []
+    errors:  list[BaseException] = []
+    tally    = threading.Lock()
+
+    def run(kind: str, n: int) -> None:
+        done = 0
+        try:
+            start.wait()
+            deadline = time.monotonic() + STRESS_DURATION
+            while time.monotonic() < deadline:
+                if kind == "writes":
+                    database.add_recipe(f"Writer {n} #{done}", "", "", 10, 1, "stress")
+                else:
+                    database.list_recipes(projection="titles", limit=20)
+                    database.count_recipes()
+                done += 1
+        except sqlite3.OperationalError as exc:
+            (locked if "locked" in str(exc) else errors).append(exc)
+        except BaseException as exc:
+            errors.append(exc)
+        finally:
+            database.release_connection()
+            with tally:
+                counts[kind] += done
+
+    threads = (
+        [threading.Thread(target=run, args=("reads", n)) for n in range(READERS)]
+        + [threading.Thread(target=run, args=("writes", n)) for n in range(WRITERS)]
+    )
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+        assert not thread.is_alive(), "stress thread hung"
+
+    with capsys.disabled():
+        print(
+            f"\n{READERS} readers / {WRITERS} writers for {STRESS_DURATION}s: "
+            f"{counts['reads'] / STRESS_DURATION:,.0f} reads/s, "
+            f"{counts['writes'] / STRESS_DURATION:,.0f} writes/s, "
+            f"{len(locked)} lock errors"
+        )
+
+    assert errors == []
+    assert locked == []
+    assert counts["reads"] > 0 and counts["writes"] > 0
+    assert database.count_recipes() == counts["writes"]
@@ -0,0 +1,82 @@
+from itertools import product
+
+import pytest
+
+from units import (
+    COUNT,
+    INGREDIENT_DENSITIES,
+    MASS,
+    UNIT_FACTORS,
+    VOLUME,
+    convert,
+    normalize_grocery_rows,
+)
+
+QUANTITIES = (0.25, 1, 3, 12.5, 750)
+
+
+def units_in(*dimensions: str) -> list[str]:
+    return [unit for unit, (dimension, _) in UNIT_FACTORS.items() if dimension in dimensions]
+
+
+@pytest.mark.parametrize("dimension", [MASS, VOLUME, COUNT])
+def test_convert_round_trips_within_a_dimension(dimension):
+    units = units_in(dimension)
+    for quantity, source, target in product(QUANTITIES, units, units):
+        there = convert(quantity, source, target)
+        assert convert(there, target, source) == pytest.approx(quantity)
+
+
+@pytest.mark.parametrize("ingredient", sorted(INGREDIENT_DENSITIES))
+def test_convert_round_trips_between_mass_and_volume(ingredient):
+    for quantity, source, target in product(QUANTITIES, units_in(VOLUME), units_in(MASS)):
+        there = convert(quantity, source, target, ingredient)
+        assert there is not None
+        assert convert(there, target, source, ingredient) == pytest.approx(quantity)
+
+
+def test_convert_known_factors_and_refusals():
+    assert convert(1, "cup", "ml") == 240
+    assert convert(2, "kg", "grams") == 2000
+    assert convert(1, "dozen", "pieces") == 12
+    assert convert(1, "cup", "g", "flour") == pytest.approx(127.2)
+    assert convert(1, "cup", "g") is None             # no density
+    assert convert(1, "cup", "g", "saffron") is None  # unknown density
+    assert convert(1, "piece", "g", "flour") is None  # count ↔ mass
+    assert convert(1, "pinch", "g") is None           # unknown unit
+
+
+def rows(*entries):
+    return [{"name": name, "unit": unit, "quantity": quantity} for name, quantity, unit in entries]
+
+
+def test_volume_and_mass_total_into_one_line():
+    assert normalize_grocery_rows(rows(("flour", 1, "cup"), ("flour", 200, "g"))) == rows(
+        ("flour", pytest.approx(327.2), "g"),
+    )
+
+
+def test_volumes_stay_volumes_without_a_weight_row():
+    assert normalize_grocery_rows(rows(("milk", 500, "ml"), ("milk", 1, "litre"))) == rows(
+        ("milk", pytest.approx(1.5), "litres"),
+    )
+
+
+def test_lone_known_unit_next_to_unknown_unit_is_untouched():
+    mixed = rows(("salt", 1, "pinch"), ("salt", 1, "tsp"))
+    assert normalize_grocery_rows(mixed) == sorted(mixed, key=lambda r: r["unit"])
+
+
+def test_mixed_bucket_merges_what_converts_and_keeps_the_rest():
+    mixed = rows(
+        ("butter", 2,   "tbsp"),
+        ("butter", 100, "g"),
+        ("butter", 1,   "knob"),
+        ("egg",    6,   "pieces"),
+        ("egg",    1,   "dozen"),
+    )
+    assert normalize_grocery_rows(mixed) == rows(
+        ("butter", pytest.approx(127.3), "g"),
+        ("butter", 1, "knob"),
+        ("egg", 18, "pieces"),
+    )
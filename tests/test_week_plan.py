@@ -0,0 +1,109 @@
+import pytest
+
+import database
+
+WEEK  = "2024-03-04"
+OTHER = "2024-03-11"
+
+
+def stored_week(week_start: str) -> dict[tuple[str, str], int]:
+    rows = database.get_connection().execute(
+        "SELECT day, meal_type, recipe_id FROM meal_plan WHERE week_start = ?", (week_start,),
+    ).fetchall()
+    return {(row["day"], row["meal_type"]): row["recipe_id"] for row in rows}
+
+
+def changes_during(fn) -> tuple[object, int]:
+    """Run fn() and return its result with the number of meal_plan rows it wrote."""
+    conn = database.get_connection()
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS plan_writes (op TEXT)")
+    for op in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(
+            f"CREATE TEMP TRIGGER IF NOT EXISTS count_plan_{op.lower()} AFTER {op} ON main.meal_plan "
+            f"BEGIN INSERT INTO plan_writes VALUES ('{op}'); END"
+        )
+    conn.execute("DELETE FROM plan_writes")
+    conn.commit()
+    result = fn()
+    return result, conn.execute("SELECT COUNT(*) FROM plan_writes").fetchone()[0]
+
+
+@pytest.fixture
+def recipes(db):
+    return [database.add_recipe(f"Recipe {n}", "", "", 10, 2, "") for n in range(3)]
+
+
+@pytest.fixture
+def week(recipes):
+    a, b, _ = recipes
+    slots = {
+        ("Monday",  "Breakfast"): a,
+        ("Monday",  "Dinner"):    b,
+        ("Tuesday", "Lunch"):     a,
+    }
+    database.save_week_plan(WEEK, slots)
+    database.save_meal_plan(OTHER, "Monday", "Dinner", b)
+    return slots
+
+
+def test_new_week_writes_every_slot(recipes):
+    a, b, _ = recipes
+    slots = {("Monday", "Breakfast"): a, ("Friday", "Dinner"): b}
+    assert database.save_week_plan(WEEK, slots) == 2
+    assert stored_week(WEEK) == slots
+
+
+def test_unchanged_slots_are_not_written(week):
+    count, changed = changes_during(lambda: database.save_week_plan(WEEK, dict(week)))
+    assert count == 0
+    assert changed == 0
+    assert stored_week(WEEK) == week
+
+
+def test_only_changed_slots_are_written(week, recipes):
+    _, b, c = recipes
+    edited = {**week, ("Monday", "Breakfast"): c, ("Sunday", "Dinner"): b}
+    count, changed = changes_during(lambda: database.save_week_plan(WEEK, edited))
+    assert count == 2
+    assert changed == 2
+    assert stored_week(WEEK) == edited
+
+
+def test_none_deletes_a_slot(week):
+    count = database.save_week_plan(WEEK, {("Monday", "Dinner"): None})
+    assert count == 1
+    assert stored_week(WEEK) == {
+        ("Monday",  "Breakfast"): week[("Monday", "Breakfast")],
+        ("Tuesday", "Lunch"):     week[("Tuesday", "Lunch")],
+    }
+
+
+def test_none_for_an_empty_slot_is_not_counted(week):
+    count, changed = changes_during(
+        lambda: database.save_week_plan(WEEK, {("Saturday", "Lunch"): None}),
+    )
+    assert (count, changed) == (0, 0)
+
+
+def test_slots_not_passed_are_left_alone(week, recipes):
+    _, _, c = recipes
+    database.save_week_plan(WEEK, {("Tuesday", "Lunch"): c})
+    assert stored_week(WEEK) == {**week, ("Tuesday", "Lunch"): c}
+
+
+def test_other_weeks_are_untouched(week):
+    database.save_week_plan(WEEK, {slot: None for slot in week})
+    assert stored_week(WEEK) == {}
+    assert stored_week(OTHER) == {("Monday", "Dinner"): week[("Monday", "Dinner")]}
+
+
+def test_mixed_writes_and_deletes_are_counted_together(week, recipes):
+    _, _, c = recipes
+    edited = {
+        ("Monday",    "Breakfast"): week[("Monday", "Breakfast")],   # unchanged
+        ("Monday",    "Dinner"):    None,                            # delete
+        ("Tuesday",   "Lunch"):     c,                               # update
+        ("Wednesday", "Lunch"):     c,                               # insert
+        ("Thursday",  "Lunch"):     None,                            # already empty
+    }
+    assert database.save_week_plan(WEEK, edited) == 3
@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+import database
+
+SESSIONS           = 50
+WRITES_PER_SESSION = 5
+
+
+@pytest.fixture
+def write_queue(db):
+    database.start_write_queue()
+    yield database
+    database.stop_write_queue()
+
+
+def run_sessions(count: int, session) -> list[BaseException]:
+    """Run `session` on `count` threads at once; return what they raised."""
+    errors: list[BaseException] = []
+    start = threading.Barrier(count, timeout=30)
+
+    def target(n: int) -> None:
+        try:
+            start.wait()
+            session(n)
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=target, args=(n,)) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+        assert not thread.is_alive(), "session thread hung"
+    return errors
+
+
+def test_writer_is_not_starved_when_sessions_hold_every_pooled_connection(write_queue, monkeypatch):
+    monkeypatch.setattr(database, "POOL_TIMEOUT", 1.0)
+    database.release_connection()
+    holding = threading.Barrier(database.POOL_SIZE, timeout=10)
+
+    def session(n: int) -> None:
+        database.count_recipes()  # checks out a pooled connection for the thread's life
+        holding.wait()
+        recipe_id = database.submit_write(
+            database.add_recipe, f"Recipe {n}", "", "", 10, 1, "",
+        ).result(timeout=10)
+        assert recipe_id
+
+    assert run_sessions(database.POOL_SIZE, session) == []
+    assert database.get_pool_stats()["in_use"] == database.POOL_SIZE
+    assert database.count_recipes() == database.POOL_SIZE
+
+
+def test_failure_to_connect_fails_the_futures_instead_of_killing_the_writer(write_queue, monkeypatch):
+    def broken_connection():
+        raise database.sqlite3.OperationalError("disk I/O error")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(database._write_queue, "_connection", broken_connection)
+        future = database.submit_write(database.add_recipe, "Lost", "", "", 10, 1, "")
+        with pytest.raises(database.sqlite3.OperationalError):
+            future.result(timeout=5)
+
+    assert database.submit_write(database.count_recipes).result(timeout=5) == 0
+
+
+def test_fifty_sessions_write_through_the_queue(write_queue, capsys):
+    def session(n: int) -> None:
+        database.list_recipes(projection="titles", limit=20)
+        futures = [
+            database.submit_write(database.add_recipe, f"Session {n} #{k}", "", "", 10, 1, "load")
+            for k in range(WRITES_PER_SESSION)
+        ]
+        for future in futures:
+            future.result(timeout=30)
+
+    before  = database.get_write_queue_stats()
+    started = time.perf_counter()
+    errors  = run_sessions(SESSIONS, session)
+    elapsed = time.perf_counter() - started
+    after   = database.get_write_queue_stats()
+
+    total   = SESSIONS * WRITES_PER_SESSION
+    commits = after["batches"] - before["batches"]
+    with capsys.disabled():
+        print(
+            f"\n{SESSIONS} sessions: {total} writes in {elapsed:.2f}s "
+            f"({total / elapsed:,.0f} writes/s, {commits} commits, "
+            f"{len(errors)} errors)"
+        )
+
+    assert errors == []
+    assert database.count_recipes() == total
+    assert after["writes"] - before["writes"] == total
+    assert commits <= total
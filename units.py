@@ -0,0 +1,218 @@
+from typing import Optional
+
+
+# ---------------------------------------------------------------------------
+# Unit registry
+# ---------------------------------------------------------------------------
+#
+# Every unit belongs to one dimension (mass, volume, count) and has a
+# factor to that dimension's base unit (grams, millilitres, pieces).
+# Ingredient densities bridge volume → mass so "1 cup flour" and
+# "200 g flour" total into a single grocery line.
+
+
+MASS   = "mass"
+VOLUME = "volume"
+COUNT  = "count"
+
+# Factor to the base unit of each dimension.
+UNIT_FACTORS: dict[str, tuple[str, float]] = {
+    "g":      (MASS,   1.0),
+    "kg":     (MASS,   1000.0),
+    "oz":     (MASS,   28.349523125),
+    "lb":     (MASS,   453.59237),
+    "ml":     (VOLUME, 1.0),
+    "l":      (VOLUME, 1000.0),
+    "tsp":    (VOLUME, 5.0),
+    "tbsp":   (VOLUME, 15.0),
+    "cup":    (VOLUME, 240.0),
+    "piece":  (COUNT,  1.0),
+    "dozen":  (COUNT,  12.0),
+}
+
+# Spellings seen in recipes → registry key.
+UNIT_ALIASES: dict[str, str] = {
+    "gram": "g", "grams": "g", "gm": "g", "gms": "g",
+    "kgs": "kg", "kilogram": "kg", "kilograms": "kg",
+    "ounce": "oz", "ounces": "oz",
+    "lbs": "lb", "pound": "lb", "pounds": "lb",
+    "millilitre": "ml", "millilitres": "ml", "milliliter": "ml", "milliliters": "ml",
+    "litre": "l", "litres": "l", "liter": "l", "liters": "l",
+    "teaspoon": "tsp", "teaspoons": "tsp",
+    "tablespoon": "tbsp", "tablespoons": "tbsp",
+    "cups": "cup",
+    "pieces": "piece", "pc": "piece", "pcs": "piece", "unit": "piece", "whole": "piece",
+}
+
+# Grams per millilitre, keyed by canonical ingredient name.
+INGREDIENT_DENSITIES: dict[str, float] = {
+    "water":         1.0,
+    "milk":          1.03,
+    "cream":         1.0,
+    "yogurt":        1.03,
+    "butter":        0.91,
+    "oil":           0.92,
+    "olive oil":     0.91,
+    "vegetable oil": 0.92,
+    "ghee":          0.91,
+    "honey":         1.42,
+    "flour":         0.53,
+    "sugar":         0.85,
+    "brown sugar":   0.83,
+    "salt":          1.2,
+    "rice":          0.85,
+    "oat":           0.41,
+    "cornstarch":    0.54,
+}
+
+# How each dimension is displayed: (unit label, base units per label),
+# largest first. The first unit the total reaches at least 1 of is used.
+DISPLAY_UNITS: dict[str, list[tuple[str, float]]] = {
+    MASS:   [("kg", 1000.0), ("g", 1.0)],
+    VOLUME: [("litres", 1000.0), ("ml", 1.0)],
+    COUNT:  [("pieces", 1.0)],
+}
+
+
+# Precomputed: every known spelling → (dimension, factor to base), so
+# converting a row is one dict lookup.
+_UNIT_TABLE: dict[str, tuple[str, float]] = {
+    **UNIT_FACTORS,
+    **{alias: UNIT_FACTORS[key] for alias, key in UNIT_ALIASES.items()},
+}
+
+
+def lookup_unit(unit: str) -> Optional[tuple[str, float]]:
+    """Return (dimension, factor to base) for a unit, or None if unknown."""
+    return _UNIT_TABLE.get(unit.strip().lower())
+
+
+def to_base(
+    quantity: float,
+    unit: str,
+    ingredient: Optional[str] = None,
+) -> Optional[tuple[str, float]]:
+    """
+    Convert a quantity to its dimension's base unit.
+
+    Volumes of an ingredient with a known density come back as mass.
+
+    Args:
+        quantity:   Amount in `unit`.
+        unit:       Any spelling in the registry e.g. 'cups', 'grams'.
+        ingredient: Canonical ingredient name used for density lookup.
+
+    Returns:
+        Optional[tuple[str, float]]: (dimension, amount in base units), or
+                                     None if the unit is unknown.
+    """
+    entry = lookup_unit(unit)
+    if entry is None:
+        return None
+    dimension, factor = entry
+    amount = quantity * factor
+    if dimension == VOLUME and ingredient in INGREDIENT_DENSITIES:
+        return MASS, amount * INGREDIENT_DENSITIES[ingredient]
+    return dimension, amount
+
+
+def convert(
+    quantity: float,
+    from_unit: str,
+    to_unit: str,
+    ingredient: Optional[str] = None,
+) -> Optional[float]:
+    """
+    Convert a quantity between two units.
+
+    Mass ↔ volume needs a known density for `ingredient`.
+
+    Returns:
+        Optional[float]: The converted amount, or None if the units are
+                         unknown or cannot be converted.
+    """
+    source = lookup_unit(from_unit)
+    target = lookup_unit(to_unit)
+    if source is None or target is None:
+        return None
+
+    amount = quantity * source[1]
+    if source[0] != target[0]:
+        density = INGREDIENT_DENSITIES.get(ingredient or "")
+        if density is None:
+            return None
+        if (source[0], target[0]) == (VOLUME, MASS):
+            amount *= density
+        elif (source[0], target[0]) == (MASS, VOLUME):
+            amount /= density
+        else:
+            return None
+    return amount / target[1]
+
+
+def display_quantity(dimension: str, amount: float) -> tuple[float, str]:
+    """Pick the display unit for a base-unit amount e.g. 1500 g → (1.5, 'kg')."""
+    units = DISPLAY_UNITS[dimension]
+    for label, size in units:
+        if amount >= size:
+            return amount / size, label
+    label, size = units[-1]
+    return amount / size, label
+
+
+def normalize_grocery_rows(rows: list[dict]) -> list[dict]:
+    """
+    Total grocery rows across compatible units.
+
+    Rows for one ingredient in several units ('1 cup flour' + '200 g
+    flour') are converted to base units, summed, and shown in the
+    dimension's display unit. Volumes become mass only when the ingredient
+    also appears by weight and has a known density. A row with nothing to
+    total against is passed through untouched, so '1 tsp' next to
+    '1 pinch' stays '1 tsp', and unknown units are never merged.
+
+    Args:
+        rows: { name, unit, quantity } rows, e.g. from
+              get_grocery_totals_for_range(), ordered by name.
+
+    Returns:
+        list[dict]: { name, unit, quantity } rows ordered by name, unit.
+    """
+    by_name: dict[str, list[dict]] = {}
+    for row in rows:
+        by_name.setdefault(row["name"], []).append(row)
+
+    result: list[dict] = []
+    for name, group in by_name.items():
+        if len(group) == 1:
+            result.append(group[0])
+            continue
+
+        # Only fold volumes into mass when something is already by weight,
+        # so "500 ml + 1 litre milk" stays a volume.
+        has_mass = any((lookup_unit(row["unit"]) or ("",))[0] == MASS for row in group)
+        density_name = name if has_mass else None
+
+        # Bucket by dimension; unknown units each get a bucket of their own.
+        buckets: dict[str, list[tuple[dict, float]]] = {}
+        for row in group:
+            base = to_base(row["quantity"], row["unit"], density_name)
+            if base is None:
+                buckets.setdefault(row["unit"], []).append((row, row["quantity"]))
+            else:
+                buckets.setdefault(base[0], []).append((row, base[1]))
+
+        merged: list[dict] = []
+        for key, entries in buckets.items():
+            if len(entries) == 1:
+                merged.append(entries[0][0])
+                continue
+            amount = sum(amount for _, amount in entries)
+            if key in DISPLAY_UNITS:
+                quantity, unit = display_quantity(key, amount)
+            else:
+                quantity, unit = amount, key
+            merged.append({"name": name, "unit": unit, "quantity": quantity})
+        result.extend(sorted(merged, key=lambda r: r["unit"]))
+
+    return result